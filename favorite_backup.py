@@ -0,0 +1,299 @@
+"""
+备份与恢复自己创建的题单。
+
+- snapshot: 把每个自己创建的题单（名称、公开状态、封面表情、描述、按顺序的题目 slug）
+  写入 gzip 压缩的 JSON 快照文件
+- restore: 根据快照并发重建题单（create_favorite_list → update_favorite_emoji →
+  batch_add_questions_to_favorite），所有请求共用一个限速器。快照中的 slug 原样提交；
+  某批添加失败时二分拆分找出被拒绝的 slug，记入恢复进度的 dropped 字段后跳过。
+  恢复进度保存在 <快照文件>.restore.json 中，中断后重新执行同一命令即可从断点继续
+
+用法:
+    python favorite_backup.py snapshot [-o favorites_snapshot.json.gz]
+    python favorite_backup.py restore favorites_snapshot.json.gz [--workers 4] [--rate 2]
+"""
+
+import argparse
+import gzip
+import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from dotenv import load_dotenv
+
+from leetcode_favorite import (
+    BASE_DIR,
+    EXPORT_MAX_WORKERS,
+    LeetCodeClient,
+    RateLimiter,
+    atomic_write_text,
+    is_system_annual_favorite,
+)
+from problem_catalog import validate_question_slugs
+
+SNAPSHOT_VERSION = 1
+
+# 每次批量添加的题目数量
+BATCH_ADD_SIZE = 50
+
+# 恢复时默认的并发数与每秒请求数
+DEFAULT_RESTORE_WORKERS = 4
+DEFAULT_RESTORE_RATE = 2.0
+
+
+def _snapshot_favorite(client: LeetCodeClient, favorite: Dict[str, Any]) -> Dict[str, Any]:
+    """获取单个题单的详情与全部题目 slug（按题单内顺序），任一请求失败时抛出 RuntimeError。"""
+    slug = favorite["slug"]
+    detail = client.get_favorite_detail(slug)
+    if detail is None:
+        raise RuntimeError(f"获取题单详情失败: {slug}")
+    questions: List[str] = []
+    for page in client.iter_favorite_question_pages(slug):
+        questions.extend(q["titleSlug"] for q in page if q.get("titleSlug"))
+    return {
+        "slug": slug,
+        "name": detail.get("name") or favorite.get("name", ""),
+        "isPublicFavorite": bool(detail.get("isPublicFavorite", favorite.get("isPublicFavorite", True))),
+        "coverEmoji": detail.get("coverEmoji") or favorite.get("coverEmoji") or "",
+        "description": detail.get("description") or "",
+        "questions": questions,
+    }
+
+
+def create_snapshot(
+    client: LeetCodeClient,
+    output_path: Path,
+    max_workers: int = EXPORT_MAX_WORKERS,
+) -> Optional[Dict[str, Any]]:
+    """
+    备份所有自己创建的题单（跳过系统年度题单）到 gzip 压缩的 JSON 文件
+    :return: 快照内容，任一题单获取失败时返回 None 且不写入文件
+    """
+    created, _ = client.get_favorite_lists()
+    favorites = [fav for fav in created if fav.get("slug") and not is_system_annual_favorite(fav["slug"])]
+    print(f"正在备份 {len(favorites)} 个题单...")
+
+    t0 = time.perf_counter()
+    entries: List[Optional[Dict[str, Any]]] = [None] * len(favorites)
+    with ThreadPoolExecutor(max_workers=max(1, max_workers)) as executor:
+        futures = {executor.submit(_snapshot_favorite, client, fav): i for i, fav in enumerate(favorites)}
+        for future in as_completed(futures):
+            i = futures[future]
+            try:
+                entries[i] = future.result()
+            except Exception as e:
+                print(f"备份题单失败: {favorites[i].get('name', '')} ({favorites[i]['slug']}): {e}")
+
+    if any(entry is None for entry in entries):
+        print("部分题单备份失败，未写入快照文件")
+        return None
+
+    snapshot = {
+        "version": SNAPSHOT_VERSION,
+        "created_at": datetime.now().isoformat(timespec="seconds"),
+        "favorites": entries,
+    }
+    tmp_path = output_path.with_name(f".{output_path.name}.tmp")
+    with gzip.open(tmp_path, "wt", encoding="utf-8") as f:
+        json.dump(snapshot, f, ensure_ascii=False, separators=(",", ":"))
+    os.replace(tmp_path, output_path)
+
+    total_questions = sum(len(entry["questions"]) for entry in entries)
+    print(
+        f"备份完成: {len(entries)} 个题单，共 {total_questions} 道题 -> {output_path} "
+        f"({output_path.stat().st_size} 字节，耗时 {time.perf_counter() - t0:.2f}s)"
+    )
+    return snapshot
+
+
+def load_snapshot(path: Path) -> Dict[str, Any]:
+    with gzip.open(path, "rt", encoding="utf-8") as f:
+        snapshot = json.load(f)
+    if not isinstance(snapshot, dict) or snapshot.get("version") != SNAPSHOT_VERSION:
+        raise ValueError(f"不支持的快照文件: {path}")
+    return snapshot
+
+
+class RestoreProgress:
+    """
+    恢复进度：{原题单 slug: {new_slug, emoji_done, added, dropped, done}}，每一步完成后立即原子写入。
+    added 为快照题目列表中已处理的数量，dropped 为添加时被拒绝而跳过的 slug
+    """
+
+    def __init__(self, path: Path):
+        self.path = path
+        self._lock = threading.Lock()
+        self.entries: Dict[str, Dict[str, Any]] = {}
+        if path.exists():
+            try:
+                with open(path, "r", encoding="utf-8") as f:
+                    data = json.load(f)
+                if isinstance(data, dict):
+                    self.entries = data
+            except (json.JSONDecodeError, OSError):
+                print(f"恢复进度文件损坏，将重新开始: {path}")
+
+    def get(self, slug: str) -> Dict[str, Any]:
+        with self._lock:
+            return dict(self.entries.get(slug) or {})
+
+    def update(self, slug: str, **changes: Any) -> None:
+        with self._lock:
+            self.entries.setdefault(slug, {}).update(changes)
+            atomic_write_text(self.path, json.dumps(self.entries, ensure_ascii=False, indent=2))
+
+
+def _add_batch_isolating(client: LeetCodeClient, favorite_slug: str, batch: List[str]) -> Optional[List[str]]:
+    """
+    添加一批题目；整批失败时二分拆分重试，找出被拒绝的 slug。
+    被拒绝的 slug 只在同批其它题目添加成功、或本地题目目录也不认识它时才跳过，
+    避免把网络故障等临时失败误判为无效题目。
+    :return: 被跳过的 slug 列表；无法判断（整批都失败）时返回 None
+    """
+    rejected: List[str] = []
+
+    def add(part: List[str]) -> bool:
+        """返回 part 中是否至少有一道题添加成功"""
+        if client.batch_add_questions_to_favorite(favorite_slug, part):
+            return True
+        if len(part) == 1:
+            rejected.extend(part)
+            return False
+        mid = len(part) // 2
+        left = add(part[:mid])
+        right = add(part[mid:])
+        return left or right
+
+    if add(batch):
+        return rejected
+    known = set(validate_question_slugs(rejected))
+    if any(slug in known for slug in rejected):
+        return None
+    return rejected
+
+
+def _restore_favorite(client: LeetCodeClient, favorite: Dict[str, Any], progress: RestoreProgress) -> bool:
+    """按 创建 → 设置表情 → 分批加题 的顺序恢复一个题单，已完成的步骤直接跳过。"""
+    key = favorite["slug"]
+    state = progress.get(key)
+    if state.get("done"):
+        return True
+
+    new_slug = state.get("new_slug")
+    if not new_slug:
+        new_slug = client.create_favorite_list(
+            favorite["name"], favorite.get("isPublicFavorite", True), favorite.get("description", "")
+        )
+        if not new_slug:
+            return False
+        progress.update(key, new_slug=new_slug, emoji_done=False, added=0)
+
+    emoji = favorite.get("coverEmoji")
+    if emoji and not state.get("emoji_done"):
+        if not client.update_favorite_emoji(new_slug, emoji):
+            return False
+        progress.update(key, emoji_done=True)
+
+    slugs = favorite.get("questions") or []
+    added = int(state.get("added") or 0)
+    dropped: List[str] = list(state.get("dropped") or [])
+    for i in range(added, len(slugs), BATCH_ADD_SIZE):
+        batch = slugs[i:i + BATCH_ADD_SIZE]
+        rejected = _add_batch_isolating(client, new_slug, batch)
+        if rejected is None:
+            return False
+        if rejected:
+            print(f"  题单 {favorite['name']} 跳过 {len(rejected)} 道无法添加的题目: {' '.join(rejected)}")
+            dropped.extend(rejected)
+            progress.update(key, dropped=dropped)
+        progress.update(key, added=i + len(batch))
+
+    progress.update(key, done=True)
+    return True
+
+
+def restore_snapshot(
+    client: LeetCodeClient,
+    snapshot_path: Path,
+    max_workers: int = DEFAULT_RESTORE_WORKERS,
+) -> Dict[str, int]:
+    """
+    根据快照并发重建题单；进度保存在 <快照文件>.restore.json，可重复执行以继续未完成的部分
+    :return: {"success": n, "fail": n, "skipped": n}
+    """
+    snapshot = load_snapshot(snapshot_path)
+    favorites: List[Dict[str, Any]] = snapshot.get("favorites") or []
+    progress = RestoreProgress(snapshot_path.with_name(snapshot_path.name + ".restore.json"))
+
+    skipped = sum(1 for fav in favorites if progress.get(fav["slug"]).get("done"))
+    todo = [fav for fav in favorites if not progress.get(fav["slug"]).get("done")]
+    print(f"快照中共 {len(favorites)} 个题单，已完成 {skipped} 个，待恢复 {len(todo)} 个")
+
+    success_count = 0
+    fail_count = 0
+    t0 = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=max(1, max_workers)) as executor:
+        futures = {executor.submit(_restore_favorite, client, fav, progress): fav for fav in todo}
+        for future in as_completed(futures):
+            fav = futures[future]
+            try:
+                ok = future.result()
+            except Exception as e:
+                print(f"恢复题单出错: {fav['name']}: {e}")
+                ok = False
+            if ok:
+                success_count += 1
+                state = progress.get(fav["slug"])
+                dropped = state.get("dropped") or []
+                note = f"，跳过 {len(dropped)} 道无法添加的题目" if dropped else ""
+                print(f"已恢复题单: {fav['name']} ({len(fav.get('questions') or []) - len(dropped)} 道题{note})")
+            else:
+                fail_count += 1
+                print(f"恢复题单失败: {fav['name']}（重新执行恢复命令可继续）")
+
+    print(
+        f"\n恢复完成，成功：{success_count} 个，失败：{fail_count} 个，跳过：{skipped} 个"
+        f"（耗时 {time.perf_counter() - t0:.2f}s）"
+    )
+    return {"success": success_count, "fail": fail_count, "skipped": skipped}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="备份与恢复自己创建的题单")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    snapshot_parser = subparsers.add_parser("snapshot", help="备份所有自己创建的题单")
+    snapshot_parser.add_argument("-o", "--output", help="快照文件路径（默认 favorites_snapshot_<时间>.json.gz）")
+    snapshot_parser.add_argument("--workers", type=int, default=EXPORT_MAX_WORKERS, help="并发获取的题单数")
+
+    restore_parser = subparsers.add_parser("restore", help="根据快照重建题单（可断点续传）")
+    restore_parser.add_argument("snapshot", help="快照文件路径")
+    restore_parser.add_argument("--workers", type=int, default=DEFAULT_RESTORE_WORKERS, help="并发恢复的题单数")
+    restore_parser.add_argument("--rate", type=float, default=DEFAULT_RESTORE_RATE, help="每秒最多请求次数（<=0 不限速）")
+    args = parser.parse_args()
+
+    load_dotenv(BASE_DIR / ".env")
+    csrf_token = os.getenv("csrftoken")
+    session_id = os.getenv("LEETCODE_SESSION")
+    if not csrf_token or not session_id:
+        raise SystemExit("错误：请在 .env 文件中配置 csrftoken 和 LEETCODE_SESSION")
+
+    if args.command == "snapshot":
+        client = LeetCodeClient(csrf_token, session_id)
+        output = args.output or f"favorites_snapshot_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json.gz"
+        create_snapshot(client, Path(output), max_workers=args.workers)
+    else:
+        snapshot_path = Path(args.snapshot)
+        if not snapshot_path.exists():
+            raise SystemExit(f"文件不存在: {snapshot_path}")
+        client = LeetCodeClient(csrf_token, session_id, rate_limiter=RateLimiter(args.rate))
+        restore_snapshot(client, snapshot_path, max_workers=args.workers)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,359 @@
+"""
+非交互式命令行：每个子命令只发送它需要的 GraphQL 请求，结果以 JSON 输出到 stdout，便于脚本和定时任务调用。
+请求过程中的提示信息输出到 stderr；命令失败时退出码为 1。
+
+题目 slug 可以直接写在命令行、用 -f 从文件读取，或用 - 从 stdin 读取（空白或逗号分隔）。
+create / add 会先用本地题目目录校验 slug，无法识别的 slug 列在结果的 skipped 中，此时 ok 为 false。
+
+用法:
+    python favorite_cli.py list [--created | --collected]
+    python favorite_cli.py show <题单slug> [--limit 100] [--skip 0] [--all]
+    python favorite_cli.py show <题单slug> --difficulty medium --status unsolved [--tag dynamic-programming] [--sort=-ac_rate]
+    python favorite_cli.py create "题单名称" two-sum 3sum [--public] [--description 描述]
+    python favorite_cli.py add <题单slug> -f slugs.txt
+    cat slugs.txt | python favorite_cli.py remove <题单slug> -
+    python favorite_cli.py delete <题单slug>... [--collected]
+    python favorite_cli.py fork <题单slug>...
+    python favorite_cli.py collect <题单slug>...
+    python favorite_cli.py export [-o favorite_list.md]
+"""
+
+import argparse
+import contextlib
+import json
+import os
+import re
+import sys
+from typing import Any, Callable, Dict, List, Optional
+
+from leetcode_favorite import (
+    BASE_DIR,
+    LeetCodeClient,
+    Question,
+    RateLimiter,
+    build_question_filter,
+    export_all_favorites_to_md,
+    is_system_annual_favorite,
+    list_all_favorites,
+)
+from problem_catalog import check_question_slugs
+
+_SLUG_SPLIT_RE = re.compile(r"[,\s]+")
+
+_FAVORITE_FIELDS = ("slug", "name", "isPublicFavorite", "coverEmoji", "lastQuestionAddedAt")
+_QUESTION_FIELDS = ("questionFrontendId", "titleSlug", "translatedTitle", "title", "difficulty", "status", "paidOnly")
+
+
+def _question_summary(question: Question) -> Dict[str, Any]:
+    return {key: question.get(key) for key in _QUESTION_FIELDS}
+
+
+def list_favorites(client: LeetCodeClient, kind: str = "all") -> Dict[str, Any]:
+    """
+    列出题单（一次请求）
+    :param kind: all / created / collected
+    """
+    favorites = [
+        dict({key: favorite.get(key) for key in _FAVORITE_FIELDS}, is_created=favorite['is_created'])
+        for favorite in list_all_favorites(client)
+        if kind == "all" or favorite['is_created'] == (kind == "created")
+    ]
+    return {"ok": True, "favorites": favorites}
+
+
+def show_favorite(
+    client: LeetCodeClient,
+    slug: str,
+    skip: int = 0,
+    limit: int = 100,
+    all_pages: bool = False,
+    difficulty: Optional[List[str]] = None,
+    status: Optional[List[str]] = None,
+    tags: Optional[List[str]] = None,
+    premium: Optional[bool] = None,
+    keyword: str = "",
+    sort: Optional[str] = None,
+) -> Dict[str, Any]:
+    """
+    获取题单中的题目；默认只请求一页，all_pages=True 时请求到最后一页。
+    难度、状态、标签、会员、关键字与排序由服务端处理，只传输符合条件的题目（取值见 build_question_filter）
+    """
+    question_filter = build_question_filter(difficulty, status, tags, premium, keyword, sort)
+    questions: List[Dict[str, Any]] = []
+    while True:
+        response = client.get_favorite_questions(slug, skip=skip, limit=limit, question_filter=question_filter)
+        if response is None:
+            return {"ok": False, "slug": slug, "error": "获取题单题目列表失败"}
+        batch = response.get('questions') or []
+        questions.extend(_question_summary(q) for q in batch)
+        skip += len(batch)
+        if not all_pages or not response.get('hasMore') or not batch:
+            break
+    result = {
+        "ok": True,
+        "slug": slug,
+        "totalLength": response.get('totalLength'),
+        "hasMore": bool(response.get('hasMore')) and not all_pages,
+        "questions": questions,
+    }
+    if not question_filter.is_default():
+        result["filter"] = question_filter.describe()
+    return result
+
+
+def create_favorite(
+    client: LeetCodeClient,
+    name: str,
+    slugs: Optional[List[str]] = None,
+    public: bool = False,
+    description: str = "",
+) -> Dict[str, Any]:
+    """
+    创建题单并一次性批量添加题目。
+    不在题目目录中的 slug 列在 skipped 中，有跳过时 ok 为 false；给出了 slug 但全部无效时不创建题单
+    """
+    checked = check_question_slugs(slugs) if slugs else None
+    valid = checked.valid if checked else []
+    skipped = checked.unknown if checked else []
+    if slugs and not valid:
+        return {"ok": False, "name": name, "added": [], "skipped": skipped, "error": "没有可添加的有效题目，未创建题单"}
+    favorite_slug = client.create_favorite_list(name, is_public=public, description=description)
+    if not favorite_slug:
+        return {"ok": False, "name": name, "skipped": skipped, "error": "创建题单失败"}
+    if valid and not client.batch_add_questions_to_favorite(favorite_slug, valid):
+        return {
+            "ok": False, "name": name, "slug": favorite_slug, "added": [], "skipped": skipped,
+            "error": "批量添加题目失败",
+        }
+    return {"ok": not skipped, "name": name, "slug": favorite_slug, "added": valid, "skipped": skipped}
+
+
+def add_questions(client: LeetCodeClient, slug: str, slugs: List[str]) -> Dict[str, Any]:
+    """
+    向题单批量添加题目（一次请求）。
+    不在题目目录中的 slug 列在 skipped 中，有跳过时 ok 为 false
+    """
+    checked = check_question_slugs(slugs)
+    if not checked.valid:
+        return {"ok": False, "slug": slug, "added": [], "skipped": checked.unknown, "error": "没有可添加的有效题目"}
+    if not client.batch_add_questions_to_favorite(slug, checked.valid):
+        return {"ok": False, "slug": slug, "added": [], "skipped": checked.unknown, "error": "批量添加题目失败"}
+    return {"ok": not checked.unknown, "slug": slug, "added": checked.valid, "skipped": checked.unknown}
+
+
+def remove_questions(client: LeetCodeClient, slug: str, slugs: List[str]) -> Dict[str, Any]:
+    """从题单删除题目（接口不支持批量，每道题一次请求）"""
+    removed: List[str] = []
+    failed: List[str] = []
+    for question_slug in dict.fromkeys(slugs):
+        (removed if client.remove_question_from_favorite(slug, question_slug) else failed).append(question_slug)
+    return {"ok": not failed, "slug": slug, "removed": removed, "failed": failed}
+
+
+def delete_favorites(client: LeetCodeClient, slugs: List[str], collected: Optional[bool] = None) -> Dict[str, Any]:
+    """
+    删除自己创建的题单或取消收藏
+    :param collected: True 全部按收藏处理，False 全部按自己创建处理；None 时先请求一次题单列表判断
+    """
+    if collected is None:
+        created_slugs = {favorite['slug'] for favorite in list_all_favorites(client) if favorite['is_created']}
+    deleted: List[str] = []
+    failed: List[str] = []
+    skipped: List[str] = []
+    for slug in dict.fromkeys(slugs):
+        if is_system_annual_favorite(slug):
+            skipped.append(slug)
+            continue
+        is_created = slug in created_slugs if collected is None else not collected
+        ok = client.delete_favorite(slug) if is_created else client.remove_favorite_from_collection(slug)
+        (deleted if ok else failed).append(slug)
+    return {"ok": not failed, "deleted": deleted, "failed": failed, "skipped": skipped}
+
+
+def fork_favorites(client: LeetCodeClient, slugs: List[str]) -> Dict[str, Any]:
+    """复制他人的题单"""
+    forked: Dict[str, str] = {}
+    failed: List[str] = []
+    for slug in dict.fromkeys(slugs):
+        new_slug = client.fork_favorite(slug)
+        if new_slug:
+            forked[slug] = new_slug
+        else:
+            failed.append(slug)
+    return {"ok": not failed, "forked": forked, "failed": failed}
+
+
+def collect_favorites(client: LeetCodeClient, slugs: List[str]) -> Dict[str, Any]:
+    """收藏他人的题单"""
+    collected: List[str] = []
+    failed: List[str] = []
+    for slug in dict.fromkeys(slugs):
+        (collected if client.add_favorite_to_collection(slug) else failed).append(slug)
+    return {"ok": not failed, "collected": collected, "failed": failed}
+
+
+def export_favorites(client: LeetCodeClient, output: str = "favorite_list.md") -> Dict[str, Any]:
+    """把所有题单（名称 + 第一题链接）写入 favorite_list.md，不再询问确认"""
+    sections = export_all_favorites_to_md(client, list_all_favorites(client), output_filename=output, confirm=False)
+    counts = {name: len(infos) for name, infos in (sections or {}).items()}
+    return {"ok": sections is not None, "path": str(BASE_DIR / output), "sections": counts}
+
+
+COMMANDS: Dict[str, Callable[..., Dict[str, Any]]] = {
+    "list": list_favorites,
+    "show": show_favorite,
+    "create": create_favorite,
+    "add": add_questions,
+    "remove": remove_questions,
+    "delete": delete_favorites,
+    "fork": fork_favorites,
+    "collect": collect_favorites,
+    "export": export_favorites,
+}
+
+
+def run_command(client: LeetCodeClient, command: str, params: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    执行一个子命令，返回 JSON 结果；请求异常时返回 {"ok": False, "error": ...}
+    :param params: 子命令函数的关键字参数
+    """
+    func = COMMANDS.get(command)
+    if func is None:
+        return {"ok": False, "error": f"未知命令: {command}"}
+    try:
+        return func(client, **params)
+    except Exception as e:
+        return {"ok": False, "error": str(e)}
+
+
+def read_slugs(values: List[str], file: Optional[str] = None, stdin: Optional[str] = None) -> List[str]:
+    """
+    合并命令行、文件和 stdin（值为 - 时）中的 slug，保持顺序
+    :param stdin: 代替 sys.stdin 的输入内容（守护进程转发的调用使用）
+    """
+    texts = [value for value in values if value != "-"]
+    if "-" in values or file == "-":
+        texts.append(sys.stdin.read() if stdin is None else stdin)
+    if file and file != "-":
+        with open(file, "r", encoding="utf-8") as f:
+            texts.append(f.read())
+    return [slug for text in texts for slug in _SLUG_SPLIT_RE.split(text) if slug]
+
+
+def build_parser(parser_class: type = argparse.ArgumentParser) -> argparse.ArgumentParser:
+    """
+    :param parser_class: ArgumentParser 子类（守护进程用它把参数错误转换为异常）
+    """
+    parser = parser_class(description="非交互式题单管理，结果以 JSON 输出")
+    parser.add_argument("--rate", type=float, default=0, help="每秒最多请求次数（<=0 不限速）")
+    parser.add_argument("--compact", action="store_true", help="输出单行 JSON")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    list_parser = subparsers.add_parser("list", help="列出题单")
+    kind = list_parser.add_mutually_exclusive_group()
+    kind.add_argument("--created", dest="kind", action="store_const", const="created", help="只列出自己创建的题单")
+    kind.add_argument("--collected", dest="kind", action="store_const", const="collected", help="只列出收藏的题单")
+
+    show_parser = subparsers.add_parser("show", help="查看题单中的题目")
+    show_parser.add_argument("slug", help="题单 slug")
+    show_parser.add_argument("--skip", type=int, default=0, help="跳过的题目数量")
+    show_parser.add_argument("--limit", type=int, default=100, help="每次请求的题目数量")
+    show_parser.add_argument("--all", dest="all_pages", action="store_true", help="请求到最后一页")
+    show_parser.add_argument("--difficulty", nargs="+", help="难度: easy / medium / hard")
+    show_parser.add_argument("--status", nargs="+", help="状态: solved / attempted / todo / unsolved")
+    show_parser.add_argument("--tag", dest="tags", nargs="+", help="标签 slug，如 dynamic-programming")
+    premium = show_parser.add_mutually_exclusive_group()
+    premium.add_argument("--premium", dest="premium", action="store_const", const=True, help="只看会员题")
+    premium.add_argument("--no-premium", dest="premium", action="store_const", const=False, help="排除会员题")
+    show_parser.add_argument("--keyword", default="", help="搜索关键字")
+    show_parser.add_argument("--sort", help="排序: custom / id / ac_rate / difficulty，前面加 - 表示降序（如 --sort=-ac_rate）")
+
+    create_parser = subparsers.add_parser("create", help="创建题单并添加题目")
+    create_parser.add_argument("name", help="题单名称")
+    create_parser.add_argument("slugs", nargs="*", help="题目 slug（- 表示从 stdin 读取）")
+    create_parser.add_argument("-f", "--file", help="从文件读取题目 slug")
+    create_parser.add_argument("--public", action="store_true", help="公开题单")
+    create_parser.add_argument("--description", default="", help="题单描述")
+
+    for name, help_text in (("add", "向题单添加题目"), ("remove", "从题单删除题目")):
+        sub = subparsers.add_parser(name, help=help_text)
+        sub.add_argument("slug", help="题单 slug")
+        sub.add_argument("slugs", nargs="*", help="题目 slug（- 表示从 stdin 读取）")
+        sub.add_argument("-f", "--file", help="从文件读取题目 slug")
+
+    delete_parser = subparsers.add_parser("delete", help="删除题单或取消收藏")
+    delete_parser.add_argument("slugs", nargs="*", help="题单 slug（- 表示从 stdin 读取）")
+    delete_parser.add_argument("-f", "--file", help="从文件读取题单 slug")
+    delete_kind = delete_parser.add_mutually_exclusive_group()
+    delete_kind.add_argument("--created", dest="collected", action="store_const", const=False, help="都是自己创建的题单（不再请求题单列表）")
+    delete_kind.add_argument("--collected", dest="collected", action="store_const", const=True, help="都是收藏的题单（不再请求题单列表）")
+
+    for name, help_text in (("fork", "复制他人的题单"), ("collect", "收藏他人的题单")):
+        sub = subparsers.add_parser(name, help=help_text)
+        sub.add_argument("slugs", nargs="*", help="题单 slug（- 表示从 stdin 读取）")
+        sub.add_argument("-f", "--file", help="从文件读取题单 slug")
+
+    export_parser = subparsers.add_parser("export", help="写入 favorite_list.md")
+    export_parser.add_argument("-o", "--output", default="favorite_list.md", help="输出文件")
+    return parser
+
+
+def params_from_args(args: argparse.Namespace, stdin: Optional[str] = None) -> Dict[str, Any]:
+    """把命令行参数转换为子命令函数的关键字参数"""
+    command = args.command
+    if command == "list":
+        return {"kind": args.kind or "all"}
+    if command == "show":
+        return {
+            "slug": args.slug,
+            "skip": args.skip,
+            "limit": args.limit,
+            "all_pages": args.all_pages,
+            "difficulty": args.difficulty,
+            "status": args.status,
+            "tags": args.tags,
+            "premium": args.premium,
+            "keyword": args.keyword,
+            "sort": args.sort,
+        }
+    if command == "export":
+        return {"output": args.output}
+
+    slugs = read_slugs(args.slugs, args.file, stdin)
+    if command == "create":
+        return {"name": args.name, "slugs": slugs, "public": args.public, "description": args.description}
+    if command in ("add", "remove"):
+        return {"slug": args.slug, "slugs": slugs}
+    if command == "delete":
+        return {"slugs": slugs, "collected": args.collected}
+    return {"slugs": slugs}
+
+
+def print_result(result: Dict[str, Any], compact: bool = False) -> None:
+    print(json.dumps(result, ensure_ascii=False, indent=None if compact else 2))
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    args = build_parser().parse_args(argv)
+    params = params_from_args(args)
+    if "slugs" in params and args.command != "create" and not params["slugs"]:
+        raise SystemExit("错误：没有输入 slug")
+
+    from dotenv import load_dotenv
+
+    load_dotenv(BASE_DIR / ".env")
+    csrf_token = os.getenv("csrftoken")
+    session_id = os.getenv("LEETCODE_SESSION")
+    if not csrf_token or not session_id:
+        raise SystemExit("错误：请在 .env 文件中配置 csrftoken 和 LEETCODE_SESSION")
+
+    client = LeetCodeClient(csrf_token, session_id, rate_limiter=RateLimiter(args.rate))
+    # 客户端的提示信息输出到 stderr，stdout 只保留 JSON
+    with contextlib.redirect_stdout(sys.stderr):
+        result = run_command(client, args.command, params)
+    print_result(result, args.compact)
+    raise SystemExit(0 if result.get("ok") else 1)
+
+
+if __name__ == "__main__":
+    main()
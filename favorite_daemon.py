@@ -0,0 +1,271 @@
+"""
+本地守护进程：常驻一个 LeetCodeClient（连接池、限速器与只读请求缓存保持温热），
+通过 127.0.0.1 上的 HTTP 接口执行 favorite_cli.py 的子命令和 favorite_ops.py 的操作文件。
+call 是一个只依赖标准库的轻量客户端，不需要导入 requests 等依赖，也不需要重新获取题单列表。
+
+启动后会把端口和随机访问令牌写入 .daemon.json（仅当前用户可读），所有 POST 请求都需要带上
+X-Daemon-Token 请求头；来自 https://leetcode.cn 的跨域请求（如油猴脚本）同样需要令牌。
+
+接口:
+    GET  /health                         运行状态
+    POST /run      {"command", "params"}  执行子命令（参数与 favorite_cli.py 的子命令函数相同）
+    POST /argv     {"argv", "stdin"}      按 favorite_cli.py 的命令行解析后执行
+    POST /ops      {"operations", "workers"}  执行操作列表
+    POST /refresh                         清空缓存
+    POST /shutdown                        停止守护进程
+
+用法:
+    python favorite_daemon.py serve [--port 8765] [--ttl 60] [--rate 0]
+    python favorite_daemon.py call list --created
+    cat slugs.txt | python favorite_daemon.py call add <题单slug> -
+    python favorite_daemon.py status | refresh | stop
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+import urllib.error
+import urllib.request
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+BASE_DIR = Path(__file__).resolve().parent
+DAEMON_STATE_PATH = BASE_DIR / ".daemon.json"
+
+DEFAULT_DAEMON_HOST = "127.0.0.1"
+DEFAULT_DAEMON_PORT = 8765
+DEFAULT_CACHE_TTL = 60.0
+ALLOWED_ORIGINS = {"https://leetcode.cn"}
+
+
+class _ArgumentError(Exception):
+    pass
+
+
+def serve(host: str = DEFAULT_DAEMON_HOST, port: int = DEFAULT_DAEMON_PORT, ttl: float = DEFAULT_CACHE_TTL, rate: float = 0) -> None:
+    """启动守护进程（阻塞直到收到 /shutdown 或 Ctrl+C）"""
+    import atexit
+    import contextlib
+    import io
+    import secrets
+    import threading
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    from dotenv import load_dotenv
+
+    from favorite_cli import build_parser, params_from_args, run_command
+    from favorite_ops import CachedClient, run_operations
+    from leetcode_favorite import LeetCodeClient, RateLimiter
+
+    load_dotenv(BASE_DIR / ".env")
+    csrf_token = os.getenv("csrftoken")
+    session_id = os.getenv("LEETCODE_SESSION")
+    if not csrf_token or not session_id:
+        raise SystemExit("错误：请在 .env 文件中配置 csrftoken 和 LEETCODE_SESSION")
+
+    class RaisingParser(argparse.ArgumentParser):
+        def __init__(self, *args: Any, **kwargs: Any) -> None:
+            kwargs.setdefault("prog", "favorite_cli.py")
+            super().__init__(*args, **kwargs)
+
+        def error(self, message: str) -> None:
+            raise _ArgumentError(message)
+
+        def print_help(self, file=None) -> None:
+            raise _ArgumentError(self.format_help())
+
+    client = CachedClient(LeetCodeClient(csrf_token, session_id, rate_limiter=RateLimiter(rate)), ttl=ttl)
+    parser = build_parser(RaisingParser)
+    token = secrets.token_urlsafe(24)
+    started = time.time()
+
+    def run_argv(argv: List[str], stdin: Optional[str]) -> Dict[str, Any]:
+        try:
+            args = parser.parse_args(argv)
+            params = params_from_args(args, stdin=stdin if stdin is not None else "")
+        except _ArgumentError as e:
+            return {"ok": False, "error": str(e)}
+        except OSError as e:
+            return {"ok": False, "error": f"读取文件失败: {e}"}
+        return run_command(client, args.command, params)
+
+    class Handler(BaseHTTPRequestHandler):
+        def _send(self, status: int, result: Dict[str, Any]) -> None:
+            body = json.dumps(result, ensure_ascii=False).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            origin = self.headers.get("Origin")
+            if origin in ALLOWED_ORIGINS:
+                self.send_header("Access-Control-Allow-Origin", origin)
+            self.end_headers()
+            self.wfile.write(body)
+
+        def do_OPTIONS(self) -> None:
+            origin = self.headers.get("Origin")
+            self.send_response(204 if origin in ALLOWED_ORIGINS else 403)
+            if origin in ALLOWED_ORIGINS:
+                self.send_header("Access-Control-Allow-Origin", origin)
+                self.send_header("Access-Control-Allow-Methods", "GET, POST")
+                self.send_header("Access-Control-Allow-Headers", "Content-Type, X-Daemon-Token")
+            self.end_headers()
+
+        def do_GET(self) -> None:
+            if self.path != "/health":
+                self._send(404, {"ok": False, "error": f"未知接口: {self.path}"})
+                return
+            self._send(200, {"ok": True, "pid": os.getpid(), "uptime": round(time.time() - started, 1), "cache_hits": client.hits})
+
+        def do_POST(self) -> None:
+            if not secrets.compare_digest(self.headers.get("X-Daemon-Token", ""), token):
+                self._send(403, {"ok": False, "error": "访问令牌无效"})
+                return
+            try:
+                length = int(self.headers.get("Content-Length") or 0)
+                payload = json.loads(self.rfile.read(length) or b"{}")
+            except ValueError:
+                self._send(400, {"ok": False, "error": "请求体不是有效的 JSON"})
+                return
+
+            if self.path == "/run":
+                result = run_command(client, str(payload.get("command")), payload.get("params") or {})
+            elif self.path == "/argv":
+                result = run_argv([str(a) for a in payload.get("argv") or []], payload.get("stdin"))
+            elif self.path == "/ops":
+                try:
+                    summary = run_operations(client, payload.get("operations") or [], max_workers=int(payload.get("workers") or 4))
+                except ValueError as e:
+                    result = {"ok": False, "error": f"操作有误: {e}"}
+                else:
+                    result = {"ok": all(item["status"] == "ok" for item in summary), "operations": summary}
+            elif self.path == "/refresh":
+                client.clear()
+                result = {"ok": True}
+            elif self.path == "/shutdown":
+                threading.Thread(target=server.shutdown, daemon=True).start()
+                result = {"ok": True}
+            else:
+                self._send(404, {"ok": False, "error": f"未知接口: {self.path}"})
+                return
+            self._send(200, result)
+
+        def log_message(self, format: str, *args: Any) -> None:
+            sys.stderr.write(f"[{self.log_date_time_string()}] {format % args}\n")
+
+    server = ThreadingHTTPServer((host, port), Handler)
+    server.daemon_threads = True
+
+    # 预热：连接池与题单列表
+    with contextlib.redirect_stdout(io.StringIO()):
+        client.get_favorite_lists()
+
+    fd = os.open(DAEMON_STATE_PATH, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+    with os.fdopen(fd, "w", encoding="utf-8") as f:
+        json.dump({"host": host, "port": server.server_address[1], "token": token, "pid": os.getpid()}, f)
+    atexit.register(lambda: DAEMON_STATE_PATH.unlink(missing_ok=True))
+
+    print(f"守护进程已启动: http://{host}:{server.server_address[1]}（pid {os.getpid()}，令牌见 {DAEMON_STATE_PATH.name}）")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        print("守护进程已停止")
+
+
+def _read_state() -> Optional[Dict[str, Any]]:
+    try:
+        with open(DAEMON_STATE_PATH, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def request_daemon(path: str, payload: Optional[Dict[str, Any]] = None, timeout: float = 600) -> Dict[str, Any]:
+    """
+    向守护进程发送请求（只使用标准库）
+    :param payload: 为 None 时发送 GET，否则以 JSON 发送 POST
+    :return: 守护进程返回的 JSON；守护进程未运行时返回 {"ok": False, "error": ...}
+    """
+    state = _read_state()
+    if state is None:
+        return {"ok": False, "error": "守护进程未运行（python favorite_daemon.py serve）"}
+    url = f"http://{state['host']}:{state['port']}{path}"
+    data = None if payload is None else json.dumps(payload, ensure_ascii=False).encode("utf-8")
+    req = urllib.request.Request(url, data=data, headers={"Content-Type": "application/json", "X-Daemon-Token": state["token"]})
+    try:
+        with urllib.request.urlopen(req, timeout=timeout) as response:
+            return json.loads(response.read())
+    except urllib.error.HTTPError as e:
+        try:
+            return json.loads(e.read())
+        except ValueError:
+            return {"ok": False, "error": f"HTTP {e.code}"}
+    except (urllib.error.URLError, OSError) as e:
+        return {"ok": False, "error": f"无法连接守护进程: {e}"}
+
+
+def _forward_argv(argv: List[str]) -> Dict[str, Any]:
+    """转发 favorite_cli.py 的命令行：读取 stdin（- 时），并把 -f 的文件路径转为绝对路径"""
+    argv = list(argv)
+    stdin = None
+    for i, arg in enumerate(argv):
+        if arg in ("-f", "--file") and i + 1 < len(argv) and argv[i + 1] != "-":
+            argv[i + 1] = os.path.abspath(argv[i + 1])
+        elif arg.startswith("--file=") and arg != "--file=-":
+            argv[i] = "--file=" + os.path.abspath(arg[len("--file="):])
+    if "-" in argv or "--file=-" in argv or any(a in ("-f", "--file") and b == "-" for a, b in zip(argv, argv[1:])):
+        stdin = sys.stdin.read()
+    return request_daemon("/argv", {"argv": argv, "stdin": stdin})
+
+
+def call(argv: List[str]) -> None:
+    """轻量客户端：把 favorite_cli.py 的命令行转发给守护进程，输出 JSON 结果"""
+    compact = "--compact" in argv
+    argv = [arg for arg in argv if arg != "--compact"]
+    if not argv:
+        raise SystemExit("错误：缺少子命令（如 call list）")
+    result = _forward_argv(argv)
+    print(json.dumps(result, ensure_ascii=False, indent=None if compact else 2))
+    raise SystemExit(0 if result.get("ok") else 1)
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    argv = sys.argv[1:] if argv is None else argv
+    if argv[:1] == ["call"]:
+        # 参数原样转发，不经过本地解析
+        call(argv[1:])
+
+    parser = argparse.ArgumentParser(description="本地守护进程：保持客户端与缓存常驻")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    serve_parser = subparsers.add_parser("serve", help="启动守护进程")
+    serve_parser.add_argument("--host", default=DEFAULT_DAEMON_HOST, help="监听地址（默认只监听本机）")
+    serve_parser.add_argument("--port", type=int, default=DEFAULT_DAEMON_PORT, help="监听端口（0 表示随机端口）")
+    serve_parser.add_argument("--ttl", type=float, default=DEFAULT_CACHE_TTL, help="只读请求缓存的有效期（秒）")
+    serve_parser.add_argument("--rate", type=float, default=0, help="每秒最多请求次数（<=0 不限速）")
+
+    # call 在解析前已经处理，这里只用于 --help 显示
+    call_parser = subparsers.add_parser("call", help="通过守护进程执行 favorite_cli.py 的子命令")
+    call_parser.add_argument("argv", nargs=argparse.REMAINDER, help="favorite_cli.py 的参数")
+
+    subparsers.add_parser("status", help="查看守护进程状态")
+    subparsers.add_parser("refresh", help="清空守护进程的缓存")
+    subparsers.add_parser("stop", help="停止守护进程")
+    args = parser.parse_args(argv)
+
+    if args.command == "serve":
+        serve(args.host, args.port, args.ttl, args.rate)
+        return
+
+    path = {"status": "/health", "refresh": "/refresh", "stop": "/shutdown"}[args.command]
+    result = request_daemon(path, None if args.command == "status" else {})
+    print(json.dumps(result, ensure_ascii=False, indent=2))
+    raise SystemExit(0 if result.get("ok") else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,531 @@
+"""
+导出所有题单的完整内容（题目、难度、状态、通过率、标签），用于离线分析。
+
+- 支持 JSONL / CSV / SQLite 三种格式
+- 每个题单按页获取 favoriteQuestionList，多个题单并发获取
+- 每页题目到达后立即写入，内存占用与题单数量、题目数量无关
+- 增量导出：导出清单（<输出文件>.manifest.json）记录每个题单的 lastQuestionAddedAt、
+  题目数量和内容指纹，之后的导出只重新获取元数据（名称、类型、最后加题时间）有变化的题单，
+  不为未变化的题单发送任何请求。移除题目不会改变 lastQuestionAddedAt，默认发现不了：
+  加 --verify-counts 为每个未变化的题单多发一次 limit=1 的请求核对题目数量，
+  仅调整顺序需 --full。内容指纹只用于统计重新获取的题单中内容真正变化的数量
+
+用法:
+    python favorite_export.py --format jsonl -o favorites.jsonl
+    python favorite_export.py --format csv -o favorites.csv
+    python favorite_export.py --format sqlite -o favorites.db
+    python favorite_export.py --format jsonl -o favorites.jsonl --full   # 忽略清单全量导出
+    python favorite_export.py --format jsonl -o favorites.jsonl --verify-counts  # 同时发现被移除的题目
+"""
+
+import argparse
+import csv
+import hashlib
+import json
+import os
+import queue
+import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Set
+
+from dotenv import load_dotenv
+
+from leetcode_favorite import (
+    BASE_DIR,
+    EXPORT_MAX_WORKERS,
+    LeetCodeClient,
+    Question,
+    atomic_write_text,
+    favorite_metadata,
+    favorite_metadata_unchanged,
+    find_count_changed_favorites,
+    list_all_favorites,
+)
+
+# 每次请求的题目数量
+DEFAULT_PAGE_SIZE = 100
+
+# 每行导出的字段（CSV 列顺序 / SQLite 列）
+EXPORT_FIELDS = [
+    "favorite_slug",
+    "favorite_name",
+    "favorite_type",
+    "position",
+    "questionFrontendId",
+    "titleSlug",
+    "translatedTitle",
+    "title",
+    "difficulty",
+    "status",
+    "paidOnly",
+    "acRate",
+    "topicTags",
+]
+
+
+def question_to_row(favorite: Dict[str, Any], position: int, question: Question) -> Dict[str, Any]:
+    """把题单中的一道题转换为导出行。position 从 1 开始。"""
+    return {
+        "favorite_slug": favorite.get("slug", ""),
+        "favorite_name": favorite.get("name", ""),
+        "favorite_type": "created" if favorite.get("is_created") else "collected",
+        "position": position,
+        "questionFrontendId": question.get("questionFrontendId", ""),
+        "titleSlug": question.get("titleSlug", ""),
+        "translatedTitle": question.get("translatedTitle", ""),
+        "title": question.get("title", ""),
+        "difficulty": question.get("difficulty", ""),
+        "status": question.get("status") or "",
+        "paidOnly": bool(question.get("paidOnly")),
+        "acRate": question.get("acRate"),
+        "topicTags": [tag.get("slug", "") for tag in question.get("topicTags") or []],
+    }
+
+
+def _row_fingerprint_bytes(row: Dict[str, Any]) -> bytes:
+    return json.dumps(row, ensure_ascii=False, sort_keys=True).encode("utf-8")
+
+
+class JsonlExportWriter:
+    """每道题一行 JSON。先写临时文件，close 时替换目标文件。"""
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self._tmp_path = path.with_name(f".{path.name}.tmp")
+        self._file = open(self._tmp_path, "w", encoding="utf-8")
+        self._written: Set[str] = set()
+
+    def keep_existing(self, favorite_slugs: Set[str]) -> int:
+        """从上一次的导出文件中逐行复制这些题单的行，返回复制的行数。"""
+        if not favorite_slugs or not self.path.exists():
+            return 0
+        copied = 0
+        with open(self.path, "r", encoding="utf-8") as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                if json.loads(line).get("favorite_slug") in favorite_slugs:
+                    self._file.write(line if line.endswith("\n") else line + "\n")
+                    copied += 1
+        return copied
+
+    def write_rows(self, rows: List[Dict[str, Any]]) -> None:
+        for row in rows:
+            self._written.add(row["favorite_slug"])
+            self._file.write(json.dumps(row, ensure_ascii=False))
+            self._file.write("\n")
+        self._file.flush()
+
+    def finish_favorite(self, favorite_slug: str) -> None:
+        """题单的行已全部写入临时文件，无需额外处理。"""
+
+    def discard_favorite(self, favorite_slug: str) -> None:
+        """丢弃该题单已写入临时文件的行（获取中途失败时调用）。"""
+        if favorite_slug not in self._written:
+            return
+        self._written.discard(favorite_slug)
+        self._file.close()
+        part_path = self._tmp_path.with_name(self._tmp_path.name + ".part")
+        with open(self._tmp_path, "r", encoding="utf-8") as src, open(part_path, "w", encoding="utf-8") as dst:
+            for line in src:
+                if json.loads(line).get("favorite_slug") != favorite_slug:
+                    dst.write(line)
+        os.replace(part_path, self._tmp_path)
+        self._file = open(self._tmp_path, "a", encoding="utf-8")
+
+    def close(self, commit: bool = True) -> None:
+        self._file.close()
+        if commit:
+            os.replace(self._tmp_path, self.path)
+        else:
+            self._tmp_path.unlink(missing_ok=True)
+
+
+class CsvExportWriter:
+    """CSV，标签用 | 连接。先写临时文件，close 时替换目标文件。"""
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self._tmp_path = path.with_name(f".{path.name}.tmp")
+        # utf-8-sig 便于 Excel 正确识别中文
+        self._file = open(self._tmp_path, "w", encoding="utf-8-sig", newline="")
+        self._writer = csv.DictWriter(self._file, fieldnames=EXPORT_FIELDS)
+        self._writer.writeheader()
+        self._written: Set[str] = set()
+
+    def keep_existing(self, favorite_slugs: Set[str]) -> int:
+        """从上一次的导出文件中逐行复制这些题单的行，返回复制的行数。"""
+        if not favorite_slugs or not self.path.exists():
+            return 0
+        copied = 0
+        with open(self.path, "r", encoding="utf-8-sig", newline="") as f:
+            for row in csv.DictReader(f):
+                if row.get("favorite_slug") in favorite_slugs:
+                    self._writer.writerow(row)
+                    copied += 1
+        return copied
+
+    def write_rows(self, rows: List[Dict[str, Any]]) -> None:
+        for row in rows:
+            self._written.add(row["favorite_slug"])
+            self._writer.writerow(dict(row, topicTags="|".join(row["topicTags"])))
+        self._file.flush()
+
+    def finish_favorite(self, favorite_slug: str) -> None:
+        """题单的行已全部写入临时文件，无需额外处理。"""
+
+    def discard_favorite(self, favorite_slug: str) -> None:
+        """丢弃该题单已写入临时文件的行（获取中途失败时调用）。"""
+        if favorite_slug not in self._written:
+            return
+        self._written.discard(favorite_slug)
+        self._file.close()
+        part_path = self._tmp_path.with_name(self._tmp_path.name + ".part")
+        with open(self._tmp_path, "r", encoding="utf-8-sig", newline="") as src, \
+                open(part_path, "w", encoding="utf-8-sig", newline="") as dst:
+            writer = csv.DictWriter(dst, fieldnames=EXPORT_FIELDS)
+            writer.writeheader()
+            writer.writerows(row for row in csv.DictReader(src) if row.get("favorite_slug") != favorite_slug)
+        os.replace(part_path, self._tmp_path)
+        self._file = open(self._tmp_path, "a", encoding="utf-8", newline="")
+        self._writer = csv.DictWriter(self._file, fieldnames=EXPORT_FIELDS)
+
+    def close(self, commit: bool = True) -> None:
+        self._file.close()
+        if commit:
+            os.replace(self._tmp_path, self.path)
+        else:
+            self._tmp_path.unlink(missing_ok=True)
+
+
+class SqliteExportWriter:
+    """
+    SQLite，表 favorite_questions，主键 (favorite_slug, position)。直接在原数据库上更新。
+
+    每页题目先写入临时表，题单全部获取完成后再替换该题单的旧行；整次导出是一个事务，
+    close(commit=False) 时回滚，原数据库保持不变。
+    """
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self._conn = sqlite3.connect(str(path))
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS favorite_questions (
+                favorite_slug TEXT NOT NULL,
+                favorite_name TEXT,
+                favorite_type TEXT,
+                position INTEGER NOT NULL,
+                questionFrontendId TEXT,
+                titleSlug TEXT,
+                translatedTitle TEXT,
+                title TEXT,
+                difficulty TEXT,
+                status TEXT,
+                paidOnly INTEGER,
+                acRate REAL,
+                topicTags TEXT,
+                PRIMARY KEY (favorite_slug, position)
+            )
+            """
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_favorite_questions_slug ON favorite_questions (titleSlug)"
+        )
+        self._conn.execute(
+            "CREATE TEMP TABLE favorite_questions_staging AS SELECT * FROM favorite_questions WHERE 0"
+        )
+        self._conn.commit()
+        self._placeholders = ", ".join("?" for _ in EXPORT_FIELDS)
+        self._columns = ", ".join(EXPORT_FIELDS)
+        # close 时保留这些题单的行，其余题单（已不存在或未成功导出过）的行会被删除
+        self._keep: Set[str] = set()
+
+    def keep_existing(self, favorite_slugs: Set[str]) -> int:
+        """保留这些题单的现有行，返回保留的行数。"""
+        self._keep.update(favorite_slugs)
+        return sum(
+            self._conn.execute(
+                "SELECT COUNT(*) FROM favorite_questions WHERE favorite_slug = ?", (slug,)
+            ).fetchone()[0]
+            for slug in favorite_slugs
+        )
+
+    def write_rows(self, rows: List[Dict[str, Any]]) -> None:
+        values = [
+            tuple(
+                json.dumps(row[f], ensure_ascii=False) if f == "topicTags" else row[f]
+                for f in EXPORT_FIELDS
+            )
+            for row in rows
+        ]
+        self._conn.executemany(
+            f"INSERT INTO favorite_questions_staging ({self._columns}) VALUES ({self._placeholders})",
+            values,
+        )
+
+    def finish_favorite(self, favorite_slug: str) -> None:
+        """题单获取完成：删除旧行并写入暂存的新行。"""
+        self._conn.execute("DELETE FROM favorite_questions WHERE favorite_slug = ?", (favorite_slug,))
+        self._conn.execute(
+            f"INSERT OR REPLACE INTO favorite_questions ({self._columns}) "
+            f"SELECT {self._columns} FROM favorite_questions_staging WHERE favorite_slug = ?",
+            (favorite_slug,),
+        )
+        self._conn.execute("DELETE FROM favorite_questions_staging WHERE favorite_slug = ?", (favorite_slug,))
+        self._keep.add(favorite_slug)
+
+    def discard_favorite(self, favorite_slug: str) -> None:
+        """丢弃该题单暂存的行，旧行保持不变（获取中途失败时调用）。"""
+        self._conn.execute("DELETE FROM favorite_questions_staging WHERE favorite_slug = ?", (favorite_slug,))
+
+    def close(self, commit: bool = True) -> None:
+        try:
+            if commit:
+                existing = [r[0] for r in self._conn.execute("SELECT DISTINCT favorite_slug FROM favorite_questions")]
+                stale = [(slug,) for slug in existing if slug not in self._keep]
+                self._conn.executemany("DELETE FROM favorite_questions WHERE favorite_slug = ?", stale)
+                self._conn.commit()
+            else:
+                self._conn.rollback()
+        finally:
+            self._conn.close()
+
+
+EXPORT_WRITERS = {
+    "jsonl": JsonlExportWriter,
+    "csv": CsvExportWriter,
+    "sqlite": SqliteExportWriter,
+}
+
+
+def _open_writer(fmt: str, path: Path):
+    if fmt not in EXPORT_WRITERS:
+        raise ValueError(f"不支持的导出格式: {fmt}（可选: {', '.join(EXPORT_WRITERS)}）")
+    return EXPORT_WRITERS[fmt](path)
+
+
+def manifest_path_for(output_path: Path) -> Path:
+    return output_path.with_name(output_path.name + ".manifest.json")
+
+
+def load_export_manifest(output_path: Path, fmt: str) -> Dict[str, Dict[str, Any]]:
+    """
+    读取导出清单 {题单 slug: {name, is_created, lastQuestionAddedAt, fingerprint, count}}。
+    清单不存在、格式不同或导出文件已被删除时返回空清单（即全量导出）。
+    """
+    path = manifest_path_for(output_path)
+    if not path.exists() or not output_path.exists():
+        return {}
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+    except (json.JSONDecodeError, OSError):
+        return {}
+    if not isinstance(data, dict) or data.get("format") != fmt:
+        return {}
+    favorites = data.get("favorites")
+    return favorites if isinstance(favorites, dict) else {}
+
+
+def save_export_manifest(output_path: Path, fmt: str, favorites: Dict[str, Dict[str, Any]]) -> None:
+    data = {
+        "format": fmt,
+        "exported_at": datetime.now().isoformat(timespec="seconds"),
+        "favorites": favorites,
+    }
+    atomic_write_text(manifest_path_for(output_path), json.dumps(data, ensure_ascii=False, indent=2))
+
+
+def _is_unchanged(favorite: Dict[str, Any], entry: Optional[Dict[str, Any]]) -> bool:
+    """题单元数据与清单一致且清单中有内容指纹时视为未变化（不会发现只移除了题目的题单）。"""
+    return bool(entry and entry.get("fingerprint")) and favorite_metadata_unchanged(favorite, entry)
+
+
+def stream_favorite_contents(
+    client: LeetCodeClient,
+    favorites: List[Dict[str, Any]],
+    writer,
+    max_workers: int = EXPORT_MAX_WORKERS,
+    page_size: int = DEFAULT_PAGE_SIZE,
+) -> Dict[str, Optional[Dict[str, Any]]]:
+    """
+    并发分页获取每个题单的题目，并在主线程中按到达顺序写入 writer。
+
+    工作线程与写入线程之间使用有界队列，获取速度超过写入速度时工作线程会阻塞，
+    因此任意时刻内存中最多只有 2 * max_workers 页题目。题单获取完成后调用 writer.finish_favorite，
+    中途失败时调用 writer.discard_favorite 丢弃已写入的部分。
+    :return: {题单 slug: {count, fingerprint}}，获取失败的题单为 None
+    """
+    workers = max(1, max_workers)
+    pages: "queue.Queue[tuple]" = queue.Queue(maxsize=workers * 2)
+
+    cancelled = threading.Event()
+
+    def fetch(favorite: Dict[str, Any]) -> None:
+        position = 0
+        digest = hashlib.sha1()
+        try:
+            for questions in client.iter_favorite_question_pages(favorite["slug"], page_size=page_size):
+                if cancelled.is_set():
+                    return
+                rows = []
+                for question in questions:
+                    position += 1
+                    row = question_to_row(favorite, position, question)
+                    digest.update(_row_fingerprint_bytes(row))
+                    rows.append(row)
+                pages.put(("page", favorite, rows))
+        except Exception as e:
+            pages.put(("error", favorite, str(e)))
+            return
+        pages.put(("done", favorite, {"count": position, "fingerprint": digest.hexdigest()}))
+
+    results: Dict[str, Optional[Dict[str, Any]]] = {}
+    pending = [fav for fav in favorites if fav.get("slug")]
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = [executor.submit(fetch, fav) for fav in pending]
+
+        remaining = len(pending)
+        try:
+            while remaining:
+                kind, favorite, payload = pages.get()
+                if kind == "page":
+                    writer.write_rows(payload)
+                    continue
+                remaining -= 1
+                if kind == "done":
+                    writer.finish_favorite(favorite["slug"])
+                    results[favorite["slug"]] = payload
+                else:
+                    writer.discard_favorite(favorite["slug"])
+                    results[favorite["slug"]] = None
+                    print(f"导出题单失败: {favorite.get('name', '')} ({favorite['slug']}): {payload}")
+        except BaseException:
+            # 写入失败或被中断：通知工作线程停止，并清空队列避免其阻塞在 put 上
+            cancelled.set()
+            executor.shutdown(wait=False, cancel_futures=True)
+            while True:
+                try:
+                    pages.get(timeout=0.1)
+                except queue.Empty:
+                    if all(f.done() for f in futures):
+                        break
+            raise
+
+    return results
+
+
+def export_favorite_contents(
+    client: LeetCodeClient,
+    output_path: Path,
+    fmt: str = "jsonl",
+    max_workers: int = EXPORT_MAX_WORKERS,
+    page_size: int = DEFAULT_PAGE_SIZE,
+    full: bool = False,
+    verify_counts: bool = False,
+) -> Dict[str, Optional[Dict[str, Any]]]:
+    """
+    导出当前账号所有题单（创建的 + 收藏的）的完整内容。
+
+    默认增量导出：根据导出清单跳过元数据未变化的题单，直接保留其上次导出的行，
+    只重新获取有变化的题单，除获取题单列表外不发送额外请求；full=True 时忽略清单全量导出。
+    :param verify_counts: 另外为每个元数据未变化的题单发送一次 limit=1 的请求核对题目数量，
+        以发现只移除了题目的题单（题单多时请求数随之增加）
+    """
+    t0 = time.perf_counter()
+    favorites = list_all_favorites(client)
+    t1 = time.perf_counter()
+
+    manifest = {} if full else load_export_manifest(output_path, fmt)
+    unchanged = [fav for fav in favorites if fav.get("slug") and _is_unchanged(fav, manifest.get(fav["slug"]))]
+    if verify_counts:
+        expected = {fav["slug"]: manifest[fav["slug"]].get("count") for fav in unchanged}
+        recount = {fav["slug"] for fav in find_count_changed_favorites(client, unchanged, expected, max_workers)}
+        unchanged = [fav for fav in unchanged if fav["slug"] not in recount]
+    unchanged_slugs = {fav["slug"] for fav in unchanged}
+    changed = [fav for fav in favorites if fav.get("slug") and fav["slug"] not in unchanged_slugs]
+    current_slugs = {fav["slug"] for fav in favorites if fav.get("slug")}
+    removed = [slug for slug in manifest if slug not in current_slugs]
+
+    writer = _open_writer(fmt, output_path)
+    try:
+        kept_rows = writer.keep_existing(unchanged_slugs)
+        results = stream_favorite_contents(client, changed, writer, max_workers=max_workers, page_size=page_size)
+        # 获取失败的题单沿用上次导出的行
+        failed = {slug for slug, result in results.items() if result is None}
+        kept_failed_rows = writer.keep_existing(failed)
+    except BaseException:
+        writer.close(commit=False)
+        raise
+    writer.close()
+    t2 = time.perf_counter()
+
+    new_manifest: Dict[str, Dict[str, Any]] = {slug: manifest[slug] for slug in unchanged_slugs}
+    modified = 0
+    for fav in changed:
+        result = results.get(fav["slug"])
+        previous = manifest.get(fav["slug"]) or {}
+        if result is None:
+            # 获取失败的题单沿用旧行，清单项也保持旧值，元数据已变化的题单下次导出时会重新获取
+            if previous:
+                new_manifest[fav["slug"]] = previous
+            continue
+        if previous.get("fingerprint") != result["fingerprint"]:
+            modified += 1
+        new_manifest[fav["slug"]] = dict(favorite_metadata(fav), **result)
+    save_export_manifest(output_path, fmt, new_manifest)
+
+    exported = [r["count"] for r in results.values() if r is not None]
+    print(
+        f"导出完成 -> {output_path}\n"
+        f"跳过未变化 {len(unchanged)} 个（保留 {kept_rows} 行），"
+        f"重新获取 {len(exported)}/{len(changed)} 个（{sum(exported)} 道题，内容有变化 {modified} 个），"
+        f"移除 {len(removed)} 个\n"
+        + (f"获取失败 {len(failed)} 个，沿用上次导出的 {kept_failed_rows} 行\n" if failed else "")
+        + f"获取题单列表 {t1 - t0:.2f}s，获取并写入题目 {t2 - t1:.2f}s"
+    )
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="导出所有题单的完整内容（JSONL / CSV / SQLite）")
+    parser.add_argument("--format", choices=sorted(EXPORT_WRITERS), default="jsonl", help="导出格式（默认 jsonl）")
+    parser.add_argument("-o", "--output", help="输出文件路径（默认 favorites.<format>）")
+    parser.add_argument("--workers", type=int, default=EXPORT_MAX_WORKERS, help="并发获取的题单数")
+    parser.add_argument("--page-size", type=int, default=DEFAULT_PAGE_SIZE, help="每次请求的题目数量")
+    parser.add_argument("--full", action="store_true", help="忽略导出清单，重新获取所有题单")
+    parser.add_argument(
+        "--verify-counts",
+        action="store_true",
+        help="每个未变化的题单额外请求一次核对题目数量，以发现被移除的题目",
+    )
+    args = parser.parse_args()
+
+    load_dotenv(BASE_DIR / ".env")
+    csrf_token = os.getenv("csrftoken")
+    session_id = os.getenv("LEETCODE_SESSION")
+    if not csrf_token or not session_id:
+        raise SystemExit("错误：请在 .env 文件中配置 csrftoken 和 LEETCODE_SESSION")
+
+    suffix = "db" if args.format == "sqlite" else args.format
+    output_path = Path(args.output) if args.output else BASE_DIR / f"favorites.{suffix}"
+
+    client = LeetCodeClient(csrf_token, session_id)
+    export_favorite_contents(
+        client,
+        output_path,
+        args.format,
+        max_workers=args.workers,
+        page_size=args.page_size,
+        full=args.full,
+        verify_counts=args.verify_counts,
+    )
+
+
+if __name__ == "__main__":
+    main()
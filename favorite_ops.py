@@ -0,0 +1,378 @@
+"""
+批量执行操作文件（JSON / YAML）：在一个进程内共用客户端、限速器和只读请求缓存，
+按依赖顺序执行，没有依赖关系的操作并发执行。
+
+操作文件格式（YAML 需要安装 PyYAML）:
+    {
+      "rate": 2,          # 可选，每秒最多请求次数
+      "workers": 4,       # 可选，并发执行的操作数
+      "operations": [
+        {"id": "sw", "op": "create", "name": "滑动窗口", "slugs": ["two-sum"]},
+        {"op": "add", "slug": "${sw.slug}", "slugs": ["3sum"]},
+        {"op": "delete", "slugs": ["old-favorite"], "after": ["sw"]}
+      ]
+    }
+
+op 与 favorite_cli.py 的子命令相同（list/show/create/add/remove/delete/fork/collect/export），
+其余字段是子命令的参数。执行顺序由以下规则决定:
+- after: 显式依赖的操作 id
+- "${id.字段}": 引用其它操作结果的字段（如新建题单的 slug），自动依赖该操作
+- 作用于同一题单 slug 的操作按文件中的顺序执行
+- list / export 读取全部题单，作为屏障：等待之前的所有操作，之后的操作也等待它们
+依赖的操作失败时，后续操作会被跳过。
+
+用法:
+    python favorite_ops.py ops.json [--workers 4] [--rate 2] [--dry-run]
+"""
+
+import argparse
+import contextlib
+import inspect
+import json
+import os
+import re
+import sys
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from favorite_cli import COMMANDS, print_result, run_command
+from leetcode_favorite import BASE_DIR, LeetCodeClient, QuestionFilter, RateLimiter
+
+DEFAULT_OPS_WORKERS = 4
+DEFAULT_OPS_RATE = 2.0
+
+_REF_RE = re.compile(r"\$\{([^.}]+)\.([^}]+)\}")
+_RESERVED_KEYS = {"id", "op", "after"}
+_BARRIER_OPS = {"list", "export"}
+
+
+class CachedClient:
+    """
+    在多个操作之间共享的客户端：缓存只读请求（题单列表、题单题目），
+    写操作会让相关缓存失效。其余属性直接转发给底层客户端。
+    """
+
+    _LIST_MUTATIONS = {
+        "create_favorite_list", "delete_favorite", "remove_favorite_from_collection",
+        "add_favorite_to_collection", "fork_favorite",
+    }
+    _QUESTION_MUTATIONS = {
+        "add_question_to_favorite", "batch_add_questions_to_favorite", "remove_question_from_favorite", "delete_favorite",
+    }
+
+    def __init__(self, client: LeetCodeClient, ttl: Optional[float] = None) -> None:
+        """
+        :param ttl: 缓存有效期（秒），None 表示一直有效（适合一次性执行的操作文件）
+        """
+        self._client = client
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        # 缓存值为 (获取时间, 结果)
+        self._favorite_lists: Optional[Tuple[float, Any]] = None
+        self._questions: Dict[Tuple[str, int, int], Tuple[float, Any]] = {}
+        self.hits = 0
+
+    def _fresh(self, entry: Optional[Tuple[float, Any]]) -> bool:
+        return entry is not None and (self.ttl is None or time.monotonic() - entry[0] <= self.ttl)
+
+    def get_favorite_lists(self):
+        with self._lock:
+            if self._fresh(self._favorite_lists):
+                self.hits += 1
+                return self._favorite_lists[1]
+        result = self._client.get_favorite_lists()
+        if result[0] or result[1]:
+            with self._lock:
+                self._favorite_lists = (time.monotonic(), result)
+        return result
+
+    def get_favorite_questions(self, favorite_slug: str, skip: int = 0, limit: int = 5000, question_filter: Optional[QuestionFilter] = None):
+        key = (favorite_slug, skip, limit, question_filter or QuestionFilter())
+        with self._lock:
+            entry = self._questions.get(key)
+            if self._fresh(entry):
+                self.hits += 1
+                return entry[1]
+        result = self._client.get_favorite_questions(favorite_slug, skip=skip, limit=limit, question_filter=question_filter)
+        if result is not None:
+            with self._lock:
+                self._questions[key] = (time.monotonic(), result)
+        return result
+
+    def clear(self) -> None:
+        with self._lock:
+            self._favorite_lists = None
+            self._questions = {}
+
+    def _invalidate(self, name: str, favorite_slug: Optional[str]) -> None:
+        with self._lock:
+            if name in self._LIST_MUTATIONS:
+                self._favorite_lists = None
+            if name in self._QUESTION_MUTATIONS:
+                # 加题也会改变题单列表中的 lastQuestionAddedAt
+                self._favorite_lists = None
+                self._questions = {k: v for k, v in self._questions.items() if k[0] != favorite_slug}
+
+    def __getattr__(self, name: str) -> Any:
+        attr = getattr(self._client, name)
+        if not callable(attr) or name not in self._LIST_MUTATIONS | self._QUESTION_MUTATIONS:
+            return attr
+
+        def mutation(*args, **kwargs):
+            try:
+                return attr(*args, **kwargs)
+            finally:
+                self._invalidate(name, args[0] if args else kwargs.get("favorite_slug"))
+
+        return mutation
+
+
+def load_operations_file(path: Path) -> Dict[str, Any]:
+    """读取 JSON / YAML 操作文件，顶层可以是操作列表或包含 operations 的对象"""
+    with open(path, "r", encoding="utf-8") as f:
+        text = f.read()
+    if path.suffix.lower() in (".yaml", ".yml"):
+        try:
+            import yaml
+        except ImportError:
+            raise SystemExit("读取 YAML 操作文件需要安装 PyYAML：pip install pyyaml")
+        data = yaml.safe_load(text)
+    else:
+        data = json.loads(text)
+    if isinstance(data, list):
+        data = {"operations": data}
+    if not isinstance(data, dict) or not isinstance(data.get("operations"), list):
+        raise SystemExit(f"操作文件格式错误: {path}")
+    return data
+
+
+def _references(value: Any) -> Set[str]:
+    if isinstance(value, str):
+        return {match.group(1) for match in _REF_RE.finditer(value)}
+    if isinstance(value, list):
+        return set().union(*(_references(v) for v in value)) if value else set()
+    if isinstance(value, dict):
+        return set().union(*(_references(v) for v in value.values())) if value else set()
+    return set()
+
+
+def _resolve(value: Any, results: Dict[str, Dict[str, Any]]) -> Any:
+    """把 ${id.字段} 替换为对应操作结果中的值；整个字符串都是引用时保留原类型"""
+    if isinstance(value, str):
+        match = _REF_RE.fullmatch(value)
+        if match:
+            return results[match.group(1)].get(match.group(2))
+        return _REF_RE.sub(lambda m: str(results[m.group(1)].get(m.group(2), "")), value)
+    if isinstance(value, list):
+        return [_resolve(v, results) for v in value]
+    if isinstance(value, dict):
+        return {k: _resolve(v, results) for k, v in value.items()}
+    return value
+
+
+def _targets(op: Dict[str, Any]) -> Set[str]:
+    """操作作用的题单 slug（只统计不含引用的字面值；引用本身已构成依赖）"""
+    if op["op"] in ("show", "add", "remove"):
+        values = [op.get("slug")]
+    elif op["op"] in ("delete", "fork", "collect"):
+        values = list(op.get("slugs") or [])
+    else:
+        values = []
+    return {v for v in values if isinstance(v, str) and v and not _REF_RE.search(v)}
+
+
+def plan_operations(
+    operations: List[Dict[str, Any]],
+) -> Tuple[List[Dict[str, Any]], Dict[str, Set[str]], Dict[str, Set[str]]]:
+    """
+    校验操作并计算依赖关系
+    :return: (带 id 的操作列表, {id: 需要先执行的 id 集合}, {id: 必须成功的 id 集合})，
+             后者只包含 after 与引用，同一题单或屏障带来的顺序依赖失败时不影响后续操作；
+             操作有误时抛出 ValueError
+    """
+    ops: List[Dict[str, Any]] = []
+    ids: Set[str] = set()
+    for index, raw in enumerate(operations, 1):
+        if not isinstance(raw, dict) or "op" not in raw:
+            raise ValueError(f"第 {index} 个操作缺少 op")
+        op = dict(raw)
+        op["id"] = str(op.get("id") or f"#{index}")
+        if op["id"] in ids:
+            raise ValueError(f"操作 id 重复: {op['id']}")
+        func = COMMANDS.get(op["op"])
+        if func is None:
+            raise ValueError(f"{op['id']}: 未知操作 {op['op']}")
+        params = {k: v for k, v in op.items() if k not in _RESERVED_KEYS}
+        try:
+            inspect.signature(func).bind(None, **params)
+        except TypeError as e:
+            raise ValueError(f"{op['id']}: 参数错误（{e}）")
+        ids.add(op["id"])
+        ops.append(op)
+
+    deps: Dict[str, Set[str]] = {}
+    hard_deps: Dict[str, Set[str]] = {}
+    last_by_target: Dict[str, str] = {}
+    last_barrier: Optional[str] = None
+    seen: List[str] = []
+    for op in ops:
+        op_id = op["id"]
+        after = op.get("after") or []
+        after = [after] if isinstance(after, str) else after
+        params = {k: v for k, v in op.items() if k not in _RESERVED_KEYS}
+        required = {str(a) for a in after} | _references(params)
+        unknown = required - ids
+        if unknown:
+            raise ValueError(f"{op_id}: 依赖的操作不存在: {', '.join(sorted(unknown))}")
+        if op_id in required:
+            raise ValueError(f"{op_id}: 不能依赖自己")
+        hard_deps[op_id] = set(required)
+
+        if op["op"] in _BARRIER_OPS:
+            required |= set(seen)
+        elif last_barrier:
+            required.add(last_barrier)
+        for target in _targets(op):
+            if target in last_by_target:
+                required.add(last_by_target[target])
+            last_by_target[target] = op_id
+        if op["op"] in _BARRIER_OPS:
+            last_barrier = op_id
+        deps[op_id] = required
+        seen.append(op_id)
+
+    # 检查显式依赖和引用造成的环
+    state: Dict[str, int] = {}
+
+    def visit(node: str) -> None:
+        if state.get(node) == 1:
+            raise ValueError(f"操作之间存在循环依赖: {node}")
+        if state.get(node) == 2:
+            return
+        state[node] = 1
+        for dep in deps[node]:
+            visit(dep)
+        state[node] = 2
+
+    for op_id in deps:
+        visit(op_id)
+    return ops, deps, hard_deps
+
+
+def run_operations(
+    client: LeetCodeClient,
+    operations: List[Dict[str, Any]],
+    max_workers: int = DEFAULT_OPS_WORKERS,
+) -> List[Dict[str, Any]]:
+    """
+    按依赖顺序执行操作，没有依赖关系的操作并发执行
+    :return: 每个操作的 {id, op, status(ok/failed/skipped), result}，顺序与操作文件一致
+    """
+    ops, deps, hard_deps = plan_operations(operations)
+    by_id = {op["id"]: op for op in ops}
+    shared = client if isinstance(client, CachedClient) else CachedClient(client)
+    results: Dict[str, Dict[str, Any]] = {}
+    status: Dict[str, str] = {}
+    remaining = dict(deps)
+
+    def execute(op: Dict[str, Any]) -> Dict[str, Any]:
+        params = _resolve({k: v for k, v in op.items() if k not in _RESERVED_KEYS}, results)
+        return run_command(shared, op["op"], params)
+
+    running: Dict[Future, str] = {}
+    with ThreadPoolExecutor(max_workers=max(1, max_workers)) as executor:
+        while remaining or running:
+            for op_id in [i for i, d in remaining.items() if all(dep in status for dep in d)]:
+                del remaining[op_id]
+                failed = sorted(dep for dep in hard_deps[op_id] if status[dep] != "ok")
+                if failed:
+                    status[op_id] = "skipped"
+                    results[op_id] = {"ok": False, "error": f"依赖的操作未成功: {', '.join(failed)}"}
+                    print(f"[{op_id}] 跳过（依赖的操作未成功: {', '.join(failed)}）")
+                    continue
+                running[executor.submit(execute, by_id[op_id])] = op_id
+
+            if not running:
+                # 剩余操作都在等待已跳过的操作，下一轮会被跳过
+                continue
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                op_id = running.pop(future)
+                result = future.result()
+                results[op_id] = result
+                status[op_id] = "ok" if result.get("ok") else "failed"
+                print(f"[{op_id}] {by_id[op_id]['op']} {'完成' if status[op_id] == 'ok' else '失败'}")
+
+    print(f"共 {len(ops)} 个操作：成功 {sum(1 for s in status.values() if s == 'ok')} 个，"
+          f"失败 {sum(1 for s in status.values() if s == 'failed')} 个，"
+          f"跳过 {sum(1 for s in status.values() if s == 'skipped')} 个，缓存命中 {shared.hits} 次")
+    return [
+        {"id": op["id"], "op": op["op"], "status": status[op["id"]], "result": results[op["id"]]}
+        for op in ops
+    ]
+
+
+def print_plan(operations: List[Dict[str, Any]]) -> None:
+    """按执行批次打印计划（同一批次的操作可以并发执行）"""
+    ops, deps, _ = plan_operations(operations)
+    level: Dict[str, int] = {}
+    for op in ops:  # after 可以指向文件中靠后的操作，反复计算直到稳定
+        level[op["id"]] = 0
+    changed = True
+    while changed:
+        changed = False
+        for op_id, required in deps.items():
+            value = max((level[d] + 1 for d in required), default=0)
+            if value != level[op_id]:
+                level[op_id] = value
+                changed = True
+    for batch in range(max(level.values(), default=-1) + 1):
+        names = [f"{op['id']}({op['op']})" for op in ops if level[op["id"]] == batch]
+        print(f"第 {batch + 1} 批: {' '.join(names)}")
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="批量执行操作文件（JSON / YAML）")
+    parser.add_argument("file", help="操作文件")
+    parser.add_argument("--workers", type=int, help=f"并发执行的操作数（默认 {DEFAULT_OPS_WORKERS}）")
+    parser.add_argument("--rate", type=float, help=f"每秒最多请求次数（默认 {DEFAULT_OPS_RATE}，<=0 不限速）")
+    parser.add_argument("--dry-run", action="store_true", help="只校验并显示执行计划")
+    parser.add_argument("--compact", action="store_true", help="输出单行 JSON")
+    args = parser.parse_args(argv)
+
+    path = Path(args.file)
+    if not path.exists():
+        raise SystemExit(f"文件不存在: {path}")
+    data = load_operations_file(path)
+    try:
+        plan_operations(data["operations"])
+    except ValueError as e:
+        raise SystemExit(f"操作文件有误: {e}")
+
+    if args.dry_run:
+        print_plan(data["operations"])
+        return
+
+    from dotenv import load_dotenv
+
+    load_dotenv(BASE_DIR / ".env")
+    csrf_token = os.getenv("csrftoken")
+    session_id = os.getenv("LEETCODE_SESSION")
+    if not csrf_token or not session_id:
+        raise SystemExit("错误：请在 .env 文件中配置 csrftoken 和 LEETCODE_SESSION")
+
+    rate = args.rate if args.rate is not None else float(data.get("rate", DEFAULT_OPS_RATE))
+    workers = args.workers or int(data.get("workers", DEFAULT_OPS_WORKERS))
+    client = LeetCodeClient(csrf_token, session_id, rate_limiter=RateLimiter(rate))
+    # 进度与客户端提示输出到 stderr，stdout 只保留 JSON 结果
+    with contextlib.redirect_stdout(sys.stderr):
+        summary = run_operations(client, data["operations"], max_workers=workers)
+    print_result({"ok": all(item["status"] == "ok" for item in summary), "operations": summary}, args.compact)
+    raise SystemExit(0 if all(item["status"] == "ok" for item in summary) else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,466 @@
+"""
+在所有题单中离线搜索题目：哪些题单包含某道题、收藏过的所有困难的动态规划题等。
+
+- sync: 把所有题单（创建的 + 收藏的）的题目同步到本地 favorite_search.json。
+  增量同步：题单名称、类型、最后加题时间和题目数量都没变的题单直接沿用上次的内容，
+  只重新获取有变化的题单，并只更新这些题单在索引中的部分
+- query: 在本地索引上查询，不发送任何请求
+
+索引是内存中的倒排表：题号、难度、标签各自建立精确匹配的倒排表，
+标题、translatedTitle 与 titleSlug 建立字符二元组（bigram）倒排表用于子串匹配；
+查询取各条件倒排表的交集，再对候选逐个校验。
+
+查询语法（空格分隔的条件同时满足，含空格的值用引号括起来）:
+    二叉树 / two-sum          标题、中文标题或 slug 包含该文本（纯数字表示题号）
+    tag:动态规划 / tag:dp      标签（中文名、英文名、slug 或 dp、dfs、bfs 等常用缩写）
+    difficulty:hard / 难度:困难
+    id:1 / id:"LCR 001"       题号
+    fav:滑动窗口              只看名称或 slug 包含该文本的题单
+
+用法:
+    python favorite_search.py sync [--full] [--favorite <题单slug> ...]
+    python favorite_search.py query "tag:动态规划 difficulty:hard"
+    python favorite_search.py query two-sum --json
+"""
+
+import argparse
+import heapq
+import json
+import os
+import re
+import shlex
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+from leetcode_favorite import (
+    BASE_DIR,
+    EXPORT_MAX_WORKERS,
+    LeetCodeClient,
+    Question,
+    atomic_write_text,
+    favorite_metadata_unchanged,
+    find_count_changed_favorites,
+    list_all_favorites,
+)
+
+SEARCH_INDEX_PATH = BASE_DIR / "favorite_search.json"
+SEARCH_INDEX_VERSION = 1
+
+DEFAULT_SEARCH_LIMIT = 50
+
+_DIFFICULTY_ALIASES = {
+    "easy": "EASY", "简单": "EASY",
+    "medium": "MEDIUM", "中等": "MEDIUM",
+    "hard": "HARD", "困难": "HARD",
+}
+# 常用标签缩写 -> 标签 slug
+_TAG_ALIASES = {
+    "dp": "dynamic-programming",
+    "dfs": "depth-first-search",
+    "bfs": "breadth-first-search",
+    "bst": "binary-search-tree",
+    "dsu": "union-find", "uf": "union-find",
+    "bit": "binary-indexed-tree",
+}
+_FIELD_ALIASES = {
+    "tag": "tag", "标签": "tag",
+    "difficulty": "difficulty", "diff": "difficulty", "难度": "difficulty",
+    "id": "id", "题号": "id",
+    "fav": "fav", "题单": "fav",
+}
+_WHITESPACE_RE = re.compile(r"\s+")
+_FRONTEND_ID_RE = re.compile(r"\d+")
+
+
+def _normalize(text: str) -> str:
+    return _WHITESPACE_RE.sub(" ", str(text or "").strip().lower())
+
+
+def _bigrams(text: str) -> Set[str]:
+    return {text[i:i + 2] for i in range(len(text) - 1)}
+
+
+def _question_doc(question: Question) -> Dict[str, Any]:
+    """只保留搜索和展示需要的字段"""
+    return {
+        "questionFrontendId": str(question.get("questionFrontendId") or ""),
+        "titleSlug": question.get("titleSlug", ""),
+        "title": question.get("title") or "",
+        "translatedTitle": question.get("translatedTitle") or "",
+        "difficulty": question.get("difficulty") or "",
+        "paidOnly": bool(question.get("paidOnly")),
+        "topicTags": [
+            {"slug": tag.get("slug", ""), "name": tag.get("name", ""), "nameTranslated": tag.get("nameTranslated", "")}
+            for tag in question.get("topicTags") or []
+        ],
+    }
+
+
+def _sort_key(doc: Dict[str, Any]) -> Tuple[int, int, str]:
+    frontend_id = doc.get("questionFrontendId", "")
+    if frontend_id.isdigit():
+        return 0, int(frontend_id), ""
+    match = _FRONTEND_ID_RE.search(frontend_id)
+    return 1, int(match.group()) if match else 0, frontend_id
+
+
+class FavoriteSearchIndex:
+    """
+    题单内容的倒排索引。update_favorite / remove_favorite 只改动相关题单和题目的倒排表，
+    不会重建整个索引。
+    """
+
+    def __init__(
+        self,
+        favorites: Optional[Dict[str, Dict[str, Any]]] = None,
+        questions: Optional[Dict[str, Dict[str, Any]]] = None,
+    ) -> None:
+        """
+        :param favorites: {题单 slug: {name, is_created, lastQuestionAddedAt, count, questions: [titleSlug]}}
+        :param questions: {titleSlug: 题目字段}
+        """
+        self.favorites: Dict[str, Dict[str, Any]] = {}
+        self.questions: Dict[str, Dict[str, Any]] = {}
+        # titleSlug -> {题单 slug: 在题单中的位置（从 1 开始）}
+        self._members: Dict[str, Dict[str, int]] = {}
+        # 倒排表：(字段, 值) -> {titleSlug}，字段为 id / difficulty / tag / gram
+        self._postings: Dict[Tuple[str, str], Set[str]] = {}
+        # 子串校验用的规范化文本与排序键，索引时算好
+        self._haystacks: Dict[str, str] = {}
+        self._sort_keys: Dict[str, Tuple[int, int, str]] = {}
+        for slug, favorite in (favorites or {}).items():
+            docs = [questions[s] for s in favorite.get("questions", []) if questions and s in questions]
+            self._add_favorite(slug, favorite, docs)
+
+    def __len__(self) -> int:
+        return len(self.questions)
+
+    @staticmethod
+    def _haystack(doc: Dict[str, Any]) -> str:
+        return _normalize(f"{doc['titleSlug']} {doc['title']} {doc['translatedTitle']}")
+
+    def _keys(self, doc: Dict[str, Any], haystack: str) -> Set[Tuple[str, str]]:
+        keys = {("gram", gram) for gram in _bigrams(haystack)}
+        if doc["questionFrontendId"]:
+            keys.add(("id", _normalize(doc["questionFrontendId"])))
+        if doc["difficulty"]:
+            keys.add(("difficulty", doc["difficulty"].upper()))
+        for tag in doc["topicTags"]:
+            for value in (tag["slug"], tag["name"], tag["nameTranslated"]):
+                if value:
+                    keys.add(("tag", _normalize(value)))
+        return keys
+
+    def _index_question(self, doc: Dict[str, Any]) -> None:
+        slug = doc["titleSlug"]
+        old = self.questions.get(slug)
+        if old == doc:
+            return
+        if old is not None:
+            self._unindex_question(slug)
+        self.questions[slug] = doc
+        self._haystacks[slug] = haystack = self._haystack(doc)
+        self._sort_keys[slug] = _sort_key(doc)
+        for key in self._keys(doc, haystack):
+            self._postings.setdefault(key, set()).add(slug)
+
+    def _unindex_question(self, slug: str) -> None:
+        doc = self.questions.pop(slug, None)
+        if doc is None:
+            return
+        self._sort_keys.pop(slug, None)
+        for key in self._keys(doc, self._haystacks.pop(slug)):
+            postings = self._postings.get(key)
+            if postings is not None:
+                postings.discard(slug)
+                if not postings:
+                    del self._postings[key]
+
+    def _add_favorite(self, favorite_slug: str, favorite: Dict[str, Any], docs: List[Dict[str, Any]]) -> None:
+        slugs = [doc["titleSlug"] for doc in docs if doc.get("titleSlug")]
+        self.favorites[favorite_slug] = {
+            "name": favorite.get("name", ""),
+            "is_created": bool(favorite.get("is_created")),
+            "lastQuestionAddedAt": favorite.get("lastQuestionAddedAt"),
+            "count": favorite.get("count", len(slugs)),
+            "questions": slugs,
+        }
+        for position, doc in enumerate(docs, 1):
+            if not doc.get("titleSlug"):
+                continue
+            self._index_question(doc)
+            self._members.setdefault(doc["titleSlug"], {})[favorite_slug] = position
+
+    def remove_favorite(self, favorite_slug: str) -> None:
+        """移除题单；不再属于任何题单的题目同时移出索引"""
+        favorite = self.favorites.pop(favorite_slug, None)
+        if favorite is None:
+            return
+        for slug in favorite["questions"]:
+            members = self._members.get(slug)
+            if members is None:
+                continue
+            members.pop(favorite_slug, None)
+            if not members:
+                del self._members[slug]
+                self._unindex_question(slug)
+
+    def update_favorite(self, favorite: Dict[str, Any], questions: List[Question]) -> None:
+        """
+        用题单的最新内容替换索引中的旧内容
+        :param favorite: list_all_favorites 返回的题单信息
+        :param questions: 题单中的全部题目（按题单内顺序）
+        """
+        favorite_slug = favorite["slug"]
+        docs = [_question_doc(question) for question in questions]
+        old = self.favorites.get(favorite_slug)
+        old_questions = old["questions"] if old else []
+        for slug in old_questions:
+            self._members.get(slug, {}).pop(favorite_slug, None)
+        # 先加入新内容再清理旧内容：两边都有的题目只在字段变化时重新索引
+        self._add_favorite(favorite_slug, dict(favorite, count=len(docs)), docs)
+        for slug in set(old_questions) - set(self.favorites[favorite_slug]["questions"]):
+            if not self._members.get(slug):
+                self._members.pop(slug, None)
+                self._unindex_question(slug)
+
+    def _candidates(self, field: str, value: str) -> Set[str]:
+        if field == "difficulty":
+            return self._postings.get(("difficulty", _DIFFICULTY_ALIASES.get(value, value.upper())), set())
+        if field == "tag":
+            return self._postings.get(("tag", _TAG_ALIASES.get(value, value)), set())
+        if field == "id":
+            return self._postings.get(("id", value), set())
+        # 文本：取各二元组倒排表的交集，再校验子串（二元组都命中不代表连续出现）
+        grams = _bigrams(value)
+        if not grams:
+            return {slug for slug, haystack in self._haystacks.items() if value in haystack}
+        postings = sorted((self._postings.get(("gram", gram), set()) for gram in grams), key=len)
+        matched = set(postings[0])
+        for other in postings[1:]:
+            matched &= other
+            if not matched:
+                break
+        haystacks = self._haystacks
+        return {slug for slug in matched if value in haystacks[slug]}
+
+    def search(self, query: str, limit: int = DEFAULT_SEARCH_LIMIT) -> List[Dict[str, Any]]:
+        """
+        :return: [{题目字段..., favorites: [{slug, name, is_created, position}]}]，按题号排序
+        :raises ValueError: 查询语法有误
+        """
+        try:
+            terms = shlex.split(query)
+        except ValueError as e:
+            raise ValueError(f"查询语法有误: {e}") from e
+
+        favorite_filters: List[str] = []
+        matched: Optional[Set[str]] = None
+        for term in terms:
+            field, sep, value = term.partition(":")
+            field = _FIELD_ALIASES.get(field.lower()) if sep else None
+            if field is None:
+                # 纯数字按题号匹配，其余按文本匹配
+                field, value = ("id", term) if term.isdigit() else ("text", term)
+            value = _normalize(value)
+            if not value:
+                continue
+            if field == "fav":
+                favorite_filters.append(value)
+                continue
+            candidates = self._candidates(field, value)
+            matched = set(candidates) if matched is None else matched & candidates
+            if not matched:
+                return []
+
+        favorite_slugs: Optional[Set[str]] = None
+        if favorite_filters:
+            favorite_slugs = {
+                slug for slug, favorite in self.favorites.items()
+                if all(f in _normalize(favorite["name"]) or f in slug.lower() for f in favorite_filters)
+            }
+            scope: Set[str] = set()
+            for slug in favorite_slugs:
+                scope.update(self.favorites[slug]["questions"])
+            matched = scope if matched is None else matched & scope
+        if matched is None:
+            return []
+
+        results = []
+        # 只排序需要返回的部分
+        for slug in heapq.nsmallest(max(0, limit), matched, key=self._sort_keys.__getitem__):
+            members = self._members.get(slug, {})
+            results.append(dict(
+                self.questions[slug],
+                favorites=[
+                    {
+                        "slug": favorite_slug,
+                        "name": self.favorites[favorite_slug]["name"],
+                        "is_created": self.favorites[favorite_slug]["is_created"],
+                        "position": position,
+                    }
+                    for favorite_slug, position in members.items()
+                    if favorite_slugs is None or favorite_slug in favorite_slugs
+                ],
+            ))
+        return results
+
+    def to_json(self) -> Dict[str, Any]:
+        return {
+            "version": SEARCH_INDEX_VERSION,
+            "updated_at": datetime.now().isoformat(timespec="seconds"),
+            "favorites": self.favorites,
+            "questions": self.questions,
+        }
+
+
+def load_search_index(path: Path = SEARCH_INDEX_PATH) -> FavoriteSearchIndex:
+    """读取本地索引；文件不存在或版本不同时返回空索引"""
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return FavoriteSearchIndex()
+    if not isinstance(data, dict) or data.get("version") != SEARCH_INDEX_VERSION:
+        return FavoriteSearchIndex()
+    return FavoriteSearchIndex(data.get("favorites") or {}, data.get("questions") or {})
+
+
+def save_search_index(index: FavoriteSearchIndex, path: Path = SEARCH_INDEX_PATH) -> None:
+    atomic_write_text(path, json.dumps(index.to_json(), ensure_ascii=False, separators=(",", ":")))
+
+
+def _fetch_questions(client: LeetCodeClient, favorite_slug: str) -> List[Question]:
+    questions: List[Question] = []
+    for page in client.iter_favorite_question_pages(favorite_slug):
+        questions.extend(page)
+    return questions
+
+
+def sync_search_index(
+    client: LeetCodeClient,
+    index: FavoriteSearchIndex,
+    full: bool = False,
+    favorite_slugs: Optional[Iterable[str]] = None,
+    max_workers: int = EXPORT_MAX_WORKERS,
+) -> Dict[str, int]:
+    """
+    把题单的最新内容同步到索引。
+    默认只重新获取变化的题单：名称、类型或最后加题时间不同的题单直接重新获取；
+    其余题单只请求一道题核对题目数量（移除题目不会改变最后加题时间），数量不同时再重新获取。
+    :param full: 重新获取所有题单
+    :param favorite_slugs: 只重新获取这些题单（不核对其它题单）
+    :return: {favorites, fetched, failed, removed}
+    """
+    favorites = [favorite for favorite in list_all_favorites(client) if favorite.get("slug")]
+    current = {favorite["slug"]: favorite for favorite in favorites}
+    removed = [slug for slug in list(index.favorites) if slug not in current]
+    for slug in removed:
+        index.remove_favorite(slug)
+
+    if favorite_slugs is not None:
+        wanted = set(favorite_slugs)
+        changed = [favorite for favorite in favorites if favorite["slug"] in wanted]
+        unknown = wanted - set(current)
+        if unknown:
+            print(f"未找到题单: {', '.join(sorted(unknown))}")
+        to_check: List[Dict[str, Any]] = []
+    elif full:
+        changed, to_check = favorites, []
+    else:
+        changed = [f for f in favorites if not favorite_metadata_unchanged(f, index.favorites.get(f["slug"]))]
+        to_check = [f for f in favorites if favorite_metadata_unchanged(f, index.favorites.get(f["slug"]))]
+
+    if to_check:
+        expected = {f["slug"]: index.favorites[f["slug"]].get("count") for f in to_check}
+        changed.extend(find_count_changed_favorites(client, to_check, expected, max_workers=max_workers))
+
+    failed = 0
+    with ThreadPoolExecutor(max_workers=max(1, max_workers)) as executor:
+        futures = {executor.submit(_fetch_questions, client, f["slug"]): f for f in changed}
+        for future in as_completed(futures):
+            favorite = futures[future]
+            try:
+                questions = future.result()
+            except Exception as e:
+                # 获取失败的题单保留索引中的旧内容，下次同步时重新获取
+                print(f"同步题单失败: {favorite.get('name', '')} ({favorite['slug']}): {e}")
+                failed += 1
+                continue
+            index.update_favorite(favorite, questions)
+
+    return {"favorites": len(favorites), "fetched": len(changed) - failed, "failed": failed, "removed": len(removed)}
+
+
+def print_results(results: List[Dict[str, Any]]) -> None:
+    difficulty_labels = {"EASY": "简单", "MEDIUM": "中等", "HARD": "困难"}
+    for doc in results:
+        title = doc["translatedTitle"] or doc["title"]
+        difficulty = difficulty_labels.get(doc["difficulty"], doc["difficulty"])
+        print(f"{doc['questionFrontendId']}. {title} [{difficulty}] ({doc['titleSlug']})")
+        for favorite in doc["favorites"]:
+            kind = "📝" if favorite["is_created"] else "⭐"
+            print(f"    {kind} {favorite['name']} #{favorite['position']} ({favorite['slug']})")
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="在所有题单中离线搜索题目")
+    parser.add_argument("--index", default=str(SEARCH_INDEX_PATH), help="本地索引文件")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    sync_parser = subparsers.add_parser("sync", help="同步题单内容到本地索引（增量）")
+    sync_parser.add_argument("--full", action="store_true", help="重新获取所有题单")
+    sync_parser.add_argument("--favorite", nargs="+", metavar="SLUG", help="只重新获取这些题单")
+    sync_parser.add_argument("--workers", type=int, default=EXPORT_MAX_WORKERS, help="并发获取的题单数")
+
+    query_parser = subparsers.add_parser("query", help="查询本地索引")
+    query_parser.add_argument("query", nargs="+", help="查询条件，如 tag:动态规划 difficulty:hard")
+    query_parser.add_argument("--limit", type=int, default=DEFAULT_SEARCH_LIMIT, help="最多显示的题目数")
+    query_parser.add_argument("--json", action="store_true", help="以 JSON 输出")
+    args = parser.parse_args(argv)
+    index_path = Path(args.index)
+
+    t0 = time.perf_counter()
+    index = load_search_index(index_path)
+    load_seconds = time.perf_counter() - t0
+
+    if args.command == "query":
+        if not index.favorites:
+            raise SystemExit("本地索引为空，请先执行: python favorite_search.py sync")
+        t0 = time.perf_counter()
+        try:
+            results = index.search(" ".join(args.query), args.limit)
+        except ValueError as e:
+            raise SystemExit(str(e))
+        query_ms = (time.perf_counter() - t0) * 1000
+        if args.json:
+            print(json.dumps(results, ensure_ascii=False, indent=2))
+            return
+        print_results(results)
+        print(f"\n共 {len(results)} 道题（查询 {query_ms:.2f} ms，加载索引 {load_seconds * 1000:.0f} ms）")
+        return
+
+    from dotenv import load_dotenv
+
+    load_dotenv(BASE_DIR / ".env")
+    csrf_token = os.getenv("csrftoken")
+    session_id = os.getenv("LEETCODE_SESSION")
+    if not csrf_token or not session_id:
+        raise SystemExit("错误：请在 .env 文件中配置 csrftoken 和 LEETCODE_SESSION")
+
+    client = LeetCodeClient(csrf_token, session_id)
+    t0 = time.perf_counter()
+    stats = sync_search_index(client, index, full=args.full, favorite_slugs=args.favorite, max_workers=args.workers)
+    save_search_index(index, index_path)
+    print(
+        f"同步完成 -> {index_path}\n"
+        f"{stats['favorites']} 个题单，重新获取 {stats['fetched']} 个，失败 {stats['failed']} 个，移除 {stats['removed']} 个；"
+        f"索引中共 {len(index)} 道题（{time.perf_counter() - t0:.2f}s）"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,573 @@
+"""
+导入流程的性能基准。
+
+用法:
+    python benchmark.py extract [--repeat 3]   # 单遍提取 vs 原流程（discuss_html 语料）
+    python benchmark.py backend [--repeat 3]   # parse_html 的 bs4 后端 vs 流式后端
+    python benchmark.py scale [--sizes 50 100 200 400] [--depths 2 8 16 32 64] [--widths 3 6 12 24]
+        # 精简提取在不同规模、嵌套深度与宽度的合成页面上的耗时
+    python benchmark.py names [--scale 10]     # FavoriteNameTool 在放大 N 倍的 discuss_json 上的耗时
+    python benchmark.py match [--scale 10]     # 名称模糊匹配：三元组索引 vs difflib
+    python benchmark.py importtime [--budget 80]  # 各入口模块的导入耗时（-X importtime）与预算检查
+    python benchmark.py search [--favorites 300]  # 题单搜索索引：构建、增量更新与查询耗时
+"""
+
+import argparse
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Callable, Dict, List, Tuple
+
+BASE_DIR = Path(__file__).resolve().parent
+ROOT_DIR = BASE_DIR.parent
+for _path in (str(ROOT_DIR), str(BASE_DIR)):
+    if _path not in sys.path:
+        sys.path.insert(0, _path)
+
+import parse_html as html_parser  # noqa: E402
+
+LOCAL_HTML_DIR = BASE_DIR / "discuss_html"
+
+
+def _best_of(fn: Callable[[], object], repeat: int) -> Tuple[float, object]:
+    """执行 repeat 次，返回最短耗时（秒）与最后一次的结果。"""
+    best = float("inf")
+    result = None
+    for _ in range(max(1, repeat)):
+        t0 = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - t0)
+    return best, result
+
+
+def _legacy_extract(html_content: str) -> str:
+    """
+    改写前 extract_heading_and_list_elements 的冻结副本（仅作为基准参照）：
+    对每个标题/列表递归克隆，每个 li 都 find_all("a")，嵌套列表会被再次克隆。
+    不依赖 parse_html 与 import_from_0x3f 中的函数，它们后续改动不会影响基线。
+    """
+    import re
+
+    from bs4 import BeautifulSoup
+
+    soup = BeautifulSoup(html_content, "html.parser")
+    new_soup = BeautifulSoup("<html><head><meta charset='utf-8'></head><body></body></html>", "html.parser")
+    body = new_soup.find("body")
+    content_area = soup.find("div", class_=re.compile(r"break-words", re.I))
+    if not content_area:
+        content_area = soup.find("div", class_=re.compile(r"content|article|post|topic", re.I))
+    if not content_area:
+        content_area = soup
+    allowed_tags = ["h1", "h2", "h3", "h4", "ul", "ol", "li", "a", "p"]
+
+    def clone_element(element, parent):
+        if element.name not in allowed_tags:
+            return
+        if element.name == "li" and not any(
+            a.get("href", "") and "problems" in a.get("href", "") for a in element.find_all("a")
+        ):
+            return
+        new_tag = new_soup.new_tag(element.name)
+        if element.name == "a" and element.get("href"):
+            new_tag["href"] = element.get("href")
+        for child in element.children:
+            if hasattr(child, "name") and child.name:
+                if element.name == "li" and child.name != "a":
+                    continue
+                clone_element(child, new_tag)
+            elif child.string and element.name != "li":
+                new_tag.append(child.string.strip())
+        if new_tag.get_text(strip=True):
+            parent.append(new_tag)
+
+    for tag in content_area.find_all(["h1", "h2", "h3", "h4", "ul", "ol"]):
+        clone_element(tag, body)
+    return str(new_soup.prettify())
+
+
+def bench_extract(repeat: int) -> bool:
+    """
+    对 discuss_html 下的每个页面比较：
+    - 两段流程：冻结的旧版提取（_legacy_extract）生成精简 HTML，再由 parse_html_content 重新解析
+    - 单遍提取：extract_page 得到分组，并渲染精简 HTML
+    同时校验两者的 JSON 与精简 HTML 完全一致。
+    """
+    paths = sorted(LOCAL_HTML_DIR.glob("*.html"))
+    if not paths:
+        print(f"未找到 HTML 文件: {LOCAL_HTML_DIR}")
+        return False
+
+    print(f"{'文件':<28}{'大小(KB)':>10}{'两段(ms)':>12}{'单遍(ms)':>12}{'加速':>8}  一致")
+    all_same = True
+    total_old = total_new = 0.0
+    for path in paths:
+        html = path.read_text(encoding="utf-8")
+
+        def old_path():
+            simplified = _legacy_extract(html)
+            return simplified, html_parser.parse_html_content(simplified)
+
+        def new_path():
+            page = html_parser.extract_page(html)
+            return page.simplified_html(), page.groups
+
+        t_old, (old_html, old_groups) = _best_of(old_path, repeat)
+        t_new, (new_html, new_groups) = _best_of(new_path, repeat)
+        same = old_html == new_html and old_groups == new_groups
+        all_same &= same
+        total_old += t_old
+        total_new += t_new
+        print(
+            f"{path.name:<28}{len(html.encode('utf-8')) / 1024:>10.1f}"
+            f"{t_old * 1000:>12.1f}{t_new * 1000:>12.1f}{t_old / t_new:>7.2f}x  {'✓' if same else '✗'}"
+        )
+
+    print(f"{'合计':<28}{'':>10}{total_old * 1000:>12.1f}{total_new * 1000:>12.1f}{total_old / total_new:>7.2f}x")
+    if not all_same:
+        print("存在输出不一致的页面！")
+    return all_same
+
+
+def _peak_memory(fn: Callable[[], object]) -> int:
+    """返回执行 fn 期间的峰值内存分配（字节）。"""
+    tracemalloc.start()
+    try:
+        fn()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def bench_backend(repeat: int) -> bool:
+    """
+    对 discuss_html 下的每个页面比较 parse_html_file 的 bs4 后端与 stream 后端：
+    耗时、峰值内存，并校验两者输出的 JSON 完全一致。
+    """
+    paths = sorted(LOCAL_HTML_DIR.glob("*.html"))
+    if not paths:
+        print(f"未找到 HTML 文件: {LOCAL_HTML_DIR}")
+        return False
+
+    print(
+        f"{'文件':<28}{'bs4(ms)':>10}{'stream(ms)':>12}{'加速':>8}"
+        f"{'bs4峰值(KB)':>14}{'stream峰值(KB)':>16}  一致"
+    )
+    all_same = True
+    total_bs4 = total_stream = 0.0
+    for path in paths:
+        t_bs4, bs4_groups = _best_of(lambda: html_parser.parse_html_file(str(path)), repeat)
+        t_stream, stream_groups = _best_of(
+            lambda: html_parser.parse_html_file(str(path), backend="stream"), repeat
+        )
+        mem_bs4 = _peak_memory(lambda: html_parser.parse_html_file(str(path)))
+        mem_stream = _peak_memory(lambda: html_parser.parse_html_file(str(path), backend="stream"))
+        same = json.dumps(bs4_groups, ensure_ascii=False) == json.dumps(stream_groups, ensure_ascii=False)
+        all_same &= same
+        total_bs4 += t_bs4
+        total_stream += t_stream
+        print(
+            f"{path.name:<28}{t_bs4 * 1000:>10.1f}{t_stream * 1000:>12.1f}{t_bs4 / t_stream:>7.2f}x"
+            f"{mem_bs4 / 1024:>14.0f}{mem_stream / 1024:>16.0f}  {'✓' if same else '✗'}"
+        )
+
+    print(f"{'合计':<28}{total_bs4 * 1000:>10.1f}{total_stream * 1000:>12.1f}{total_bs4 / total_stream:>7.2f}x")
+    if not all_same:
+        print("存在输出不一致的页面！")
+    return all_same
+
+
+def _synthetic_page(sections: int, depth: int = 4, width: int = 3) -> str:
+    """
+    生成合成讨论页：sections 个小节，每节一条 depth 层的列表链（ul 直接嵌套下一层 ul），
+    每层 width 道题，第一道题的 li 下还嵌套一个小列表，模拟动态规划、数据结构等长页面。
+    页面大小与 depth * width 成正比；改写前的实现会把第 k 层列表重复克隆 k 次。
+    """
+
+    def items(prefix: str) -> str:
+        return "".join(
+            f'<li><span>{i}.</span> <a href="https://leetcode.cn/problems/{prefix}-{i}/">{prefix}-{i}</a> 1234</li>'
+            for i in range(width)
+        )
+
+    def nested_list(level: int, prefix: str) -> str:
+        first, rest = items(prefix).split("</li>", 1)
+        parts = ["<ul>", first, f"<ul>{items(prefix + '-s')}</ul></li>", rest]
+        if level < depth:
+            parts.append(nested_list(level + 1, f"{prefix}-u"))
+        parts.append('<li>说明文字 <a href="#note">注</a></li></ul>')
+        return "".join(parts)
+
+    parts = ['<html><body><div class="break-words">']
+    for n in range(sections):
+        parts.append(f"<h2>{n}、章节</h2><p>介绍</p><h3>§{n}.1 小节</h3>")
+        parts.append(nested_list(1, f"p{n}"))
+    parts.append("</div></body></html>")
+    return "".join(parts)
+
+
+def _sections_for(target_kb: float, depth: int, width: int) -> int:
+    """使合成页面大小接近 target_kb 的小节数。"""
+    section_kb = len(_synthetic_page(1, depth, width).encode("utf-8")) / 1024
+    return max(1, round(target_kb / section_kb))
+
+
+def bench_scale(
+    sizes: List[int],
+    depths: List[int],
+    widths: List[int],
+    repeat: int,
+    target_kb: float = 200.0,
+) -> bool:
+    """
+    在合成页面上比较改写前后的精简提取，分三组：
+    - 小节数递增（深度 4、宽度 3）：页面变大
+    - 嵌套深度递增、宽度递增：页面大小保持在 target_kb 左右，只改变形状
+    线性实现每 KB 耗时应大致不变；改写前的实现随嵌套深度增长，宽度只改变每层大小，不影响每 KB 耗时。
+    同时校验两者得到的题单 JSON 一致。
+    """
+    shapes = [(sections, 4, 3) for sections in sizes]
+    shapes += [(_sections_for(target_kb, depth, 3), depth, 3) for depth in depths]
+    shapes += [(_sections_for(target_kb, 4, width), 4, width) for width in widths]
+
+    print(
+        f"{'小节数':>8}{'深度':>6}{'宽度':>6}{'大小(KB)':>10}{'改写前(ms)':>12}{'线性(ms)':>12}"
+        f"{'改写前(us/KB)':>15}{'线性(us/KB)':>13}  一致"
+    )
+    all_same = True
+    for i, (sections, depth, width) in enumerate(shapes):
+        if i in (len(sizes), len(sizes) + len(depths)):
+            print()
+        html = _synthetic_page(sections, depth, width)
+        size_kb = len(html.encode("utf-8")) / 1024
+        t_old, old_html = _best_of(lambda: _legacy_extract(html), repeat)
+        t_new, new_nodes = _best_of(lambda: html_parser.simplify_raw_html(html), repeat)
+        same = html_parser.parse_html_content(old_html) == html_parser.parse_simplified_nodes(new_nodes)
+        all_same &= same
+        print(
+            f"{sections:>8}{depth:>6}{width:>6}{size_kb:>10.1f}{t_old * 1000:>12.1f}{t_new * 1000:>12.1f}"
+            f"{t_old * 1e6 / size_kb:>15.1f}{t_new * 1e6 / size_kb:>13.1f}  {'✓' if same else '✗'}"
+        )
+    if not all_same:
+        print("存在输出不一致的页面！")
+    return all_same
+
+
+def bench_names(scale: int, repeat: int) -> bool:
+    """
+    把 discuss_json 复制 scale 份（每份名称追加不同后缀）后比较 FavoriteNameTool.build_mapping：
+    不使用缓存、冷缓存、文件缓存命中（新进程）、全部命中（同一进程）、只修改一个文件。
+    同时校验各场景得到的映射一致。
+    """
+    from favorite_name_tool import FavoriteNameTool
+
+    sources = sorted(p for p in (BASE_DIR / "discuss_json").glob("*.json") if not p.name.startswith("."))
+    if not sources:
+        print("未找到 discuss_json 数据")
+        return False
+
+    tmp_dir = Path(tempfile.mkdtemp(prefix="favorite_name_bench_"))
+    try:
+        json_dir = tmp_dir / "discuss_json"
+        json_dir.mkdir()
+        for k in range(max(1, scale)):
+            for path in sources:
+                groups = json.loads(path.read_text(encoding="utf-8"))
+                for group in groups:
+                    group["name"] = f"{group['name']} / 副本{k}"
+                (json_dir / f"{path.stem}_{k}.json").write_text(json.dumps(groups, ensure_ascii=False), encoding="utf-8")
+        files = sorted(json_dir.glob("*.json"))
+        size_mb = sum(p.stat().st_size for p in files) / 1024 / 1024
+
+        sort_key_cache = FavoriteNameTool.name_sort_key.__func__
+        cache_path = json_dir / ".favorite_name_cache.json"
+
+        def run(use_cache: bool = True, clear_file_cache: bool = False, clear_key_cache: bool = False):
+            if clear_file_cache and cache_path.exists():
+                cache_path.unlink()
+            if clear_key_cache:
+                sort_key_cache.cache_clear()
+            tool = FavoriteNameTool(tmp_dir, use_cache=use_cache)
+            return tool.build_mapping(), tool.reloaded_files
+
+        scenarios = [
+            ("不使用缓存", lambda: run(use_cache=False, clear_key_cache=True)),
+            ("冷缓存", lambda: run(clear_file_cache=True, clear_key_cache=True)),
+            ("文件缓存命中（新进程）", lambda: run(clear_key_cache=True)),
+            ("全部命中（同一进程）", lambda: run()),
+        ]
+
+        print(f"{len(files)} 个文件，{size_mb:.1f} MB")
+        print(f"{'场景':<24}{'耗时(ms)':>10}{'重新读取':>10}")
+        baseline = None
+        all_same = True
+        for label, fn in scenarios:
+            elapsed, (mapping, reloaded) = _best_of(fn, repeat)
+            baseline = baseline if baseline is not None else mapping
+            all_same &= mapping == baseline
+            print(f"{label:<24}{elapsed * 1000:>10.1f}{reloaded:>10}")
+
+        # 只修改一个文件：每次都重写，使其 mtime 与内容都变化
+        changed = files[0]
+        original = changed.read_text(encoding="utf-8")
+
+        def run_changed():
+            groups = json.loads(original)
+            groups[0]["name"] += f" {time.perf_counter_ns()}"
+            changed.write_text(json.dumps(groups, ensure_ascii=False), encoding="utf-8")
+            return run()
+
+        elapsed, (mapping, reloaded) = _best_of(run_changed, repeat)
+        print(f"{'修改 1 个文件':<24}{elapsed * 1000:>10.1f}{reloaded:>10}")
+        changed.write_text(original, encoding="utf-8")
+        os.utime(changed)
+        all_same &= run()[0] == baseline
+    finally:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+
+    if not all_same:
+        print("各场景的映射不一致！")
+    return all_same
+
+
+def bench_match(scale: int, queries: int, repeat: int) -> bool:
+    """
+    在放大 scale 倍的 favorite_name_ordered.json 上比较三元组索引与逐个 difflib 比较的推荐耗时。
+    查询为随机修改小节编号后的 old 名称；同时校验原名查询时首位推荐是它自己。
+    """
+    import difflib
+    import random
+    import re
+
+    from name_matcher import FAVORITE_NAME_ORDERED_PATH, NameMatcher, _mapping_pairs, _read_mapping_file
+
+    pairs = [(old, new) for old, new in _mapping_pairs(_read_mapping_file(FAVORITE_NAME_ORDERED_PATH)) if new]
+    if not pairs:
+        print("未找到名称映射数据")
+        return False
+    mapping = {f"{old} / 副本{k}": new for k in range(max(1, scale)) for old, new in pairs}
+    names = list(mapping)
+
+    rng = random.Random(0)
+    samples = rng.sample(names, min(queries, len(names)))
+    perturbed = [re.sub(r"§(\d+)\.(\d+)", lambda m: f"§{m.group(1)}.{int(m.group(2)) + 1}", name) for name in samples]
+
+    t0 = time.perf_counter()
+    matcher = NameMatcher(mapping)
+    build_ms = (time.perf_counter() - t0) * 1000
+
+    def run_index():
+        return [matcher.suggest(q, limit=5) for q in perturbed]
+
+    def run_difflib():
+        return [difflib.get_close_matches(q, names, n=5, cutoff=0.0) for q in perturbed[:max(1, len(perturbed) // 10)]]
+
+    index_elapsed, _ = _best_of(run_index, repeat)
+    difflib_elapsed, _ = _best_of(run_difflib, 1)
+    difflib_queries = max(1, len(perturbed) // 10)
+
+    exact_ok = all(matcher.suggest(name, limit=1)[0][0] == name for name in samples)
+
+    print(f"{len(names)} 个名称，{len(perturbed)} 个查询，索引构建 {build_ms:.1f} ms")
+    print(f"{'方法':<16}{'每次查询(ms)':>14}")
+    print(f"{'三元组索引':<16}{index_elapsed * 1000 / len(perturbed):>14.3f}")
+    print(f"{'difflib 逐个比较':<16}{difflib_elapsed * 1000 / difflib_queries:>14.3f}")
+    if not exact_ok:
+        print("原名查询的首位推荐不是它自己！")
+    return exact_ok
+
+
+# 入口模块 -> (导入时所在目录, 不应在导入时加载的模块)
+IMPORT_TARGETS = {
+    "leetcode_favorite": (ROOT_DIR, ["requests", "prettytable", "dotenv", "bs4"]),
+    "favorite_cli": (ROOT_DIR, ["requests", "prettytable", "dotenv", "bs4"]),
+    "favorite_daemon": (ROOT_DIR, ["requests", "prettytable", "bs4", "leetcode_favorite"]),
+    "import_from_0x3f": (BASE_DIR, ["requests", "prettytable", "dotenv", "bs4", "leetcode_favorite"]),
+}
+
+
+def _import_profile(module: str, cwd: Path) -> Tuple[int, Dict[str, int]]:
+    """
+    在新的解释器中用 -X importtime 导入模块。
+    :return: (该模块的累计导入耗时 us, {模块名: 自身导入耗时 us})
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=str(cwd),
+        capture_output=True,
+        text=True,
+    )
+    if result.returncode != 0:
+        raise RuntimeError(result.stderr.strip().splitlines()[-1] if result.stderr.strip() else f"导入 {module} 失败")
+
+    cumulative = 0
+    self_times: Dict[str, int] = {}
+    for line in result.stderr.splitlines():
+        # import time: self [us] | cumulative | imported package
+        if not line.startswith("import time:") or "imported package" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|", 2)
+        name = name.strip()
+        self_times[name] = int(self_us)
+        if name == module:
+            cumulative = int(cumulative_us)
+    return cumulative, self_times
+
+
+def bench_importtime(budget_ms: float, repeat: int, top: int) -> bool:
+    """
+    测量各入口模块的导入耗时（多次取最短），并检查：
+    1. 累计耗时不超过 budget_ms；
+    2. 导入时没有加载 IMPORT_TARGETS 中列出的重量级依赖（它们应在用到时才导入）。
+    """
+    ok = True
+    print(f"{'模块':<20}{'导入耗时(ms)':>14}{'预算(ms)':>10}")
+    reports = []
+    for module, (cwd, forbidden) in IMPORT_TARGETS.items():
+        best = None
+        self_times: Dict[str, int] = {}
+        try:
+            for _ in range(max(1, repeat)):
+                cumulative, times = _import_profile(module, cwd)
+                if best is None or cumulative < best:
+                    best, self_times = cumulative, times
+        except RuntimeError as e:
+            print(f"{module:<20}导入失败: {e}")
+            ok = False
+            continue
+
+        loaded = [name for name in forbidden if name in self_times]
+        over = best / 1000 > budget_ms
+        ok &= not over and not loaded
+        print(f"{module:<20}{best / 1000:>14.1f}{budget_ms:>10.0f}{'  超出预算！' if over else ''}")
+        reports.append((module, loaded, self_times))
+
+    for module, loaded, self_times in reports:
+        heaviest = sorted(self_times.items(), key=lambda item: -item[1])[:top]
+        print(f"\n{module} 自身耗时最高的 {len(heaviest)} 个模块:")
+        for name, self_us in heaviest:
+            print(f"  {self_us / 1000:>8.1f} ms  {name}")
+        if loaded:
+            print(f"  导入时加载了应延迟导入的模块: {', '.join(loaded)}")
+    return ok
+
+
+def bench_search(favorites: int, per_favorite: int, repeat: int) -> bool:
+    """
+    在合成的题单内容上测量 FavoriteSearchIndex 的构建、单个题单增量更新与查询耗时，
+    并校验多次增量更新后的索引与全量重建的结果一致。
+    """
+    import random
+
+    from favorite_search import FavoriteSearchIndex
+
+    rng = random.Random(0)
+    tags = [("dynamic-programming", "动态规划"), ("array", "数组"), ("tree", "树"), ("graph", "图"), ("math", "数学")]
+    pool = []
+    for i in range(1, max(per_favorite, favorites * per_favorite // 10) + 1):
+        pool.append({
+            "questionFrontendId": str(i),
+            "titleSlug": f"problem-{i}",
+            "title": f"Problem {i}",
+            "translatedTitle": f"题目{i}",
+            "difficulty": rng.choice(["EASY", "MEDIUM", "HARD"]),
+            "topicTags": [{"slug": slug, "name": slug, "nameTranslated": name} for slug, name in rng.sample(tags, 2)],
+        })
+    contents = {
+        f"favorite-{k}": ({"slug": f"favorite-{k}", "name": f"题单{k}", "is_created": k % 2 == 0}, rng.sample(pool, per_favorite))
+        for k in range(favorites)
+    }
+
+    def build():
+        index = FavoriteSearchIndex()
+        for favorite, questions in contents.values():
+            index.update_favorite(favorite, questions)
+        return index
+
+    build_elapsed, index = _best_of(build, repeat)
+
+    # 增量更新：删掉一部分题并加入新题
+    slugs = rng.sample(list(contents), min(50, len(contents)))
+    t0 = time.perf_counter()
+    for slug in slugs:
+        favorite, questions = contents[slug]
+        contents[slug] = (favorite, questions[:rng.randrange(len(questions) + 1)] + rng.sample(pool, 10))
+        index.update_favorite(*contents[slug])
+    update_ms = (time.perf_counter() - t0) * 1000 / len(slugs)
+    consistent = build()._postings == index._postings
+
+    queries = ["tag:动态规划 difficulty:hard", "题目12", "fav:题单1 tag:tree", "42", "problem-7"]
+    print(f"{favorites} 个题单 × {per_favorite} 题，{len(index)} 道不同的题")
+    print(f"全量构建 {build_elapsed * 1000:.1f} ms，单个题单增量更新 {update_ms:.2f} ms")
+    print(f"{'查询':<32}{'命中':>6}{'耗时(ms)':>10}")
+    for query in queries:
+        elapsed, results = _best_of(lambda: index.search(query), repeat)
+        print(f"{query:<32}{len(results):>6}{elapsed * 1000:>10.2f}")
+    if not consistent:
+        print("增量更新后的索引与全量重建不一致！")
+    return consistent
+
+
+def main(argv: List[str] = None) -> None:
+    parser = argparse.ArgumentParser(description="导入流程的性能基准")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    extract_parser = subparsers.add_parser("extract", help="单遍提取 vs 原流程（discuss_html 语料）")
+    extract_parser.add_argument("--repeat", type=int, default=3, help="每个页面重复次数，取最短耗时")
+
+    backend_parser = subparsers.add_parser("backend", help="parse_html 的 bs4 后端 vs 流式后端")
+    backend_parser.add_argument("--repeat", type=int, default=3, help="每个页面重复次数，取最短耗时")
+
+    scale_parser = subparsers.add_parser("scale", help="精简提取在不同规模合成页面上的耗时")
+    scale_parser.add_argument("--sizes", type=int, nargs="+", default=[50, 100, 200, 400], help="合成页面的小节数")
+    scale_parser.add_argument("--depths", type=int, nargs="+", default=[2, 8, 16, 32, 64], help="列表嵌套深度")
+    scale_parser.add_argument("--widths", type=int, nargs="+", default=[3, 6, 12, 24], help="每层列表的题目数")
+    scale_parser.add_argument("--target-kb", type=float, default=200.0, help="深度/宽度扫描时的页面大小（KB）")
+    scale_parser.add_argument("--repeat", type=int, default=3, help="每个页面重复次数，取最短耗时")
+
+    names_parser = subparsers.add_parser("names", help="FavoriteNameTool 在放大 N 倍的 discuss_json 上的耗时")
+    names_parser.add_argument("--scale", type=int, default=10, help="语料放大倍数")
+    names_parser.add_argument("--repeat", type=int, default=3, help="每个场景重复次数，取最短耗时")
+
+    match_parser = subparsers.add_parser("match", help="名称模糊匹配：三元组索引 vs difflib")
+    match_parser.add_argument("--scale", type=int, default=10, help="名称映射放大倍数")
+    match_parser.add_argument("--queries", type=int, default=200, help="查询数量")
+    match_parser.add_argument("--repeat", type=int, default=3, help="重复次数，取最短耗时")
+
+    importtime_parser = subparsers.add_parser("importtime", help="各入口模块的导入耗时与预算检查")
+    importtime_parser.add_argument("--budget", type=float, default=80, help="每个模块的导入耗时预算（毫秒）")
+    importtime_parser.add_argument("--repeat", type=int, default=5, help="重复次数，取最短耗时")
+    importtime_parser.add_argument("--top", type=int, default=8, help="列出自身耗时最高的模块数")
+
+    search_parser = subparsers.add_parser("search", help="题单搜索索引：构建、增量更新与查询耗时")
+    search_parser.add_argument("--favorites", type=int, default=300, help="题单数量")
+    search_parser.add_argument("--per-favorite", type=int, default=100, help="每个题单的题目数")
+    search_parser.add_argument("--repeat", type=int, default=3, help="重复次数，取最短耗时")
+
+    args = parser.parse_args(argv)
+    if args.command == "extract":
+        ok = bench_extract(args.repeat)
+    elif args.command == "backend":
+        ok = bench_backend(args.repeat)
+    elif args.command == "scale":
+        ok = bench_scale(args.sizes, args.depths, args.widths, args.repeat, args.target_kb)
+    elif args.command == "names":
+        ok = bench_names(args.scale, args.repeat)
+    elif args.command == "match":
+        ok = bench_match(args.scale, args.queries, args.repeat)
+    elif args.command == "importtime":
+        ok = bench_importtime(args.budget, args.repeat, args.top)
+    elif args.command == "search":
+        ok = bench_search(args.favorites, args.per_favorite, args.repeat)
+    else:  # pragma: no cover - argparse 已限制取值
+        ok = False
+    raise SystemExit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,23 +1,39 @@
 """
-收集 discuss_json 下所有题单名称，生成/更新 favorite_name.json，并打印结果。
+收集 discuss_json 下所有题单名称，生成/更新 favorite_name_ordered.json，并打印结果。
+
+每个 JSON 文件提取出的名称按 mtime/大小/内容哈希缓存在 discuss_json/.favorite_name_cache.json 中，
+重新生成时只重新读取有变化的文件。
 """
 
 from __future__ import annotations
 
+import hashlib
 import json
+import os
+import re
+from functools import lru_cache
 from pathlib import Path
-from typing import Dict, Iterable, List, Tuple, Union
+from typing import Any, Dict, Iterable, List, Tuple, Union
+
+_NUMERIC_PREFIX_RE = re.compile(r"^(\d+(?:\.\d+)*)")
+
+NAME_CACHE_FILENAME = ".favorite_name_cache.json"
 
 
 class FavoriteNameTool:
-    def __init__(self, base_dir: Path | None = None) -> None:
+    def __init__(self, base_dir: Path | None = None, use_cache: bool = True) -> None:
         self.base_dir = base_dir or Path(__file__).resolve().parent
         self.discuss_json_dir = self.base_dir / "discuss_json"
         self.output_path = self.base_dir / "favorite_name_ordered.json"
+        self.cache_path = self.discuss_json_dir / NAME_CACHE_FILENAME
+        self.use_cache = use_cache
+        # 最近一次 collect_names 重新读取的文件数
+        self.reloaded_files = 0
+        self._cache_dirty = False
 
     def _iter_discuss_files(self) -> Iterable[Path]:
-        # 先按文件名排序，保证专题顺序稳定
-        return sorted(self.discuss_json_dir.glob("*.json"))
+        # 先按文件名排序，保证专题顺序稳定；跳过缓存等隐藏文件
+        return sorted(p for p in self.discuss_json_dir.glob("*.json") if not p.name.startswith("."))
 
     @staticmethod
     def _parse_chinese_num(text: str) -> Union[int, None]:
@@ -53,9 +69,8 @@ class FavoriteNameTool:
         num = cls._parse_chinese_num(s)
         if num is not None:
             return (num, ())
-        import re
 
-        m = re.match(r"^(\d+(?:\.\d+)*)", s)
+        m = _NUMERIC_PREFIX_RE.match(s)
         if m:
             nums = tuple(int(x) for x in m.group(1).split("."))
             return (nums[0], nums[1:])
@@ -70,40 +85,101 @@ class FavoriteNameTool:
         return (1, segment.lower())
 
     @classmethod
+    @lru_cache(maxsize=None)
     def name_sort_key(cls, name: str) -> Tuple:
+        # 名称在多次生成之间基本不变，排序键按名称缓存
         segments = name.split(" / ")
         return tuple(cls._segment_key(seg) for seg in segments)
 
-    def _load_existing(self) -> Dict[str, str]:
+    def _read_existing(self) -> Any:
         if not self.output_path.exists():
-            return {}
+            return None
         try:
             with self.output_path.open("r", encoding="utf-8") as f:
-                data = json.load(f)
-            if isinstance(data, dict):
-                # 仅保留字符串键
-                return {str(k): str(v) for k, v in data.items()}
+                return json.load(f)
         except json.JSONDecodeError:
-            pass
+            return None
+
+    def _load_existing(self) -> Dict[str, str]:
+        data = self._read_existing()
+        if isinstance(data, dict):
+            # 仅保留字符串键
+            return {str(k): str(v) for k, v in data.items()}
+        if isinstance(data, list):
+            # [{"old": ..., "new": ...}, ...]
+            return {
+                str(item["old"]): str(item.get("new") or "")
+                for item in data
+                if isinstance(item, dict) and "old" in item
+            }
         return {}
 
+    @staticmethod
+    def _names_from_file(path: Path) -> List[str]:
+        with path.open("r", encoding="utf-8") as f:
+            items = json.load(f)
+        if not isinstance(items, list):
+            return []
+        return [str(item["name"]) for item in items if isinstance(item, dict) and item.get("name")]
+
+    def _load_cache(self) -> Dict[str, Dict[str, Any]]:
+        if not self.use_cache or not self.cache_path.exists():
+            return {}
+        try:
+            with self.cache_path.open("r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (json.JSONDecodeError, OSError):
+            return {}
+        return data if isinstance(data, dict) else {}
+
+    def _save_cache(self, cache: Dict[str, Dict[str, Any]]) -> None:
+        if not self.use_cache:
+            return
+        tmp_path = self.cache_path.with_name(self.cache_path.name + ".tmp")
+        with tmp_path.open("w", encoding="utf-8") as f:
+            json.dump(cache, f, ensure_ascii=False)
+        os.replace(tmp_path, self.cache_path)
+
+    def _file_names(self, path: Path, cache: Dict[str, Dict[str, Any]]) -> List[str]:
+        """
+        读取一个文件中的名称：mtime 与大小都未变时直接使用缓存；
+        否则比较内容哈希，内容未变时只更新 mtime，内容变化时重新解析。
+        """
+        stat = path.stat()
+        entry = cache.get(path.name)
+        if entry and entry.get("mtime") == stat.st_mtime_ns and entry.get("size") == stat.st_size:
+            return entry["names"]
+
+        raw = path.read_bytes()
+        digest = hashlib.sha1(raw).hexdigest()
+        if entry and entry.get("sha1") == digest:
+            names = entry["names"]
+        else:
+            self.reloaded_files += 1
+            names = self._names_from_file(path)
+        cache[path.name] = {"mtime": stat.st_mtime_ns, "size": stat.st_size, "sha1": digest, "names": names}
+        self._cache_dirty = True
+        return names
+
     def collect_names(self) -> List[str]:
+        self.reloaded_files = 0
+        self._cache_dirty = False
+        cache = self._load_cache()
+        new_cache: Dict[str, Dict[str, Any]] = {}
         seen = set()
         ordered: List[str] = []
         for path in self._iter_discuss_files():
             try:
-                with path.open("r", encoding="utf-8") as f:
-                    items = json.load(f)
-                if not isinstance(items, list):
-                    continue
-                for item in items:
-                    if isinstance(item, dict) and "name" in item and item["name"]:
-                        name = str(item["name"])
-                        if name not in seen:
-                            seen.add(name)
-                            ordered.append(name)
+                names = self._file_names(path, cache)
             except (json.JSONDecodeError, OSError):
                 continue
+            new_cache[path.name] = cache[path.name]
+            for name in names:
+                if name not in seen:
+                    seen.add(name)
+                    ordered.append(name)
+        if self._cache_dirty or len(new_cache) != len(cache):
+            self._save_cache(new_cache)
         return ordered
 
     def build_mapping(self) -> Dict[str, str]:
@@ -113,9 +189,14 @@ class FavoriteNameTool:
 
     def write(self) -> Dict[str, str]:
         mapping = self.build_mapping()
+        # 保持已有文件的格式：列表 [{"old", "new"}] 或字典 {old: new}
+        if isinstance(self._read_existing(), list):
+            data: Any = [{"old": old, "new": new} for old, new in mapping.items()]
+        else:
+            data = mapping
         self.output_path.parent.mkdir(parents=True, exist_ok=True)
         with self.output_path.open("w", encoding="utf-8") as f:
-            json.dump(mapping, f, ensure_ascii=False, indent=2)
+            json.dump(data, f, ensure_ascii=False, indent=2)
         return mapping
 
 
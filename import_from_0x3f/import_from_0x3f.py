@@ -5,17 +5,16 @@
 """
 
 import datetime
+import hashlib
 import os
 import sys
 import time
-import requests
 import json
 import re
 import argparse
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
 from pathlib import Path
-from typing import Optional, List, Dict, Any
-from dotenv import load_dotenv
-from bs4 import BeautifulSoup
+from typing import TYPE_CHECKING, Optional, List, Dict, Any, Tuple
 
 # 保证可以引用项目根目录下的模块
 BASE_DIR = Path(__file__).resolve().parent
@@ -23,8 +22,15 @@ ROOT_DIR = BASE_DIR.parent
 if str(ROOT_DIR) not in sys.path:
     sys.path.insert(0, str(ROOT_DIR))
 
-from leetcode_favorite import LeetCodeClient  # noqa: E402
-import parse_html as html_parser  # noqa: E402
+from problem_catalog import validate_question_slugs  # noqa: E402
+import slug_index  # noqa: E402
+from name_matcher import NameMatcher, choose_suggestion  # noqa: E402
+
+# requests、bs4（parse_html）与 leetcode_favorite 在用到时才导入：
+# --changes、创建题单等只读本地 JSON 的流程不需要它们
+if TYPE_CHECKING:
+    import requests
+    from leetcode_favorite import LeetCodeClient
 
 
 LEETCODE_DISCUSS_PRE_URL = "https://leetcode.cn/circle/discuss/"
@@ -33,78 +39,96 @@ FAVORITE_NAME_ORDERED_PATH = BASE_DIR / "favorite_name_ordered.json"
 # 默认延迟时间（秒），用于控制请求频率
 DEFAULT_DELAY_SECONDS = 1.0
 
+# 并发下载讨论页面的线程数
+DEFAULT_FETCH_WORKERS = 4
+
+# 下载讨论页面的超时时间（秒）
+FETCH_TIMEOUT_SECONDS = 30
+
 _FAVORITE_LIST_WRITE_ALLOWED: Optional[bool] = None
 
 # 本地保存目录
 LOCAL_HTML_DIR = BASE_DIR / "discuss_html"
 LOCAL_JSON_DIR = BASE_DIR / "discuss_json"
 
-DISCUSSION_URL_MAP = {
-    "0viNMK": {
-        "filename": "sliding_window",
-        "title": "滑动窗口与双指针"
-    },
-    "SqopEo": {
-        "filename": "binary_search",
-        "title": "二分算法"
-    },
-    "9oZFK9": {
-        "filename": "monotonic_stack",
-        "title": "单调栈"
-    },
-    "YiXPXW": {
-        "filename": "grid",
-        "title": "网格图"
-    },
-    "dHn9Vk": {
-        "filename": "bitwise_operations",
-        "title": "位运算"
-    },
-    "01LUak": {
-        "filename": "graph",
-        "title": "图论算法"
-    },
-    "tXLS3i": {
-        "filename": "dynamic_programming",
-        "title": "动态规划"
-    },
-    "mOr1u6": {
-        "filename": "data_structure",
-        "title": "常用数据结构"
-    },
-    "IYT3ss": {
-        "filename": "math",
-        "title": "数学算法"
-    },
-    "g6KTKL": {
-        "filename": "greedy",
-        "title": "贪心与思维"
-    },
-    "K0n2gO": {
-        "filename": "trees",
-        "title": "链表、树与回溯"
-    },
-    "SJFwQI": {
-        "filename": "string",
-        "title": "字符串"
-    },
-}
-
-# 分类列表：(discuss_id, filename, title)
-PROBLEM_CATEGORIES = [
-    (discuss_id, info["filename"], info["title"]) 
-    for discuss_id, info in DISCUSSION_URL_MAP.items()
-]
-
-
-
-def fetch_discussion_html(discuss_id: str) -> Optional[str]:
+# 每个子题单（h2/h3/h4 路径）的指纹：parsed 为最近一次解析的结果，synced 为最近一次创建/同步时的结果
+GROUP_FINGERPRINTS_PATH = LOCAL_JSON_DIR / ".group_fingerprints.json"
+
+# 讨论页来源登记文件：新增来源只需要编辑这个文件
+DISCUSSION_SOURCES_PATH = BASE_DIR / "discussion_sources.json"
+
+
+def load_discussion_sources(path: Path = DISCUSSION_SOURCES_PATH) -> List[Dict[str, Any]]:
+    """
+    读取讨论页来源登记文件，按 order（缺省时按文件中的顺序）排序。
+    文件格式:
+        {
+          "name_map": "favorite_name_ordered.json",      # 可选，默认的名称映射文件
+          "sources": [
+            {"id": "0viNMK", "filename": "sliding_window", "title": "滑动窗口与双指针",
+             "order": 1, "url": "...", "name_map": "..."}  # url、name_map 可选
+          ]
+        }
+    :return: [{"id", "filename", "title", "url", "name_map"}, ...]
+    """
+    if not path.exists():
+        print(f"未找到讨论页来源登记文件: {path}")
+        return []
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+    except json.JSONDecodeError as e:
+        print(f"讨论页来源登记文件格式错误: {path}: {e}")
+        return []
+
+    default_name_map = data.get("name_map")
+    sources: List[Tuple[float, int, Dict[str, Any]]] = []
+    seen_filenames = set()
+    for position, item in enumerate(data.get("sources") or []):
+        if not isinstance(item, dict) or not all(item.get(key) for key in ("id", "filename", "title")):
+            print(f"跳过无效的讨论页来源（需要 id、filename、title）: {item}")
+            continue
+        if item["filename"] in seen_filenames:
+            print(f"跳过重复的讨论页来源 filename: {item['filename']}")
+            continue
+        seen_filenames.add(item["filename"])
+        name_map = item.get("name_map") or default_name_map
+        source = {
+            "id": str(item["id"]),
+            "filename": str(item["filename"]),
+            "title": str(item["title"]),
+            "url": item.get("url") or f"{LEETCODE_DISCUSS_PRE_URL}{item['id']}",
+            "name_map": (path.parent / name_map) if name_map else None,
+        }
+        sources.append((float(item.get("order", position + 1)), position, source))
+    return [source for _, _, source in sorted(sources, key=lambda entry: entry[:2])]
+
+
+def use_discussion_sources(path: Path = DISCUSSION_SOURCES_PATH) -> None:
+    """加载来源登记文件，并更新 DISCUSSION_SOURCES / DISCUSSION_URL_MAP / PROBLEM_CATEGORIES。"""
+    global DISCUSSION_SOURCES, DISCUSSION_URL_MAP, PROBLEM_CATEGORIES
+    DISCUSSION_SOURCES = load_discussion_sources(path)
+    DISCUSSION_URL_MAP = {source["id"]: source for source in DISCUSSION_SOURCES}
+    # 分类列表：(discuss_id, filename, title)
+    PROBLEM_CATEGORIES = [(source["id"], source["filename"], source["title"]) for source in DISCUSSION_SOURCES]
+
+
+DISCUSSION_SOURCES: List[Dict[str, Any]] = []
+DISCUSSION_URL_MAP: Dict[str, Dict[str, Any]] = {}
+PROBLEM_CATEGORIES: List[Tuple[str, str, str]] = []
+use_discussion_sources()
+
+
+def fetch_discussion_html(discuss_id: str, session: Optional["requests.Session"] = None) -> Optional[str]:
     """
     从 LeetCode 获取讨论页面的 HTML
     :param discuss_id: 讨论 ID，如 "0viNMK"
+    :param session: 可选的 requests.Session，并发下载时复用连接
     :return: HTML 内容
     """
-    url = f"{LEETCODE_DISCUSS_PRE_URL}{discuss_id}"
+    import requests
+
+    url = (DISCUSSION_URL_MAP.get(discuss_id) or {}).get("url") or f"{LEETCODE_DISCUSS_PRE_URL}{discuss_id}"
     headers = {
         "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
         "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8",
@@ -113,7 +137,7 @@ def fetch_discussion_html(discuss_id: str) -> Optional[str]:
     
     try:
         print(f"正在获取: {url}")
-        response = requests.get(url, headers=headers, timeout=30)
+        response = (session or requests).get(url, headers=headers, timeout=FETCH_TIMEOUT_SECONDS)
         response.raise_for_status()
         return response.text
     except requests.RequestException as e:
@@ -124,65 +148,13 @@ def fetch_discussion_html(discuss_id: str) -> Optional[str]:
 def extract_heading_and_list_elements(html_content: str) -> str:
     """
     从 HTML 中提取 h1, h2, h3, ul, li 元素
+    每个节点只访问一次；嵌套的列表作为独立的顶层列表输出，不会在父列表中重复出现
     :param html_content: 原始 HTML 内容
-    :return: 提取后的精简 HTML
+    :return: 提取后的精简 HTML（prettify 格式）
     """
-    soup = BeautifulSoup(html_content, 'html.parser')
-    
-    # 创建新的 HTML 文档
-    new_soup = BeautifulSoup("<html><head><meta charset='utf-8'></head><body></body></html>", 'html.parser')
-    body = new_soup.find('body')
-    
-    # 查找文章内容区域
-    # 优先查找 'break-words' (常见于动态渲染的 LeetCode 讨论页)
-    content_area = soup.find('div', class_=re.compile(r'break-words', re.I))
-    if not content_area:
-        content_area = soup.find('div', class_=re.compile(r'content|article|post|topic', re.I))
-    if not content_area:
-        content_area = soup
-    
-    # 提取所有 h1, h2, h3, h4, ul, ol, li 元素
-    allowed_tags = ['h1', 'h2', 'h3', 'h4', 'ul', 'ol', 'li', 'a', 'p']
-    
-    def clone_element(element, parent):
-        """递归克隆元素，只保留允许的标签; li 里只保留包含题目链接"""
-        if element.name in allowed_tags:
-            # 过滤掉不包含题目链接的 li 元素
-            if element.name == 'li':
-                has_problem_link = False
-                for a_tag in element.find_all('a'):
-                    href = a_tag.get('href', '')
-                    if href and 'problems' in href:
-                        has_problem_link = True
-                        break
-                if not has_problem_link:
-                    return
-
-            new_tag = new_soup.new_tag(element.name)
-            # 保留 href 属性
-            if element.name == 'a' and element.get('href'):
-                new_tag['href'] = element.get('href')
-            
-            for child in element.children:
-                if hasattr(child, 'name') and child.name:
-                    if element.name == 'li' and child.name != 'a':
-                        continue  # li 里只保留 a 标签
-                    clone_element(child, new_tag)
-                elif child.string:
-                    if element.name != 'li':
-                        # li 里不保留纯文本
-                        new_tag.append(child.string.strip())
-            
-            if new_tag.get_text(strip=True):  # 只添加有内容的元素
-                parent.append(new_tag)
-    
-    # 查找所有标题和列表
-    for tag in content_area.find_all(['h1', 'h2', 'h3', 'h4', 'ul', 'ol']):
-        clone_element(tag, body)
-    
-    # 使用紧凑格式避免写入时自动换行/缩进
-    # return new_soup.decode(formatter="minimal")
-    return str(new_soup.prettify())
+    import parse_html as html_parser
+
+    return html_parser.render_simplified_html(html_parser.simplify_raw_html(html_content))
 
 
 def save_json_from_html_content(
@@ -192,8 +164,20 @@ def save_json_from_html_content(
     category_title: Optional[str] = None,
 ) -> List[Dict[str, Any]]:
     """使用 parse_html 解析精简 HTML 并保存为 JSON。"""
-    os.makedirs(LOCAL_JSON_DIR, exist_ok=True)
+    import parse_html as html_parser
+
     data = html_parser.parse_html_content(simplified_html)
+    return save_json_from_groups(data, filename, category_index, category_title)
+
+
+def save_json_from_groups(
+    data: List[Dict[str, Any]],
+    filename: str,
+    category_index: Optional[int] = None,
+    category_title: Optional[str] = None,
+) -> List[Dict[str, Any]]:
+    """把已解析的题单分组加上专题前缀后保存为 JSON。"""
+    os.makedirs(LOCAL_JSON_DIR, exist_ok=True)
 
     # 在 name 前面添加序号和专题名称
     if category_index is not None and category_title:
@@ -203,12 +187,136 @@ def save_json_from_html_content(
             item["name"] = f"{prefix} / {base_name}" if base_name else prefix
 
     json_path = LOCAL_JSON_DIR / f"{filename}.json"
+    changes = record_group_fingerprints(filename, data)
     with open(json_path, "w", encoding="utf-8") as f:
         json.dump(data, f, ensure_ascii=False, indent=2)
     print(f"解析结果已保存到: {json_path}")
+    print_group_changes(changes, title=category_title or filename)
     return data
 
 
+def group_fingerprint(group: Dict[str, Any]) -> str:
+    """子题单指纹：按顺序的题目 slug 的 SHA-1。题目标题的变化不影响题单内容，不计入。"""
+    slugs = "\n".join(p.get("titleSlug", "") for p in group.get("problems", []))
+    return hashlib.sha1(slugs.encode("utf-8")).hexdigest()
+
+
+def fingerprint_groups(groups: List[Dict[str, Any]]) -> Dict[str, str]:
+    """{子题单名称: 指纹}，保持文档顺序。"""
+    return {group.get("name", ""): group_fingerprint(group) for group in groups}
+
+
+def diff_group_fingerprints(old: Dict[str, str], new: Dict[str, str]) -> Dict[str, List[str]]:
+    """比较两组指纹，返回 {"added": [...], "removed": [...], "changed": [...]}（子题单名称）。"""
+    return {
+        "added": [name for name in new if name not in old],
+        "removed": [name for name in old if name not in new],
+        "changed": [name for name, fp in new.items() if name in old and old[name] != fp],
+    }
+
+
+def _load_fingerprint_store() -> Dict[str, Dict[str, Dict[str, str]]]:
+    if not GROUP_FINGERPRINTS_PATH.exists():
+        return {}
+    try:
+        with open(GROUP_FINGERPRINTS_PATH, "r", encoding="utf-8") as f:
+            data = json.load(f)
+    except json.JSONDecodeError:
+        print(f"指纹文件格式错误，将重新生成: {GROUP_FINGERPRINTS_PATH}")
+        return {}
+    return data if isinstance(data, dict) else {}
+
+
+def _save_fingerprint_store(store: Dict[str, Dict[str, Dict[str, str]]]) -> None:
+    os.makedirs(LOCAL_JSON_DIR, exist_ok=True)
+    tmp_path = GROUP_FINGERPRINTS_PATH.with_name(GROUP_FINGERPRINTS_PATH.name + ".tmp")
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(store, f, ensure_ascii=False, indent=2)
+    os.replace(tmp_path, GROUP_FINGERPRINTS_PATH)
+
+
+def record_group_fingerprints(filename: str, groups: List[Dict[str, Any]]) -> Dict[str, List[str]]:
+    """
+    记录一个分类最新解析结果的指纹，返回与上一次解析相比的变化。
+    首次记录时以磁盘上已有的 JSON 作为上一次解析结果，并视为已经创建过题单。
+    """
+    store = _load_fingerprint_store()
+    entry = store.get(filename)
+    if entry is None:
+        previous = fingerprint_groups(load_category_from_json(filename)) if (LOCAL_JSON_DIR / f"{filename}.json").exists() else {}
+        entry = {"parsed": previous, "synced": dict(previous)}
+
+    current = fingerprint_groups(groups)
+    changes = diff_group_fingerprints(entry.get("parsed") or {}, current)
+    entry["parsed"] = current
+    entry.setdefault("synced", {})
+    store[filename] = entry
+    _save_fingerprint_store(store)
+    return changes
+
+
+def pending_group_changes(filename: str) -> Dict[str, List[str]]:
+    """自上次创建/同步以来的变化（可能跨越多次刷新）。"""
+    entry = _load_fingerprint_store().get(filename) or {}
+    return diff_group_fingerprints(entry.get("synced") or {}, entry.get("parsed") or {})
+
+
+def mark_groups_synced(filename: str, names: List[str]) -> None:
+    """把指定子题单标记为已创建/同步；已不存在的子题单从 synced 中移除。"""
+    store = _load_fingerprint_store()
+    entry = store.get(filename)
+    if not entry:
+        return
+    parsed = entry.get("parsed") or {}
+    synced = entry.setdefault("synced", {})
+    for name in names:
+        if name in parsed:
+            synced[name] = parsed[name]
+        else:
+            synced.pop(name, None)
+    _save_fingerprint_store(store)
+
+
+def print_group_changes(changes: Dict[str, List[str]], title: str = "") -> None:
+    added, removed, changed = changes["added"], changes["removed"], changes["changed"]
+    prefix = f"[{title}] " if title else ""
+    if not (added or removed or changed):
+        print(f"{prefix}子题单无变化")
+        return
+    print(f"{prefix}子题单变化: 新增 {len(added)} 个，删除 {len(removed)} 个，修改 {len(changed)} 个")
+    for label, names in (("+", added), ("-", removed), ("~", changed)):
+        for name in names:
+            print(f"  {label} {name}")
+
+
+def extract_discussion_page(html_content: str) -> Tuple[str, List[Dict[str, Any]]]:
+    """
+    单遍提取：只解析一次原始页面，得到精简 HTML 与题单分组。
+    定义在模块顶层，可以提交到进程池执行。
+    """
+    import parse_html as html_parser
+
+    page = html_parser.extract_page(html_content)
+    return page.simplified_html(), page.groups
+
+
+def save_extracted_page(
+    simplified_html: str,
+    groups: List[Dict[str, Any]],
+    filename: str,
+    category_index: Optional[int] = None,
+    category_title: Optional[str] = None,
+) -> List[Dict[str, Any]]:
+    """保存精简 HTML 与题单 JSON。"""
+    os.makedirs(LOCAL_HTML_DIR, exist_ok=True)
+    filepath = LOCAL_HTML_DIR / f"{filename}.html"
+    with open(filepath, 'w', encoding='utf-8') as f:
+        f.write(simplified_html)
+
+    print(f"精简 HTML 已保存到: {filepath}")
+    return save_json_from_groups(groups, filename, category_index, category_title)
+
+
 def fetch_and_save_discussion_html(
     discuss_id: str,
     filename: str,
@@ -221,39 +329,99 @@ def fetch_and_save_discussion_html(
     :param filename: 保存的文件名（不含扩展名）
     :return: 是否成功
     """
-    # 确保目录存在
-    os.makedirs(LOCAL_HTML_DIR, exist_ok=True)
-    
     # 获取 HTML
     html_content = fetch_discussion_html(discuss_id)
     if not html_content:
         return False
-    
-    # 提取精简内容
-    simplified_html = extract_heading_and_list_elements(html_content)
-
-    # 保存精简 HTML
-    filepath = LOCAL_HTML_DIR / f"{filename}.html"
-    with open(filepath, 'w', encoding='utf-8') as f:
-        f.write(simplified_html)
 
-    print(f"精简 HTML 已保存到: {filepath}")
-    save_json_from_html_content(simplified_html, filename, category_index, category_title)
+    simplified_html, groups = extract_discussion_page(html_content)
+    save_extracted_page(simplified_html, groups, filename, category_index, category_title)
     return True
 
 
-def fetch_all_discussions() -> None:
+def fetch_all_discussions(
+    max_workers: int = DEFAULT_FETCH_WORKERS,
+    parse_workers: Optional[int] = None,
+) -> int:
     """
     获取所有讨论页面并保存
+    下载在线程池中并发进行；每个页面下载完成后立即提交到进程池做精简与解析，
+    结果回到主线程写文件并输出每个页面的状态与耗时
+    :param max_workers: 并发下载的页面数
+    :param parse_workers: 解析进程数，默认为 CPU 核数；<=1 时在主线程解析（单核机器上避免进程间传输开销）
+    :return: 成功的页面数
     """
-    print(f"\n将获取 {len(DISCUSSION_URL_MAP)} 个讨论页面...")
+    categories = list(enumerate(DISCUSSION_URL_MAP.items(), 1))
+    total = len(categories)
+    print(f"\n将获取 {total} 个讨论页面...")
+
+    import requests
+
+    session = requests.Session()
+    adapter = requests.adapters.HTTPAdapter(pool_connections=1, pool_maxsize=max(1, max_workers))
+    session.mount("https://", adapter)
+
+    def download(discuss_id: str) -> Tuple[Optional[str], float]:
+        t0 = time.perf_counter()
+        html_content = fetch_discussion_html(discuss_id, session)
+        return html_content, time.perf_counter() - t0
 
     success_count = 0
-    for idx, (discuss_id, info) in enumerate(DISCUSSION_URL_MAP.items(), 1):
-        if fetch_and_save_discussion_html(discuss_id, info["filename"], idx, info["title"]):
-            success_count += 1
 
-    print(f"\n完成: 成功 {success_count}/{len(DISCUSSION_URL_MAP)} 个")
+    def finish(idx: int, info: Dict[str, str], fetch_seconds: float, parse_start: float, result) -> None:
+        nonlocal success_count
+        simplified_html, groups = result
+        parse_seconds = time.perf_counter() - parse_start
+        save_extracted_page(simplified_html, groups, info["filename"], idx, info["title"])
+        success_count += 1
+        print(
+            f"[{idx}/{total}] {info['title']}: 成功，{len(groups)} 个题单"
+            f"（下载 {fetch_seconds:.2f}s，解析 {parse_seconds:.2f}s）"
+        )
+
+    t_start = time.perf_counter()
+    if parse_workers is None:
+        parse_workers = os.cpu_count() or 1
+    parse_pool = None
+    if parse_workers > 1:
+        # 进程池会导入 multiprocessing，只在需要并行解析时加载
+        from concurrent.futures import ProcessPoolExecutor
+        parse_pool = ProcessPoolExecutor(max_workers=parse_workers)
+    try:
+        with ThreadPoolExecutor(max_workers=max(1, max_workers)) as fetch_pool:
+            # future -> (阶段, 分类序号, 讨论信息, 下载耗时, 解析开始时间)
+            pending: Dict[Future, Tuple[str, int, Dict[str, str], float, float]] = {
+                fetch_pool.submit(download, discuss_id): ("fetch", idx, info, 0.0, 0.0)
+                for idx, (discuss_id, info) in categories
+            }
+            while pending:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    stage, idx, info, fetch_seconds, parse_start = pending.pop(future)
+                    try:
+                        if stage == "parse":
+                            finish(idx, info, fetch_seconds, parse_start, future.result())
+                            continue
+
+                        html_content, fetch_seconds = future.result()
+                        if not html_content:
+                            print(f"[{idx}/{total}] {info['title']}: 下载失败（耗时 {fetch_seconds:.2f}s）")
+                            continue
+                        parse_start = time.perf_counter()
+                        if parse_pool is None:
+                            finish(idx, info, fetch_seconds, parse_start, extract_discussion_page(html_content))
+                        else:
+                            parse_future = parse_pool.submit(extract_discussion_page, html_content)
+                            pending[parse_future] = ("parse", idx, info, fetch_seconds, parse_start)
+                    except Exception as e:
+                        print(f"[{idx}/{total}] {info['title']}: 处理失败: {e}")
+    finally:
+        if parse_pool is not None:
+            parse_pool.shutdown()
+        session.close()
+
+    print(f"\n完成: 成功 {success_count}/{total} 个（总耗时 {time.perf_counter() - t_start:.2f}s）")
+    return success_count
 
 
 def load_category_from_json(filename: str) -> List[Dict[str, Any]]:
@@ -266,19 +434,17 @@ def load_category_from_json(filename: str) -> List[Dict[str, Any]]:
         return json.load(f)
 
 
-def load_name_mapping() -> Dict[str, str]:
-    """
-    读取 favorite_name_ordered.json，返回 {old: new} 映射，只保留 new 有值的条目。
-    """
-    if not FAVORITE_NAME_ORDERED_PATH.exists():
-        print(f"未找到名称映射文件: {FAVORITE_NAME_ORDERED_PATH}")
+def _read_name_mapping_file(path: Path) -> Dict[str, str]:
+    """读取一个名称映射文件，返回 {old: new} 映射，只保留 new 有值的条目。"""
+    if not path.exists():
+        print(f"未找到名称映射文件: {path}")
         return {}
 
     try:
-        with open(FAVORITE_NAME_ORDERED_PATH, "r", encoding="utf-8") as f:
+        with open(path, "r", encoding="utf-8") as f:
             data = json.load(f)
     except json.JSONDecodeError:
-        print("favorite_name_ordered.json 格式错误，跳过名称映射")
+        print(f"{path.name} 格式错误，跳过名称映射")
         return {}
 
     mapping: Dict[str, str] = {}
@@ -295,11 +461,30 @@ def load_name_mapping() -> Dict[str, str]:
             if new_str:
                 mapping[str(old_name)] = new_str
     else:
-        print("favorite_name_ordered.json 内容格式不支持，跳过名称映射")
+        print(f"{path.name} 内容格式不支持，跳过名称映射")
 
     return mapping
 
 
+def load_name_mapping() -> Dict[str, str]:
+    """
+    读取来源登记文件中配置的名称映射文件（默认 favorite_name_ordered.json），返回 {old: new} 映射。
+    子题单名称带有专题前缀，各来源的映射合并后不会冲突。
+    """
+    paths: List[Path] = []
+    for source in DISCUSSION_SOURCES:
+        path = source.get("name_map")
+        if path and path not in paths:
+            paths.append(path)
+    if not paths:
+        paths = [FAVORITE_NAME_ORDERED_PATH]
+
+    mapping: Dict[str, str] = {}
+    for path in paths:
+        mapping.update(_read_name_mapping_file(path))
+    return mapping
+
+
 def resolve_favorite_name(original_name: str, name_mapping: Dict[str, str]) -> str:
     """
     根据映射获取新的题单名称；找不到映射时返回原名。
@@ -328,15 +513,17 @@ def _confirm_write_favorite_list(path: Path) -> bool:
 
 
 def create_favorite_from_category(
-    client: LeetCodeClient,
+    client: "LeetCodeClient",
     category: Dict[str, Any],
     name_mapping: Optional[Dict[str, str]] = None,
     dry_run: bool = False,
     delay_seconds: float = DEFAULT_DELAY_SECONDS,
+    name_matcher: Optional[NameMatcher] = None,
 ) -> Optional[Dict[str, str]]:
     """
     使用 JSON 分类数据创建题单。
     返回包含题单信息的字典，包括 name, slug, first_problem_slug
+    :param name_matcher: 名称映射未命中时列出最接近的映射供选择，选择结果写回 name_mapping（本次运行内有效）
     """
     original_name = category.get("name") or "未命名题单"
     mapping = name_mapping or {}
@@ -347,6 +534,12 @@ def create_favorite_from_category(
         print(f"分类 [{favorite_name}] 没有题目，跳过")
         return None
 
+    # 离线校验：提前报告无效的 slug，避免整批添加失败
+    slugs = validate_question_slugs([p.get("titleSlug") for p in problems if p.get("titleSlug")])
+    if not slugs:
+        print(f"分类 [{favorite_name}] 没有有效题目，跳过")
+        return None
+
     if dry_run:
         print(f"[试运行] 将创建题单: {favorite_name}")
         if favorite_name != original_name:
@@ -359,7 +552,12 @@ def create_favorite_from_category(
         return None
 
     if mapping and original_name not in mapping:
-        print(_red(f"[名称映射未命中] 将使用原始题单名: {original_name}"))
+        print(_red(f"[名称映射未命中] {original_name}"))
+        chosen = choose_suggestion(name_matcher, original_name) if name_matcher else None
+        if chosen:
+            favorite_name = mapping[original_name] = chosen
+        else:
+            print(_red("将使用原始题单名（可运行 python name_matcher.py repair 修复映射文件）"))
     elif favorite_name != original_name:
         print(f"使用映射名称: {original_name} -> {favorite_name}")
     print(f"正在创建题单: {favorite_name}")
@@ -376,8 +574,6 @@ def create_favorite_from_category(
     if delay_seconds > 0:
         time.sleep(delay_seconds)
 
-    slugs = [p.get("titleSlug") for p in problems if p.get("titleSlug")]
-
     batch_size = 50
     total_added = 0
 
@@ -396,7 +592,7 @@ def create_favorite_from_category(
     print(f"完成: 共添加 {total_added} 道题目到题单 [{favorite_name}]")
     
     # 返回题单信息
-    first_problem_slug = problems[0].get("titleSlug", "") if problems else ""
+    first_problem_slug = slugs[0] if slugs else ""
     return {
         "name": favorite_name,
         "slug": favorite_slug,
@@ -448,10 +644,11 @@ def generate_favorite_list_file(
     output_filename: str = "favorite_list.md",
     confirm: bool = True,
     verbose: bool = False,
+    merge: bool = False,
 ) -> None:
     """生成题单列表文件。
 
-    - 同一分类覆盖（分类名相同）
+    - 同一分类覆盖（分类名相同）；merge=True 时只按题单名称替换/追加分类中的条目
     - 不同分类追加
     - 链接使用题单第一题，并包含 envType/envId（envId=题单 slug）
     """
@@ -488,7 +685,13 @@ def generate_favorite_list_file(
         new_data.setdefault(category_name, []).append(entry)
 
     merged_data = dict(existing_data)
-    merged_data.update(new_data)  # 新数据覆盖同分类
+    if merge:
+        for category_name, entries in new_data.items():
+            merged_entries = {entry.get("name"): entry for entry in merged_data.get(category_name, [])}
+            merged_entries.update((entry["name"], entry) for entry in entries)
+            merged_data[category_name] = list(merged_entries.values())
+    else:
+        merged_data.update(new_data)  # 新数据覆盖同分类
 
     now = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
     lines: List[str] = ["# LeetCode 题单列表", "", f"更新时间: {now}", ""]
@@ -510,6 +713,105 @@ def generate_favorite_list_file(
         print(f"题单列表已保存到: {output_path}")
 
 
+def _sync_favorite_questions(
+    client: "LeetCodeClient",
+    favorite_slug: str,
+    problems: List[Dict[str, str]],
+    delay_seconds: float = DEFAULT_DELAY_SECONDS,
+) -> bool:
+    """让已有题单的题目与分类数据一致：补充缺少的题目，移除多余的题目。"""
+    wanted = validate_question_slugs([p["titleSlug"] for p in problems if p.get("titleSlug")])
+    existing = set()
+    for page in client.iter_favorite_question_pages(favorite_slug):
+        existing.update(q["titleSlug"] for q in page if q.get("titleSlug"))
+
+    missing = [slug for slug in wanted if slug not in existing]
+    extra = existing - set(wanted)
+    ok = True
+    for i in range(0, len(missing), 50):
+        if not client.batch_add_questions_to_favorite(favorite_slug, missing[i:i + 50]):
+            print(f"  批量添加失败，当前位置: {i}")
+            ok = False
+        if delay_seconds > 0:
+            time.sleep(delay_seconds)
+    for slug in sorted(extra):
+        if not client.remove_question_from_favorite(favorite_slug, slug):
+            ok = False
+    print(f"  同步完成: 添加 {len(missing)} 道，移除 {len(extra)} 道")
+    return ok
+
+
+def sync_changed_categories(
+    client: "LeetCodeClient",
+    delay_seconds: float = DEFAULT_DELAY_SECONDS,
+) -> None:
+    """
+    只处理自上次创建/同步以来有变化的子题单：
+    - 新增：创建题单
+    - 修改：已有同名题单时同步题目，否则创建
+    - 删除：只报告，不会删除 LeetCode 上的题单
+    """
+    pending = []
+    for idx, (discuss_id, filename, title) in enumerate(PROBLEM_CATEGORIES, 1):
+        changes = pending_group_changes(filename)
+        if any(changes.values()):
+            print_group_changes(changes, title=title)
+            pending.append((filename, title, changes))
+
+    if not pending:
+        print("\n所有子题单均已同步，没有需要处理的变化")
+        return
+
+    total = sum(len(c["added"]) + len(c["changed"]) for _, _, c in pending)
+    confirm = input(f"\n将创建或同步 {total} 个子题单，确认？(y/n): ").strip().lower()
+    if confirm != 'y':
+        return
+
+    name_mapping = load_name_mapping()
+    name_matcher = NameMatcher(name_mapping)
+    created, _ = client.get_favorite_lists()
+    existing_slugs = {fav["name"]: fav["slug"] for fav in created if fav.get("name") and fav.get("slug")}
+
+    favorite_infos = []
+    category_names = []
+    for filename, title, changes in pending:
+        groups = {group.get("name"): group for group in load_category_from_json(filename)}
+        synced_names = []
+        for name in changes["added"] + changes["changed"]:
+            group = groups.get(name)
+            if not group:
+                continue
+            favorite_name = resolve_favorite_name(name, name_mapping)
+            favorite_slug = existing_slugs.get(favorite_name) if name in changes["changed"] else None
+            if favorite_slug:
+                print(f"正在同步题单: {favorite_name}")
+                if not _sync_favorite_questions(client, favorite_slug, group.get("problems", []), delay_seconds):
+                    continue
+                problems = group.get("problems", [])
+                result = {
+                    "name": favorite_name,
+                    "slug": favorite_slug,
+                    "first_problem_slug": problems[0].get("titleSlug", "") if problems else "",
+                }
+            else:
+                result = create_favorite_from_category(
+                    client, group, name_mapping=name_mapping, delay_seconds=delay_seconds,
+                    name_matcher=name_matcher,
+                )
+                if not result:
+                    continue
+            favorite_infos.append(result)
+            category_names.append(title)
+            synced_names.append(name)
+
+        for name in changes["removed"]:
+            print(f"子题单已从讨论页删除（如需要请手动删除对应题单）: {resolve_favorite_name(name, name_mapping)}")
+        mark_groups_synced(filename, synced_names + changes["removed"])
+
+    if favorite_infos:
+        generate_favorite_list_file(favorite_infos, category_names, merge=True)
+
+
 def display_available_categories():
     """显示可用的分类列表"""
     print("\n可用的题单分类:")
@@ -520,7 +822,7 @@ def display_available_categories():
 
 
 
-def interactive_mode(client: LeetCodeClient):
+def interactive_mode(client: "LeetCodeClient"):
     """
     交互模式
     :param client: LeetCode 客户端
@@ -532,6 +834,7 @@ def interactive_mode(client: LeetCodeClient):
         print("2. 获取所有讨论页面 HTML")
         print("3. 创建指定分类的子题单")
         print("4. 创建所有分类的子题单")
+        print("5. 只创建/同步有变化的子题单")
         print("q. 退出")
         
         choice = input("\n请选择操作: ").strip().lower()
@@ -541,7 +844,7 @@ def interactive_mode(client: LeetCodeClient):
         
         if choice == '1':
             # 获取单个讨论页面 HTML
-            cat_input = input("\n请输入分类编号 (1-12): ").strip()
+            cat_input = input(f"\n请输入分类编号 (1-{len(PROBLEM_CATEGORIES)}): ").strip()
             try:
                 cat_index = int(cat_input) - 1
                 if 0 <= cat_index < len(PROBLEM_CATEGORIES):
@@ -558,7 +861,7 @@ def interactive_mode(client: LeetCodeClient):
             
         elif choice == '3':
             # 创建指定分类的子题单
-            cat_input = input("\n请输入分类编号 (1-12): ").strip()
+            cat_input = input(f"\n请输入分类编号 (1-{len(PROBLEM_CATEGORIES)}): ").strip()
             try:
                 cat_index = int(cat_input) - 1
                 if 0 <= cat_index < len(PROBLEM_CATEGORIES):
@@ -571,16 +874,19 @@ def interactive_mode(client: LeetCodeClient):
                         continue
 
                     name_mapping = load_name_mapping()
+                    index = slug_index.load_slug_index(LOCAL_JSON_DIR)
                     print(f"\n找到 {len(categories)} 个子分类:")
                     total_problems = 0
                     for i, cat in enumerate(categories, 1):
                         probs = cat.get("problems", [])
                         total_problems += len(probs)
                         display_name = resolve_favorite_name(cat.get("name") or "", name_mapping)
-                        print(f"{i:3}. {display_name}")
+                        shared = index.shared_count((filename, cat.get("name") or ""))
+                        print(f"{i:3}. {display_name}（{len(probs)} 道" + (f"，{shared} 道也在其它子题单中）" if shared else "）"))
 
                     confirm = input(f"\n将创建 {len(categories)} 个题单（共 {total_problems} 道题），确认？(y/n): ").strip().lower()
                     if confirm == 'y':
+                        name_matcher = NameMatcher(name_mapping)
                         favorite_infos = []
                         category_names = []
                         for cat in categories:
@@ -589,9 +895,12 @@ def interactive_mode(client: LeetCodeClient):
                                 cat,
                                 name_mapping=name_mapping,
                                 delay_seconds=DEFAULT_DELAY_SECONDS,
+                                name_matcher=name_matcher,
                             )
                             favorite_infos.append(result)
                             category_names.append(title)
+                            if result:
+                                mark_groups_synced(filename, [cat.get("name", "")])
                         # 生成题单列表文件
                         generate_favorite_list_file(favorite_infos, category_names)
                 else:
@@ -615,9 +924,11 @@ def interactive_mode(client: LeetCodeClient):
             name_mapping = load_name_mapping()
             total_problems = sum(len(cat.get("problems", [])) for cat in all_categories)
             print(f"\n找到 {len(all_categories)} 个子分类，共 {total_problems} 道题")
+            slug_index.print_stats(slug_index.load_slug_index(LOCAL_JSON_DIR))
 
             confirm = input(f"\n将创建 {len(all_categories)} 个题单，确认？(y/n): ").strip().lower()
             if confirm == 'y':
+                name_matcher = NameMatcher(name_mapping)
                 favorite_infos = []
                 category_names = []
                 for idx, (discuss_id, filename, title) in enumerate(PROBLEM_CATEGORIES):
@@ -628,12 +939,18 @@ def interactive_mode(client: LeetCodeClient):
                             cat,
                             name_mapping=name_mapping,
                             delay_seconds=DEFAULT_DELAY_SECONDS,
+                            name_matcher=name_matcher,
                         )
                         favorite_infos.append(result)
                         category_names.append(title)
+                        if result:
+                            mark_groups_synced(filename, [cat.get("name", "")])
                 # 生成题单列表文件
                 generate_favorite_list_file(favorite_infos, category_names)
-                    
+
+        elif choice == '5':
+            sync_changed_categories(client, delay_seconds=DEFAULT_DELAY_SECONDS)
+
         else:
             print("无效的选项")
 
@@ -641,9 +958,19 @@ def interactive_mode(client: LeetCodeClient):
 def main():
     parser = argparse.ArgumentParser(description='从 LeetCode 讨论页面导入题单数据')
     parser.add_argument('--fetch-all', action='store_true', help='获取所有讨论页面 HTML')
-    parser.add_argument('--fetch', type=int, help='获取指定分类的讨论页面 HTML (1-12)')
+    parser.add_argument('--fetch', type=int, help='获取指定分类的讨论页面 HTML（分类编号见来源登记文件）')
+    parser.add_argument('--sources', help='讨论页来源登记文件（默认 discussion_sources.json）')
+    parser.add_argument('--changes', action='store_true', help='显示自上次创建/同步以来有变化的子题单')
+    parser.add_argument('--workers', type=int, default=DEFAULT_FETCH_WORKERS, help='--fetch-all 时并发下载的页面数')
+    parser.add_argument('--parse-workers', type=int, help='--fetch-all 时的解析进程数（默认 CPU 核数，1 表示在主进程解析）')
     args = parser.parse_args()
-    
+    if args.sources:
+        use_discussion_sources(Path(args.sources))
+    if not PROBLEM_CATEGORIES:
+        raise SystemExit("没有可用的讨论页来源，请检查来源登记文件")
+
+    from dotenv import load_dotenv
+
     # 加载环境变量
     env_path = ROOT_DIR / '.env'
     load_dotenv(env_path)
@@ -651,8 +978,11 @@ def main():
     csrf_token = os.getenv('csrftoken')
     session_id = os.getenv('LEETCODE_SESSION')
     
-    if args.fetch_all:
-        fetch_all_discussions()
+    if args.changes:
+        for discuss_id, filename, title in PROBLEM_CATEGORIES:
+            print_group_changes(pending_group_changes(filename), title=title)
+    elif args.fetch_all:
+        fetch_all_discussions(args.workers, args.parse_workers)
     elif args.fetch:
         if 1 <= args.fetch <= len(PROBLEM_CATEGORIES):
             discuss_id, filename, title = PROBLEM_CATEGORIES[args.fetch - 1]
@@ -664,7 +994,7 @@ def main():
             # 直接获取 HTML 不需要登录
             print("\n选择要获取的讨论页面:")
             print("a. 获取所有讨论页面")
-            print("或输入分类编号 (1-12)")
+            print(f"或输入分类编号 (1-{len(PROBLEM_CATEGORIES)})")
             
             display_available_categories()
             
@@ -683,6 +1013,8 @@ def main():
                 except ValueError:
                     print("请输入有效的选项")
         else:
+            from leetcode_favorite import LeetCodeClient
+
             client = LeetCodeClient(csrf_token, session_id)
             interactive_mode(client)
 
@@ -0,0 +1,234 @@
+"""
+题单名称的三元组（trigram）模糊匹配：为名称映射未命中的子题单推荐最接近的映射。
+
+讨论页调整小节编号或措辞后，favorite_name_ordered.json 中的 old 会与新解析出的名称对不上。
+索引对每个 old 名称的字符三元组建立倒排表，查询时只访问与查询共享三元组的候选，
+按 IDF 加权的 Dice 系数打分（公共前缀如 “1 滑动窗口与双指针 / ” 权重很低）。
+
+用法:
+    python name_matcher.py suggest "1 滑动窗口与双指针 / 三、单序列双指针 / §3.2 相向双指针"
+    python name_matcher.py repair [--min-score 0.6] [--dry-run]   # 批量修复映射文件中过期的 old
+"""
+
+import argparse
+import json
+import math
+import re
+from collections import Counter
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+from favorite_name_tool import FavoriteNameTool
+
+BASE_DIR = Path(__file__).resolve().parent
+FAVORITE_NAME_ORDERED_PATH = BASE_DIR / "favorite_name_ordered.json"
+
+DEFAULT_SUGGEST_LIMIT = 5
+DEFAULT_MIN_SCORE = 0.6
+
+_WHITESPACE_RE = re.compile(r"\s+")
+
+
+def _trigrams(text: str) -> Set[str]:
+    text = "  " + _WHITESPACE_RE.sub(" ", text.strip().lower()) + " "
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+class TrigramIndex:
+    def __init__(self, names: Iterable[str]) -> None:
+        self.names: List[str] = []
+        self._grams: List[Set[str]] = []
+        self._postings: Dict[str, List[int]] = {}
+        for name in dict.fromkeys(names):
+            grams = _trigrams(name)
+            name_id = len(self.names)
+            self.names.append(name)
+            self._grams.append(grams)
+            for gram in grams:
+                self._postings.setdefault(gram, []).append(name_id)
+
+        total = max(1, len(self.names))
+        self._idf = {gram: math.log(1 + total / len(ids)) for gram, ids in self._postings.items()}
+        self._weights = [sum(self._idf[g] for g in grams) for grams in self._grams]
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def suggest(self, query: str, limit: int = DEFAULT_SUGGEST_LIMIT, min_score: float = 0.0) -> List[Tuple[str, float]]:
+        """返回 [(名称, 相似度 0~1)]，按相似度从高到低排列。"""
+        grams = _trigrams(query)
+        shared: Counter = Counter()
+        query_weight = 0.0
+        for gram in grams:
+            idf = self._idf.get(gram)
+            if idf is None:
+                # 索引中不存在的三元组按最高权重计入查询
+                query_weight += math.log(1 + max(1, len(self.names)))
+                continue
+            query_weight += idf
+            for name_id in self._postings[gram]:
+                shared[name_id] += idf
+
+        scored = [
+            (self.names[name_id], 2 * weight / (query_weight + self._weights[name_id]))
+            for name_id, weight in shared.items()
+        ]
+        scored = [item for item in scored if item[1] >= min_score]
+        scored.sort(key=lambda item: -item[1])
+        return scored[:limit]
+
+
+def _read_mapping_file(path: Path) -> Any:
+    if not path.exists():
+        return []
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def _mapping_pairs(data: Any) -> List[Tuple[str, str]]:
+    """映射文件（列表 [{"old", "new"}] 或字典 {old: new}）-> [(old, new)]"""
+    if isinstance(data, dict):
+        return [(str(k), str(v or "")) for k, v in data.items()]
+    if isinstance(data, list):
+        return [
+            (str(item["old"]), str(item.get("new") or ""))
+            for item in data
+            if isinstance(item, dict) and "old" in item
+        ]
+    return []
+
+
+class NameMatcher:
+    """在名称映射文件的 old 上建立索引，为未命中的名称推荐映射。"""
+
+    def __init__(self, mapping: Dict[str, str]) -> None:
+        # 只有 new 有值的映射才值得推荐
+        self.mapping = {old: new for old, new in mapping.items() if new}
+        self.index = TrigramIndex(self.mapping)
+
+    @classmethod
+    def from_file(cls, path: Path = FAVORITE_NAME_ORDERED_PATH) -> "NameMatcher":
+        return cls(dict(_mapping_pairs(_read_mapping_file(path))))
+
+    def suggest(self, name: str, limit: int = DEFAULT_SUGGEST_LIMIT, min_score: float = 0.0) -> List[Tuple[str, str, float]]:
+        """返回 [(old, new, 相似度)]"""
+        return [(old, self.mapping[old], score) for old, score in self.index.suggest(name, limit, min_score)]
+
+
+def choose_suggestion(matcher: NameMatcher, name: str, limit: int = DEFAULT_SUGGEST_LIMIT) -> Optional[str]:
+    """
+    交互式选择：列出最接近的映射，返回选中的新名称；直接回车返回 None（使用原名），
+    也可以直接输入一个新名称。
+    """
+    suggestions = matcher.suggest(name, limit)
+    if not suggestions:
+        return None
+    print("  最接近的映射:")
+    for i, (old, new, score) in enumerate(suggestions, 1):
+        print(f"    {i}. {new}  ←  {old}（相似度 {score:.2f}）")
+    answer = input("  选择编号使用对应名称，直接回车使用原名，或输入新名称: ").strip()
+    if not answer:
+        return None
+    if answer.isdigit() and 1 <= int(answer) <= len(suggestions):
+        return suggestions[int(answer) - 1][1]
+    return answer
+
+
+def plan_repairs(
+    current_names: List[str],
+    pairs: List[Tuple[str, str]],
+    min_score: float = DEFAULT_MIN_SCORE,
+) -> List[Tuple[str, str, float]]:
+    """
+    为没有映射的当前名称匹配已经过期的 old（不再出现在当前名称中、且 new 有值）。
+    按相似度从高到低贪心地一一配对。
+    :return: [(过期的 old, 当前名称, 相似度)]
+    """
+    current = set(current_names)
+    mapped = {old for old, new in pairs if new}
+    stale = [old for old, new in pairs if new and old not in current]
+    unmapped = [name for name in current_names if name not in mapped]
+    if not stale or not unmapped:
+        return []
+
+    index = TrigramIndex(stale)
+    candidates: List[Tuple[float, str, str]] = []
+    for name in unmapped:
+        for old, score in index.suggest(name, limit=DEFAULT_SUGGEST_LIMIT, min_score=min_score):
+            candidates.append((score, old, name))
+
+    repairs: List[Tuple[str, str, float]] = []
+    used_old: Set[str] = set()
+    used_name: Set[str] = set()
+    for score, old, name in sorted(candidates, key=lambda item: -item[0]):
+        if old in used_old or name in used_name:
+            continue
+        used_old.add(old)
+        used_name.add(name)
+        repairs.append((old, name, score))
+    return repairs
+
+
+def repair_mapping_file(
+    path: Path = FAVORITE_NAME_ORDERED_PATH,
+    min_score: float = DEFAULT_MIN_SCORE,
+    dry_run: bool = False,
+) -> List[Tuple[str, str, float]]:
+    """把映射文件中过期的 old 改为最接近的当前名称（保留 new 与文件格式）。"""
+    data = _read_mapping_file(path)
+    pairs = _mapping_pairs(data)
+    current_names = FavoriteNameTool(path.parent).collect_names()
+    repairs = plan_repairs(current_names, pairs, min_score)
+
+    for old, name, score in repairs:
+        print(f"{score:.2f}  {old}\n   -> {name}")
+    if not repairs:
+        print("没有可以自动修复的映射")
+        return repairs
+    if dry_run:
+        print(f"\n[试运行] 可修复 {len(repairs)} 条映射")
+        return repairs
+
+    renames = {old: name for old, name, _ in repairs}
+    if isinstance(data, dict):
+        data = {renames.get(old, old): new for old, new in data.items()}
+    else:
+        for item in data:
+            if isinstance(item, dict) and item.get("old") in renames:
+                item["old"] = renames[item["old"]]
+    tmp_path = path.with_name(path.name + ".tmp")
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(data, f, ensure_ascii=False, indent=2)
+    tmp_path.replace(path)
+    print(f"\n已修复 {len(repairs)} 条映射: {path}")
+    return repairs
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="题单名称的模糊匹配与映射修复")
+    parser.add_argument("--mapping", default=str(FAVORITE_NAME_ORDERED_PATH), help="名称映射文件")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    suggest_parser = subparsers.add_parser("suggest", help="为名称推荐最接近的映射")
+    suggest_parser.add_argument("names", nargs="+", help="子题单名称")
+    suggest_parser.add_argument("--limit", type=int, default=DEFAULT_SUGGEST_LIMIT, help="推荐数量")
+
+    repair_parser = subparsers.add_parser("repair", help="批量修复映射文件中过期的 old")
+    repair_parser.add_argument("--min-score", type=float, default=DEFAULT_MIN_SCORE, help="最低相似度")
+    repair_parser.add_argument("--dry-run", action="store_true", help="只显示将要修复的映射")
+
+    args = parser.parse_args(argv)
+    mapping_path = Path(args.mapping)
+
+    if args.command == "suggest":
+        matcher = NameMatcher.from_file(mapping_path)
+        for name in args.names:
+            print(name)
+            for old, new, score in matcher.suggest(name, args.limit):
+                print(f"  {score:.2f}  {new}  ←  {old}")
+    else:
+        repair_mapping_file(mapping_path, args.min_score, args.dry_run)
+
+
+if __name__ == "__main__":
+    main()
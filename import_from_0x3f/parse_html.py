@@ -8,16 +8,26 @@
 - 题单名称为当前有效标题路径的拼接，如 “h2 / h3 / h4”。
 
 用法:
-    python parse_html.py discuss_html/sliding_window.html [-o out.json]
+    python parse_html.py discuss_html/sliding_window.html [-o out.json] [--backend stream]
+    python parse_html.py discuss_html "other/*.html" -d out_json [--catalog catalog.json] [--workers 4] [--force]
+
+批量模式（多个输入、目录或通配符）下每个 HTML 输出一个同名 JSON 到 -d 目录，
+可选地再输出一个合并的目录文件。内容哈希记录在 <输出目录>/.parse_cache.json 中，
+未变化的文件直接跳过。
 """
 
 import argparse
+import glob
+import hashlib
 import json
 import os
 import re
-from typing import Any, Dict, List, Optional
+from concurrent.futures import ProcessPoolExecutor
+from html.parser import HTMLParser
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple, Union
 
 from bs4 import BeautifulSoup
+from bs4.dammit import EntitySubstitution
 
 _PROBLEM_SLUG_RE = re.compile(r"/problems/([^/?#]+)/?")
 
@@ -27,6 +37,30 @@ def _clean_text(text: str) -> str:
     return re.sub(r"\s+", " ", text or "").strip()
 
 
+def _decode_charref(name: str) -> str:
+    """
+    把数字字符引用（不含 &# 与分号）解码为字符。
+
+    0x80-0x9F 按 windows-1252 解释（网页里常见的写法），0、代理区和超出范围的码位替换为 U+FFFD，
+    与 BeautifulSoup 的处理保持一致。
+    :param name: html.parser 传入的引用名，如 "39" 或 "x27"
+    :return: 解码后的字符
+    """
+    try:
+        code = int(name[1:], 16) if name[:1] in ("x", "X") else int(name)
+    except ValueError:
+        return "\ufffd"
+    if 0x80 <= code <= 0x9F:
+        try:
+            return bytes([code]).decode("windows-1252")
+        except UnicodeDecodeError:
+            # windows-1252 未定义的 0x81、0x8D 等保留原码位
+            return chr(code)
+    if code == 0 or 0xD800 <= code <= 0xDFFF or code > 0x10FFFF:
+        return "\ufffd"
+    return chr(code)
+
+
 def _extract_slug(href: str) -> Optional[str]:
     match = _PROBLEM_SLUG_RE.search(href or "")
     return match.group(1) if match else None
@@ -58,48 +92,85 @@ def _collect_problems_from_ul(ul_tag) -> List[Dict[str, str]]:
     return problems
 
 
-def parse_html_content(html_content: str) -> List[Dict[str, Any]]:
-    """
-    解析 HTML 字符串，返回题单列表。
-    每个元素形如 {"name": "...", "count": n, "problems_title_slugs": "...", "problems": [{title, titleSlug, url}, ...]}。
-    """
-    soup = BeautifulSoup(html_content, "html.parser")
-    body = soup.find("body")
-    if not body:
-        return []
+class _HeadingGrouper:
+    """标题栈状态机：按 h2/h3/h4 路径把随后出现的题目合并为题单。"""
 
-    # 当前标题栈
-    headings: Dict[int, Optional[str]] = {2: None, 3: None, 4: None}
-    current_level: Optional[int] = None  # 当前最深层级（2/3/4）
-    pending_problems: List[Dict[str, str]] = []
-    result: List[Dict[str, Any]] = []
+    def __init__(self) -> None:
+        # 当前标题栈
+        self.headings: Dict[int, Optional[str]] = {2: None, 3: None, 4: None}
+        self.current_level: Optional[int] = None  # 当前最深层级（2/3/4）
+        self.pending_problems: List[Dict[str, str]] = []
+        self.result: List[Dict[str, Any]] = []
 
-    def finalize_current_group() -> None:
+    def _finalize_current_group(self) -> None:
         """输出当前累积的题单。"""
-        nonlocal pending_problems
-        if not pending_problems:
+        if not self.pending_problems:
             return
 
         name_parts: List[str] = []
         # 按层级拼接已有标题
         for level in (2, 3, 4):
-            if (current_level or 0) >= level and headings.get(level):
-                name_parts.append(headings[level])  # type: ignore[arg-type]
+            if (self.current_level or 0) >= level and self.headings.get(level):
+                name_parts.append(self.headings[level])  # type: ignore[arg-type]
 
         group_name = " / ".join(name_parts) if name_parts else "未命名题单"
 
-        slugs = [p.get("titleSlug", "").strip() for p in pending_problems if p.get("titleSlug")]
+        slugs = [p.get("titleSlug", "").strip() for p in self.pending_problems if p.get("titleSlug")]
         slugs_joined = " ".join(slugs)
 
-        result.append(
+        self.result.append(
             {
                 "name": group_name,
-                "count": len(pending_problems),
+                "count": len(self.pending_problems),
                 "problems_title_slugs": slugs_joined,
-                "problems": pending_problems,
+                "problems": self.pending_problems,
             }
         )
-        pending_problems = []
+        self.pending_problems = []
+
+    def heading(self, level: int, text: str) -> None:
+        self._finalize_current_group()
+        if level == 2:
+            self.headings[2] = text
+            self.headings[3] = None
+            self.headings[4] = None
+        elif level == 3:
+            self.headings[3] = text
+            self.headings[4] = None
+        else:  # h4
+            self.headings[4] = text
+        self.current_level = level
+
+    def problems(self, problems: List[Dict[str, str]]) -> None:
+        if not problems:
+            return
+        # 若尚未遇到任何标题，则默认归入二级标题层级
+        if self.current_level is None:
+            self.current_level = 2
+        self.pending_problems.extend(problems)
+
+    def finish(self) -> List[Dict[str, Any]]:
+        self._finalize_current_group()
+        return self.result
+
+
+def parse_html_content(html_content: str, backend: str = "bs4") -> List[Dict[str, Any]]:
+    """
+    解析 HTML 字符串，返回题单列表。
+    每个元素形如 {"name": "...", "count": n, "problems_title_slugs": "...", "problems": [{title, titleSlug, url}, ...]}。
+    :param backend: "bs4"（构建完整 DOM）或 "stream"（流式解析，不建树），两者输出一致
+    """
+    if backend == "stream":
+        return parse_html_stream([html_content])
+    if backend != "bs4":
+        raise ValueError(f"未知的解析后端: {backend}（可选: {', '.join(PARSER_BACKENDS)}）")
+
+    soup = BeautifulSoup(html_content, "html.parser")
+    body = soup.find("body")
+    if not body:
+        return []
+
+    grouper = _HeadingGrouper()
 
     # 顺序遍历 body 直接子元素，保持文档流顺序
     for elem in body.children:
@@ -108,55 +179,619 @@ def parse_html_content(html_content: str) -> List[Dict[str, Any]]:
             continue
 
         if tag_name in ("h2", "h3", "h4"):
-            finalize_current_group()
-            text = _clean_text(elem.get_text())
-            if tag_name == "h2":
-                headings[2] = text
-                headings[3] = None
-                headings[4] = None
-                current_level = 2
-            elif tag_name == "h3":
-                headings[3] = text
-                headings[4] = None
-                current_level = 3
-            else:  # h4
-                headings[4] = text
-                current_level = 4
+            grouper.heading(int(tag_name[1]), _clean_text(elem.get_text()))
             continue
 
         if tag_name == "ul":
-            problems = _collect_problems_from_ul(elem)
-            if not problems:
+            grouper.problems(_collect_problems_from_ul(elem))
+
+    return grouper.finish()
+
+
+# ---------------------------------------------------------------------------
+# 流式解析后端：基于 html.parser.HTMLParser 的事件驱动状态机
+#
+# 不构建 DOM，只维护当前打开标签的名称栈，并在事件中运行与 parse_html_content
+# 相同的标题栈状态机。为保证与 BeautifulSoup(html.parser) 的结果逐字节一致，
+# 这里复刻了它的建树规则：
+# - 结束标签弹出到最近的同名标签为止，没有同名打开标签时忽略
+# - 空元素（br、img 等）和 <x/> 立即关闭
+# - get_text 不包含注释，也不包含 script/style/template/rt/rp 内的文本
+# - 字符引用与实体的解码方式相同
+# ---------------------------------------------------------------------------
+
+PARSER_BACKENDS = ("bs4", "stream")
+
+_STREAM_CHUNK_SIZE = 64 * 1024
+
+# BeautifulSoup 会把这些标签内的文本放入特殊字符串类型，get_text 时不包含
+_NON_TEXT_CONTAINER_TAGS = frozenset(["script", "style", "template", "rt", "rp"])
+
+_VOID_TAGS = frozenset(
+    [
+        "area", "base", "br", "col", "embed", "hr", "img", "input", "keygen", "link",
+        "menuitem", "meta", "param", "source", "track", "wbr",
+        "basefont", "bgsound", "command", "frame", "image", "isindex", "nextid", "spacer",
+    ]
+)
+
+
+class _StreamingGroupParser(HTMLParser):
+    def __init__(self) -> None:
+        super().__init__(convert_charrefs=False)
+        self.grouper = _HeadingGrouper()
+        self.stack: List[str] = []
+        self._non_text_depth = 0  # 打开的 script/style/... 数量
+        self._body_depth: Optional[int] = None  # body 在栈中的位置
+        self._body_done = False
+
+        # body 的直接子元素 h2/h3/h4
+        self._heading_level: Optional[int] = None
+        self._heading_text: List[str] = []
+
+        # body 的直接子元素 ul，及其直接子元素 li
+        self._ul_problems: Optional[List[Dict[str, str]]] = None
+        self._li_depth: Optional[int] = None
+        self._li_link_href: Optional[str] = None
+        self._link_depth: Optional[int] = None
+        self._link_text: List[str] = []
+
+    # -- 建树规则 --------------------------------------------------------
+
+    def _push(self, tag: str, attrs: List[Tuple[str, Optional[str]]]) -> None:
+        depth = len(self.stack)
+        self.stack.append(tag)
+        if tag in _NON_TEXT_CONTAINER_TAGS:
+            self._non_text_depth += 1
+
+        if self._body_done:
+            return
+        if self._body_depth is None:
+            if tag == "body":
+                self._body_depth = depth
+            return
+
+        if depth == self._body_depth + 1:
+            # body 的直接子元素
+            if tag in ("h2", "h3", "h4"):
+                self._heading_level = int(tag[1])
+                self._heading_text = []
+            elif tag == "ul":
+                self._ul_problems = []
+        elif self._ul_problems is not None:
+            if depth == self._body_depth + 2 and tag == "li":
+                self._li_depth = depth
+                self._li_link_href = None
+            elif (
+                self._li_depth is not None
+                and tag == "a"
+                and self._li_link_href is None
+            ):
+                # li.find("a", href=True)：文档顺序中第一个带 href 的 a（空值也算）
+                href = None
+                for key, value in attrs:
+                    if key == "href":
+                        href = value if value is not None else ""
+                if href is not None:
+                    self._li_link_href = href
+                    self._link_depth = depth
+                    self._link_text = []
+
+    def _pop(self) -> None:
+        depth = len(self.stack) - 1
+        tag = self.stack.pop()
+        if tag in _NON_TEXT_CONTAINER_TAGS:
+            self._non_text_depth -= 1
+
+        if self._body_depth is None or self._body_done:
+            return
+        if depth == self._body_depth:
+            self._body_done = True
+        elif depth == self._link_depth:
+            self._link_depth = None
+        elif depth == self._li_depth:
+            self._finish_li()
+        elif depth == self._body_depth + 1:
+            if self._heading_level is not None:
+                self.grouper.heading(self._heading_level, _clean_text("".join(self._heading_text)))
+                self._heading_level = None
+            elif self._ul_problems is not None:
+                self.grouper.problems(self._ul_problems)
+                self._ul_problems = None
+
+    def _finish_li(self) -> None:
+        self._li_depth = None
+        href = self._li_link_href
+        self._li_link_href = None
+        if href is None:
+            return
+        href = href.strip()
+        if "problems" not in href:
+            return
+        title = _clean_text("".join(self._link_text))
+        slug = _extract_slug(href) or ""
+        if not title and not slug:
+            return
+        self._ul_problems.append({"title": title or slug, "titleSlug": slug, "url": href})
+
+    def _text(self, data: str) -> None:
+        if self._non_text_depth or not data:
+            return
+        if self._heading_level is not None:
+            self._heading_text.append(data)
+        if self._link_depth is not None:
+            self._link_text.append(data)
+
+    # -- HTMLParser 事件 -------------------------------------------------
+
+    def handle_starttag(self, tag: str, attrs: List[Tuple[str, Optional[str]]]) -> None:
+        self._push(tag, attrs)
+        if tag in _VOID_TAGS:
+            self._pop()
+
+    def handle_startendtag(self, tag: str, attrs: List[Tuple[str, Optional[str]]]) -> None:
+        self._push(tag, attrs)
+        self._pop()
+
+    def handle_endtag(self, tag: str) -> None:
+        if tag in _VOID_TAGS:
+            # 空元素在开始标签处已关闭
+            return
+        for i in range(len(self.stack) - 1, -1, -1):
+            if self.stack[i] == tag:
+                while len(self.stack) > i:
+                    self._pop()
+                return
+
+    def handle_data(self, data: str) -> None:
+        self._text(data)
+
+    def handle_entityref(self, name: str) -> None:
+        character = EntitySubstitution.HTML_ENTITY_TO_CHARACTER.get(name)
+        self._text(character if character is not None else f"&{name}")
+
+    def handle_charref(self, name: str) -> None:
+        self._text(_decode_charref(name))
+
+    def unknown_decl(self, data: str) -> None:
+        # CDATA 计入文本，其它声明不计入
+        if data.upper().startswith("CDATA["):
+            self._text(data[len("CDATA["):])
+
+    def finish(self) -> List[Dict[str, Any]]:
+        self.close()
+        while self.stack:
+            self._pop()
+        return self.grouper.finish()
+
+
+def parse_html_stream(chunks: Iterable[str]) -> List[Dict[str, Any]]:
+    """流式解析：逐块喂入 HTML 文本，不构建 DOM。输出与 bs4 后端一致。"""
+    parser = _StreamingGroupParser()
+    for chunk in chunks:
+        parser.feed(chunk)
+    return parser.finish()
+
+
+def _iter_file_chunks(html_path: str) -> Iterator[str]:
+    with open(html_path, "r", encoding="utf-8") as f:
+        while True:
+            chunk = f.read(_STREAM_CHUNK_SIZE)
+            if not chunk:
+                break
+            yield chunk
+
+
+# ---------------------------------------------------------------------------
+# 单遍提取：原始讨论页 HTML -> 题单 JSON
+#
+# 原流程需要三次完整的 DOM 构建：解析原始页面、把保留的元素克隆进新文档并
+# prettify、再用 parse_html_content 重新解析精简 HTML。这里只解析一次原始页面，
+# 把保留的元素记录为轻量节点，直接在节点上分组；精简 HTML 只在需要时由节点渲染，
+# 输出与 prettify 结果逐字节一致。
+# ---------------------------------------------------------------------------
+
+_SIMPLIFIED_ALLOWED_TAGS = frozenset(["h1", "h2", "h3", "h4", "ul", "ol", "li", "a", "p"])
+_SIMPLIFIED_ROOT_TAGS = frozenset(["h1", "h2", "h3", "h4", "ul", "ol"])
+_CONTENT_AREA_RE = re.compile(r"break-words", re.I)
+_FALLBACK_CONTENT_AREA_RE = re.compile(r"content|article|post|topic", re.I)
+
+
+class SimplifiedNode:
+    """精简 HTML 中的一个元素：标签名、href（仅 a）和子节点（SimplifiedNode 或文本）。"""
+
+    __slots__ = ("name", "href", "children")
+
+    def __init__(self, name: str, href: Optional[str] = None) -> None:
+        self.name = name
+        self.href = href
+        self.children: List[Union["SimplifiedNode", str]] = []
+
+    def iter_strings(self) -> Iterator[str]:
+        for child in self.children:
+            if isinstance(child, str):
+                if child:
+                    yield child
+            else:
+                yield from child.iter_strings()
+
+    def text(self) -> str:
+        """与 prettify 后重新解析再 _clean_text 得到的文本一致。"""
+        return _clean_text(" ".join(self.iter_strings()))
+
+    def find_link(self) -> Optional["SimplifiedNode"]:
+        """按文档顺序查找第一个带 href 的 a。"""
+        for child in self.children:
+            if isinstance(child, str):
+                continue
+            if child.name == "a" and child.href is not None:
+                return child
+            found = child.find_link()
+            if found is not None:
+                return found
+        return None
+
+
+def _find_content_area(soup):
+    # 优先查找 'break-words' (常见于动态渲染的 LeetCode 讨论页)
+    content_area = soup.find("div", class_=_CONTENT_AREA_RE)
+    if not content_area:
+        content_area = soup.find("div", class_=_FALLBACK_CONTENT_AREA_RE)
+    if not content_area:
+        content_area = soup
+    return content_area
+
+
+def _simplify_element(element, roots: List[Optional[SimplifiedNode]]) -> Tuple[Optional[SimplifiedNode], bool]:
+    """
+    递归保留允许的标签; li 里只保留 a，且只保留包含题目链接的 li。
+    每个节点只访问一次：子树中是否有题目链接随递归一并返回，不再对每个 li 重新 find_all("a")；
+    子树中的标题和列表（h1~h4/ul/ol）不嵌入父节点，而是按文档顺序作为顶层节点追加到 roots，
+    因此嵌套列表不会既出现在父列表里又单独出现一次。
+    :return: (精简节点，没有文本时为 None；子树中是否包含题目链接)
+    """
+    name = element.name
+    has_problem_link = False
+    node = None
+    if name in _SIMPLIFIED_ALLOWED_TAGS:
+        href = element.get("href") if name == "a" else None
+        has_problem_link = bool(href) and "problems" in href
+        node = SimplifiedNode(name, href or None)
+    has_text = False
+
+    for child in element.children:
+        child_name = getattr(child, "name", None)
+        if child_name:
+            if child_name in _SIMPLIFIED_ROOT_TAGS:
+                # 先占位再递归，保证外层节点排在其内部节点之前
+                index = len(roots)
+                roots.append(None)
+                roots[index], child_has_link = _simplify_element(child, roots)
+                has_problem_link |= child_has_link
                 continue
+            sub, child_has_link = _simplify_element(child, roots)
+            has_problem_link |= child_has_link
+            if node is not None and sub is not None and (name != "li" or child_name == "a"):
+                # li 里只保留 a 标签；保留下来的子节点必然有文本
+                node.children.append(sub)
+                has_text = True
+        elif node is not None and child.string and name != "li":
+            # li 里不保留纯文本
+            text = child.string.strip()
+            node.children.append(text)
+            has_text = has_text or bool(text)
+
+    if node is None or not has_text or (name == "li" and not has_problem_link):
+        return None, has_problem_link
+    return node, has_problem_link
+
+
+def simplify_raw_html(html_content: str) -> List[SimplifiedNode]:
+    """解析原始讨论页（唯一一次 DOM 构建），返回精简后的顶层节点列表。"""
+    soup = BeautifulSoup(html_content, "html.parser")
+    roots: List[Optional[SimplifiedNode]] = []
+    _simplify_element(_find_content_area(soup), roots)
+    return [node for node in roots if node is not None]
+
+
+def _escape_text(text: str) -> str:
+    return text.replace("&", "&amp;").replace("<", "&lt;").replace(">", "&gt;")
 
-            # 若尚未遇到任何标题，则默认归入二级标题层级
-            if current_level is None:
-                current_level = 2
-            pending_problems.extend(problems)
 
-    finalize_current_group()
-    return result
+def _escape_attr(value: str) -> str:
+    value = _escape_text(value)
+    if '"' not in value:
+        return f'"{value}"'
+    if "'" not in value:
+        return f"'{value}'"
+    return '"' + value.replace('"', "&quot;") + '"'
 
 
-def parse_html_file(html_path: str) -> List[Dict[str, Any]]:
+def _render_node(node: SimplifiedNode, depth: int, out: List[str]) -> None:
+    indent = " " * depth
+    attrs = f" href={_escape_attr(node.href)}" if node.href is not None else ""
+    out.append(f"{indent}<{node.name}{attrs}>\n")
+    for child in node.children:
+        if isinstance(child, str):
+            if child:
+                out.append(f"{indent} {_escape_text(child)}\n")
+        else:
+            _render_node(child, depth + 1, out)
+    out.append(f"{indent}</{node.name}>\n")
+
+
+def render_simplified_html(nodes: List[SimplifiedNode]) -> str:
+    """渲染精简 HTML，格式与 BeautifulSoup.prettify() 一致。"""
+    out = ["<html>\n", " <head>\n", '  <meta charset="utf-8"/>\n', " </head>\n", " <body>\n"]
+    for node in nodes:
+        _render_node(node, 2, out)
+    out.extend([" </body>\n", "</html>\n"])
+    return "".join(out)
+
+
+def _collect_problems_from_node(ul_node: SimplifiedNode) -> List[Dict[str, str]]:
+    """与 _collect_problems_from_ul 相同的规则，作用于精简节点。"""
+    problems: List[Dict[str, str]] = []
+    for li in ul_node.children:
+        if isinstance(li, str) or li.name != "li":
+            continue
+        link = li.find_link()
+        if link is None:
+            continue
+        href = link.href.strip()
+        if "problems" not in href:
+            continue
+
+        title = link.text()
+        slug = _extract_slug(href) or ""
+        if not title and not slug:
+            continue
+
+        problems.append(
+            {
+                "title": title or slug,
+                "titleSlug": slug,
+                "url": href,
+            }
+        )
+    return problems
+
+
+def parse_simplified_nodes(nodes: List[SimplifiedNode]) -> List[Dict[str, Any]]:
+    """在精简节点上分组，结果与 parse_html_content(render_simplified_html(nodes)) 相同。"""
+    grouper = _HeadingGrouper()
+    for node in nodes:
+        if node.name in ("h2", "h3", "h4"):
+            grouper.heading(int(node.name[1]), node.text())
+        elif node.name == "ul":
+            grouper.problems(_collect_problems_from_node(node))
+    return grouper.finish()
+
+
+class SimplifiedPage:
+    """单遍提取的结果：groups 为题单 JSON，simplified_html() 按需渲染精简 HTML。"""
+
+    def __init__(self, nodes: List[SimplifiedNode]) -> None:
+        self.nodes = nodes
+        self._groups: Optional[List[Dict[str, Any]]] = None
+
+    @property
+    def groups(self) -> List[Dict[str, Any]]:
+        if self._groups is None:
+            self._groups = parse_simplified_nodes(self.nodes)
+        return self._groups
+
+    def simplified_html(self) -> str:
+        return render_simplified_html(self.nodes)
+
+
+def extract_page(html_content: str) -> SimplifiedPage:
+    """原始讨论页 HTML -> SimplifiedPage（只构建一次 DOM）。"""
+    return SimplifiedPage(simplify_raw_html(html_content))
+
+
+def parse_html_file(html_path: str, backend: str = "bs4") -> List[Dict[str, Any]]:
+    if backend == "stream":
+        return parse_html_stream(_iter_file_chunks(html_path))
     with open(html_path, "r", encoding="utf-8") as f:
-        return parse_html_content(f.read())
+        return parse_html_content(f.read(), backend=backend)
+
+
+# ---------------------------------------------------------------------------
+# 批量模式
+# ---------------------------------------------------------------------------
+
+BATCH_CACHE_FILENAME = ".parse_cache.json"
+
+# 解析规则变化时递增，使旧缓存失效
+_BATCH_CACHE_VERSION = 1
+
+
+def expand_html_inputs(inputs: List[str]) -> List[str]:
+    """把文件、目录（其中的 *.html）和通配符展开为去重后的 HTML 文件列表，保持输入顺序。"""
+    paths: List[str] = []
+    seen = set()
+    for item in inputs:
+        if os.path.isdir(item):
+            matches = sorted(glob.glob(os.path.join(item, "*.html")))
+        elif glob.has_magic(item):
+            matches = sorted(p for p in glob.glob(item, recursive=True) if os.path.isfile(p))
+        elif os.path.isfile(item):
+            matches = [item]
+        else:
+            print(f"文件不存在: {item}")
+            continue
+        for path in matches:
+            key = os.path.abspath(path)
+            if key not in seen:
+                seen.add(key)
+                paths.append(path)
+    return paths
+
+
+def _file_sha1(path: str) -> str:
+    with open(path, "rb") as f:
+        return hashlib.sha1(f.read()).hexdigest()
+
+
+def _load_batch_cache(cache_path: str) -> Dict[str, Dict[str, str]]:
+    try:
+        with open(cache_path, "r", encoding="utf-8") as f:
+            cache = json.load(f)
+    except (OSError, json.JSONDecodeError):
+        return {}
+    if not isinstance(cache, dict) or cache.get("version") != _BATCH_CACHE_VERSION:
+        return {}
+    files = cache.get("files")
+    return files if isinstance(files, dict) else {}
+
+
+def _save_batch_cache(cache_path: str, files: Dict[str, Dict[str, str]]) -> None:
+    with open(cache_path, "w", encoding="utf-8") as f:
+        json.dump({"version": _BATCH_CACHE_VERSION, "files": files}, f, ensure_ascii=False, indent=2)
+
+
+def _write_json(path: str, data: Any) -> None:
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(json.dumps(data, ensure_ascii=False, indent=2))
+
+
+def parse_html_batch(
+    html_paths: List[str],
+    out_dir: str,
+    backend: str = "bs4",
+    workers: Optional[int] = None,
+    catalog_path: Optional[str] = None,
+    force: bool = False,
+) -> Dict[str, int]:
+    """
+    批量解析 HTML 文件，每个文件输出 <out_dir>/<文件名>.json。
+    内容哈希与后端都未变化且输出文件仍存在时跳过该文件。
+    :param workers: 解析进程数，默认为 CPU 核数；<=1 时在当前进程解析
+    :param catalog_path: 可选的合并目录文件，包含所有题单，每个题单带 source（来源文件名）
+    :param force: 忽略缓存，全部重新解析
+    :return: {"parsed": n, "skipped": n, "failed": n}
+    """
+    os.makedirs(out_dir, exist_ok=True)
+    cache_path = os.path.join(out_dir, BATCH_CACHE_FILENAME)
+    cache = {} if force else _load_batch_cache(cache_path)
+
+    # 输出文件名 -> 输入路径；同名文件只处理第一个
+    jobs: Dict[str, str] = {}
+    for path in html_paths:
+        stem = os.path.splitext(os.path.basename(path))[0]
+        if stem in jobs:
+            print(f"跳过同名文件: {path}（与 {jobs[stem]} 输出到同一个 JSON）")
+            continue
+        jobs[stem] = path
+
+    new_cache: Dict[str, Dict[str, str]] = {}
+    todo: Dict[str, str] = {}
+    skipped = failed = 0
+    for stem, path in jobs.items():
+        output_path = os.path.join(out_dir, f"{stem}.json")
+        try:
+            digest = _file_sha1(path)
+        except OSError as e:
+            print(f"读取失败: {path}: {e}")
+            failed += 1
+            continue
+        entry = {"sha1": digest, "backend": backend}
+        new_cache[stem] = entry
+        if cache.get(stem) == entry and os.path.exists(output_path):
+            skipped += 1
+        else:
+            todo[stem] = path
+
+    if workers is None:
+        workers = os.cpu_count() or 1
+    results: Dict[str, List[Dict[str, Any]]] = {}
+    if todo:
+        if workers > 1 and len(todo) > 1:
+            with ProcessPoolExecutor(max_workers=min(workers, len(todo))) as executor:
+                futures = {stem: executor.submit(parse_html_file, path, backend) for stem, path in todo.items()}
+                for stem, future in futures.items():
+                    try:
+                        results[stem] = future.result()
+                    except Exception as e:
+                        print(f"解析失败: {todo[stem]}: {e}")
+        else:
+            for stem, path in todo.items():
+                try:
+                    results[stem] = parse_html_file(path, backend)
+                except Exception as e:
+                    print(f"解析失败: {path}: {e}")
+
+    for stem, path in todo.items():
+        if stem not in results:
+            failed += 1
+            new_cache.pop(stem, None)
+            continue
+        _write_json(os.path.join(out_dir, f"{stem}.json"), results[stem])
+        print(f"{path} -> {os.path.join(out_dir, stem + '.json')}（{len(results[stem])} 个题单）")
+
+    _save_batch_cache(cache_path, new_cache)
+
+    if catalog_path:
+        catalog: List[Dict[str, Any]] = []
+        for stem in jobs:
+            if stem not in new_cache:
+                continue
+            data = results.get(stem)
+            if data is None:
+                with open(os.path.join(out_dir, f"{stem}.json"), "r", encoding="utf-8") as f:
+                    data = json.load(f)
+            catalog.extend({"source": stem, **group} for group in data)
+        _write_json(catalog_path, catalog)
+        print(f"合并目录已保存到: {catalog_path}（{len(catalog)} 个题单）")
+
+    print(f"完成: 解析 {len(results)} 个，跳过未变化 {skipped} 个，失败 {failed} 个")
+    return {"parsed": len(results), "skipped": skipped, "failed": failed}
 
 
 def main() -> None:
     parser = argparse.ArgumentParser(description="解析 LeetCode 讨论页 HTML 为题单 JSON")
-    parser.add_argument("html", help="HTML 文件路径，例如 discuss_html/sliding_window.html")
+    parser.add_argument(
+        "html",
+        nargs="+",
+        help="HTML 文件、目录或通配符，例如 discuss_html/sliding_window.html、discuss_html、\"discuss_html/*.html\"",
+    )
     parser.add_argument(
         "-o",
         "--output",
-        help="输出 JSON 文件路径（默认打印到 stdout）",
+        help="单文件模式：输出 JSON 文件路径（默认打印到 stdout）",
+    )
+    parser.add_argument("-d", "--out-dir", help="批量模式：输出目录，每个 HTML 对应一个同名 JSON")
+    parser.add_argument("--catalog", help="批量模式：额外输出包含所有题单的合并 JSON")
+    parser.add_argument("--workers", type=int, help="批量模式：解析进程数（默认 CPU 核数）")
+    parser.add_argument("--force", action="store_true", help="批量模式：忽略内容哈希缓存，全部重新解析")
+    parser.add_argument(
+        "--backend",
+        choices=PARSER_BACKENDS,
+        default="bs4",
+        help="解析后端：bs4（默认）或 stream（流式解析，不构建 DOM）",
     )
     args = parser.parse_args()
 
-    if not os.path.exists(args.html):
-        raise SystemExit(f"文件不存在: {args.html}")
+    single_file = len(args.html) == 1 and os.path.isfile(args.html[0])
+    if not single_file or args.out_dir or args.catalog:
+        html_paths = expand_html_inputs(args.html)
+        if not html_paths:
+            raise SystemExit(f"未找到 HTML 文件: {' '.join(args.html)}")
+        if not args.out_dir:
+            raise SystemExit("批量模式需要通过 -d/--out-dir 指定输出目录")
+        stats = parse_html_batch(
+            html_paths,
+            args.out_dir,
+            backend=args.backend,
+            workers=args.workers,
+            catalog_path=args.catalog,
+            force=args.force,
+        )
+        raise SystemExit(1 if stats["failed"] else 0)
 
-    data = parse_html_file(args.html)
+    html_path = args.html[0]
+    data = parse_html_file(html_path, backend=args.backend)
     json_str = json.dumps(data, ensure_ascii=False, indent=2)
 
     if args.output:
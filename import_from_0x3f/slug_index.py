@@ -0,0 +1,228 @@
+"""
+题目 slug 的跨分类索引：titleSlug -> [(分类, 子题单名称, 位置), ...]
+
+一次遍历 discuss_json 下的所有分类（或 parse_html.py --catalog 生成的合并目录）建立索引，
+之后查询重复题目、去重后的题目总数、子题单之间的重叠都不需要再扫描 JSON。
+
+用法:
+    python slug_index.py stats                 # 条目总数、去重题目数、重复题目数
+    python slug_index.py show two-sum          # 某个 slug 出现在哪些子题单
+    python slug_index.py dupes [--top 20]      # 出现次数最多的题目
+    python slug_index.py overlap 滑动窗口       # 名称包含关键字的子题单与其它子题单的重叠
+    python slug_index.py --catalog catalog.json stats
+"""
+
+import argparse
+import json
+import os
+from collections import Counter
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+BASE_DIR = Path(__file__).resolve().parent
+LOCAL_JSON_DIR = BASE_DIR / "discuss_json"
+
+
+def _iter_json_files(json_dir: Path) -> List[Path]:
+    # 跳过指纹、缓存等隐藏文件
+    return sorted(p for p in json_dir.glob("*.json") if not p.name.startswith("."))
+
+
+class SlugOccurrence(NamedTuple):
+    category: str  # 分类（JSON 文件名，不含扩展名）
+    group: str  # 子题单名称
+    position: int  # 在子题单中的位置（从 1 开始）
+
+
+class SlugIndex:
+    def __init__(self) -> None:
+        self.occurrences: Dict[str, List[SlugOccurrence]] = {}
+        # (分类, 子题单名称) -> 按顺序的 slug（同一子题单内重复的 slug 只记一次）
+        self.groups: Dict[Tuple[str, str], List[str]] = {}
+        self.total_entries = 0
+
+    def add_group(self, category: str, group: Dict[str, Any]) -> None:
+        name = group.get("name", "")
+        slugs = self.groups.setdefault((category, name), [])
+        seen = set(slugs)
+        for position, problem in enumerate(group.get("problems", []), 1):
+            slug = problem.get("titleSlug")
+            if not slug:
+                continue
+            self.total_entries += 1
+            self.occurrences.setdefault(slug, []).append(SlugOccurrence(category, name, position))
+            if slug not in seen:
+                seen.add(slug)
+                slugs.append(slug)
+
+    @classmethod
+    def build(cls, categories: Iterable[Tuple[str, List[Dict[str, Any]]]]) -> "SlugIndex":
+        """从 (分类, 子题单列表) 序列一次遍历建立索引。"""
+        index = cls()
+        for category, groups in categories:
+            for group in groups:
+                index.add_group(category, group)
+        return index
+
+    @classmethod
+    def from_json_dir(cls, json_dir: Path = LOCAL_JSON_DIR) -> "SlugIndex":
+        def iter_categories():
+            for path in _iter_json_files(json_dir):
+                with open(path, "r", encoding="utf-8") as f:
+                    yield path.stem, json.load(f)
+
+        return cls.build(iter_categories())
+
+    @classmethod
+    def from_catalog(cls, catalog_path: Path) -> "SlugIndex":
+        """从 parse_html.py --catalog 生成的合并目录建立索引（分类取每个题单的 source）。"""
+        with open(catalog_path, "r", encoding="utf-8") as f:
+            catalog = json.load(f)
+        return cls.build((group.get("source", ""), [group]) for group in catalog)
+
+    @property
+    def unique_count(self) -> int:
+        return len(self.occurrences)
+
+    def lookup(self, slug: str) -> List[SlugOccurrence]:
+        return self.occurrences.get(slug, [])
+
+    def duplicates(self) -> Dict[str, List[SlugOccurrence]]:
+        """出现在多个位置的题目，按出现次数从多到少排列。"""
+        dupes = {slug: occ for slug, occ in self.occurrences.items() if len(occ) > 1}
+        return dict(sorted(dupes.items(), key=lambda item: -len(item[1])))
+
+    def group_overlap(self, key: Tuple[str, str]) -> Dict[Tuple[str, str], int]:
+        """与指定子题单 (分类, 名称) 共享题目的其它子题单 -> 共享题目数，按数量从多到少排列。"""
+        counter: Counter = Counter()
+        for slug in self.groups.get(key, []):
+            counter.update({(occ.category, occ.group) for occ in self.occurrences[slug]} - {key})
+        return dict(counter.most_common())
+
+    def shared_count(self, key: Tuple[str, str]) -> int:
+        """子题单中同时出现在其它子题单里的题目数。"""
+        return sum(
+            1
+            for slug in self.groups.get(key, [])
+            if any((occ.category, occ.group) != key for occ in self.occurrences[slug])
+        )
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "categories": len({category for category, _ in self.groups}),
+            "groups": len(self.groups),
+            "entries": self.total_entries,
+            "unique": self.unique_count,
+            "duplicated": sum(1 for occ in self.occurrences.values() if len(occ) > 1),
+        }
+
+
+_INDEX_CACHE: Dict[str, Tuple[Tuple[Tuple[str, float, int], ...], SlugIndex]] = {}
+
+
+def load_slug_index(json_dir: Path = LOCAL_JSON_DIR) -> SlugIndex:
+    """
+    获取 discuss_json 的索引；同一进程内 JSON 文件未变化（mtime/大小）时复用已建立的索引。
+    """
+    signature = tuple(
+        (path.name, path.stat().st_mtime, path.stat().st_size) for path in _iter_json_files(json_dir)
+    )
+    key = os.path.abspath(json_dir)
+    cached = _INDEX_CACHE.get(key)
+    if cached and cached[0] == signature:
+        return cached[1]
+    index = SlugIndex.from_json_dir(json_dir)
+    _INDEX_CACHE[key] = (signature, index)
+    return index
+
+
+def print_stats(index: SlugIndex) -> None:
+    stats = index.stats()
+    print(
+        f"{stats['categories']} 个分类，{stats['groups']} 个子题单，共 {stats['entries']} 个题目条目，"
+        f"去重后 {stats['unique']} 道题，其中 {stats['duplicated']} 道出现在多个位置"
+    )
+
+
+def _format_occurrence(occ: SlugOccurrence) -> str:
+    return f"{occ.group} #{occ.position}（{occ.category}）"
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="题目 slug 的跨分类索引")
+    parser.add_argument("--catalog", help="使用 parse_html.py --catalog 生成的合并目录（默认读取 discuss_json）")
+    parser.add_argument("--json", action="store_true", help="以 JSON 格式输出")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    subparsers.add_parser("stats", help="条目总数、去重题目数、重复题目数")
+    show_parser = subparsers.add_parser("show", help="显示 slug 出现的位置")
+    show_parser.add_argument("slugs", nargs="+", help="题目 slug")
+    dupes_parser = subparsers.add_parser("dupes", help="出现在多个位置的题目")
+    dupes_parser.add_argument("--top", type=int, default=20, help="显示前 N 个（<=0 显示全部）")
+    overlap_parser = subparsers.add_parser("overlap", help="子题单与其它子题单的重叠")
+    overlap_parser.add_argument("keyword", help="子题单名称关键字")
+    overlap_parser.add_argument("--top", type=int, default=10, help="每个子题单显示前 N 个重叠子题单")
+
+    args = parser.parse_args(argv)
+    index = SlugIndex.from_catalog(Path(args.catalog)) if args.catalog else load_slug_index()
+
+    if args.command == "stats":
+        if args.json:
+            print(json.dumps(index.stats(), ensure_ascii=False, indent=2))
+        else:
+            print_stats(index)
+
+    elif args.command == "show":
+        result = {slug: [occ._asdict() for occ in index.lookup(slug)] for slug in args.slugs}
+        if args.json:
+            print(json.dumps(result, ensure_ascii=False, indent=2))
+            return
+        for slug in args.slugs:
+            occurrences = index.lookup(slug)
+            print(f"{slug}: 出现 {len(occurrences)} 次")
+            for occ in occurrences:
+                print(f"  {_format_occurrence(occ)}")
+
+    elif args.command == "dupes":
+        dupes = list(index.duplicates().items())
+        if args.top > 0:
+            dupes = dupes[: args.top]
+        if args.json:
+            print(json.dumps({slug: [occ._asdict() for occ in occ_list] for slug, occ_list in dupes}, ensure_ascii=False, indent=2))
+            return
+        for slug, occurrences in dupes:
+            print(f"{slug}: 出现 {len(occurrences)} 次")
+            for occ in occurrences:
+                print(f"  {_format_occurrence(occ)}")
+
+    elif args.command == "overlap":
+        keys = [key for key in index.groups if args.keyword in key[1]]
+        if not keys:
+            raise SystemExit(f"未找到名称包含 {args.keyword} 的子题单")
+        result = {key: list(index.group_overlap(key).items())[: args.top] for key in keys}
+        if args.json:
+            print(json.dumps(
+                [
+                    {
+                        "category": category,
+                        "group": name,
+                        "shared": index.shared_count((category, name)),
+                        "overlap": [{"category": c, "group": g, "count": n} for (c, g), n in result[(category, name)]],
+                    }
+                    for category, name in keys
+                ],
+                ensure_ascii=False,
+                indent=2,
+            ))
+            return
+        for key in keys:
+            print(
+                f"{key[1]}（{key[0]}）: {len(index.groups[key])} 道题，"
+                f"其中 {index.shared_count(key)} 道也出现在其它子题单"
+            )
+            for (category, name), count in result[key]:
+                print(f"  {count:3} 道  {name}（{category}）")
+
+
+if __name__ == "__main__":
+    main()
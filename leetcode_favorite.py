@@ -1,17 +1,40 @@
-import requests
+import atexit
 import json
 import os
 import re
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
 from pathlib import Path
-from typing import Optional, List, Dict, TypedDict, Any
+from typing import TYPE_CHECKING, Optional, List, Dict, TypedDict, Any, Iterator, Tuple
 from dataclasses import dataclass
 from datetime import datetime
-from prettytable import PrettyTable
-from dotenv import load_dotenv
+
+# requests / prettytable / dotenv 在用到时才导入，只用到部分功能的入口（如 favorite_cli、守护进程）启动更快
+if TYPE_CHECKING:
+    import requests
+    from prettytable import PrettyTable
+
+from problem_catalog import validate_question_slugs
 
 
 BASE_DIR = Path(__file__).resolve().parent
 
+# 并发请求的线程数上限（导出等批量只读操作使用）
+EXPORT_MAX_WORKERS = 8
+HTTP_POOL_SIZE = 16
+
+# 后台预取：线程数、每次预取的题单数、缓存的题目总数上限、缓存有效期（秒）
+PREFETCH_MAX_WORKERS = 2
+PREFETCH_MAX_FAVORITES = 6
+PREFETCH_MAX_QUESTIONS = 2000
+PREFETCH_TTL_SECONDS = 120.0
+
+_ENV_ID_RE = re.compile(r"(?:\?|&)envId=([^&]+)")
+_MD_LINK_ENTRY_RE = re.compile(r"^-\s*\[(?P<name>[^\]]+)\]\((?P<url>[^\)]+)\)\s*$")
+_MD_PLAIN_ENTRY_RE = re.compile(r"^-\s*(?P<name>.+?)\s*$")
 
 _FAVORITE_LIST_WRITE_ALLOWED: Optional[bool] = None
 
@@ -30,6 +53,23 @@ def _confirm_write_favorite_list(path: Path) -> bool:
     return _FAVORITE_LIST_WRITE_ALLOWED
 
 
+def _parse_markdown_entry(line: str) -> Optional[Dict[str, str]]:
+    """解析一行 `- [Name](url)` 或 `- Name`，不是条目时返回 None。"""
+    if not line.startswith("-"):
+        return None
+
+    # - [Name](url)
+    m = _MD_LINK_ENTRY_RE.match(line)
+    if m:
+        return {"name": m.group("name"), "url": m.group("url")}
+
+    # - Name
+    m2 = _MD_PLAIN_ENTRY_RE.match(line)
+    if m2:
+        return {"name": m2.group("name")}
+    return None
+
+
 def _parse_markdown_favorite_list(content: str) -> Dict[str, List[Dict[str, str]]]:
     """Parse a markdown file with sections like:
 
@@ -51,21 +91,238 @@ def _parse_markdown_favorite_list(content: str) -> Dict[str, List[Dict[str, str]
         if not current_category:
             continue
 
-        if not line.startswith("-"):
-            continue
+        entry = _parse_markdown_entry(line)
+        if entry:
+            data[current_category].append(entry)
 
-        # - [Name](url)
-        m = re.match(r"^-\s*\[(?P<name>[^\]]+)\]\((?P<url>[^\)]+)\)\s*$", line)
-        if m:
-            data[current_category].append({"name": m.group("name"), "url": m.group("url")})
-            continue
+    return data
 
-        # - Name
-        m2 = re.match(r"^-\s*(?P<name>.+?)\s*$", line)
-        if m2:
-            data[current_category].append({"name": m2.group("name")})
 
-    return data
+def _build_favorite_entry(info: Dict[str, str]) -> Dict[str, str]:
+    """把 {name, slug, first_problem_slug} 转成 markdown 条目 {name, url?}。"""
+    name = (info.get("name") or "").strip() or "未命名"
+    slug = (info.get("slug") or "").strip()
+    first_problem_slug = (info.get("first_problem_slug") or "").strip()
+
+    entry: Dict[str, str] = {"name": name}
+    if slug and first_problem_slug:
+        entry["url"] = (
+            f"https://leetcode.cn/problems/{first_problem_slug}/"
+            f"?envType=problem-list-v2&envId={slug}"
+        )
+    return entry
+
+
+def atomic_write_text(path: Path, text: str) -> None:
+    """先写入同目录临时文件再 rename，避免中途失败留下半截文件。"""
+    fd, tmp_name = tempfile.mkstemp(prefix=f".{path.name}.", suffix=".tmp", dir=str(path.parent))
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8", newline="") as f:
+            f.write(text)
+        os.replace(tmp_name, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_name)
+        except OSError:
+            pass
+        raise
+
+
+def _favorite_entry_key(entry: Dict[str, str]) -> str:
+    m_env = _ENV_ID_RE.search(entry.get("url") or "")
+    if m_env:
+        return f"env:{m_env.group(1)}"
+    return f"name:{entry.get('name', '').strip()}"
+
+
+class _FavoriteListSection:
+    """favorite_list.md 中的一个分类段。
+
+    未改动的段直接复用文件中的原始文本；条目只在第一次被修改时才解析，
+    并按 envId（没有链接时按名称）建立索引。
+    """
+
+    def __init__(self, name: str, raw_lines: Optional[List[str]] = None) -> None:
+        self.name = name
+        self.raw_lines: List[str] = raw_lines or []
+        self._entries: Optional[List[Dict[str, str]]] = None
+        self._positions: Dict[str, int] = {}
+        self.dirty = raw_lines is None
+
+    @property
+    def entries(self) -> List[Dict[str, str]]:
+        if self._entries is None:
+            self._entries = []
+            for raw_line in self.raw_lines:
+                entry = _parse_markdown_entry(raw_line.strip())
+                if entry:
+                    self._append(entry)
+        return self._entries
+
+    def _append(self, entry: Dict[str, str]) -> None:
+        key = _favorite_entry_key(entry)
+        pos = self._positions.get(key)
+        if pos is None:
+            self._positions[key] = len(self._entries)
+            self._entries.append(dict(entry))
+        else:
+            self._entries[pos] = dict(entry)
+
+    def upsert(self, new_entries: List[Dict[str, str]]) -> None:
+        self.entries  # 确保已解析
+        for entry in new_entries:
+            self._append(entry)
+        self.dirty = True
+
+    def replace(self, new_entries: List[Dict[str, str]]) -> None:
+        self._entries = []
+        self._positions = {}
+        for entry in new_entries:
+            self._append(entry)
+        self.dirty = True
+
+    def render(self) -> str:
+        if not self.dirty:
+            # 去掉段尾空行，统一成与重新生成时相同的格式
+            body = "".join(self.raw_lines).rstrip()
+            return body + "\n" if "\n" in body else body + "\n\n"
+
+        lines = [f"## {self.name}", ""]
+        for entry in self.entries:
+            n = entry.get("name", "未命名")
+            url = entry.get("url")
+            if url:
+                lines.append(f"- [{n}]({url})")
+            else:
+                lines.append(f"- {n}")
+        return "\n".join(lines) + "\n"
+
+
+class FavoriteListDocument:
+    """favorite_list.md 的内存索引。
+
+    - 加载时只按 `## ` 切分分类段，不逐行解析条目
+    - upsert/replace 只修改受影响的分类段
+    - flush 时未改动的段直接复用原文，整体原子写入一次
+    """
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self._sections: Dict[str, _FavoriteListSection] = {}
+        self._stat: Optional[tuple] = None
+        self._loaded = False
+        self._pending = False
+
+    def _disk_stat(self) -> Optional[tuple]:
+        try:
+            st = self.path.stat()
+        except OSError:
+            return None
+        return (st.st_mtime_ns, st.st_size)
+
+    def _ensure_loaded(self) -> None:
+        """首次使用或文件在外部被修改（且没有未写入的改动）时重新加载。"""
+        stat = self._disk_stat()
+        if self._loaded and (self._pending or stat == self._stat):
+            return
+
+        self._sections = {}
+        self._stat = stat
+        self._loaded = True
+        if stat is None:
+            return
+        try:
+            content = self.path.read_text(encoding="utf-8")
+        except Exception as e:
+            print(f"读取现有题单列表文件失败: {e}，将覆盖")
+            return
+
+        current: Optional[_FavoriteListSection] = None
+        for raw_line in content.splitlines(keepends=True):
+            line = raw_line.strip()
+            if line.startswith("## "):
+                name = line[3:].strip()
+                if not name:
+                    current = None
+                    continue
+                if name in self._sections:
+                    # 重复的分类标题：合并条目，该段需要重新生成
+                    current = self._sections[name]
+                    current.entries
+                    current.dirty = True
+                else:
+                    current = _FavoriteListSection(name, [])
+                    self._sections[name] = current
+                current.raw_lines.append(raw_line if raw_line.endswith("\n") else raw_line + "\n")
+                continue
+            if current is None:
+                continue
+            if current.dirty:
+                entry = _parse_markdown_entry(line)
+                if entry:
+                    current._append(entry)
+            else:
+                current.raw_lines.append(raw_line)
+
+    def _section(self, category_name: str) -> _FavoriteListSection:
+        self._ensure_loaded()
+        section = self._sections.get(category_name)
+        if section is None:
+            section = _FavoriteListSection(category_name)
+            section.replace([])
+            self._sections[category_name] = section
+        return section
+
+    def upsert(self, category_name: str, entries: List[Dict[str, str]]) -> None:
+        self._section(category_name).upsert(entries)
+        self._pending = True
+
+    def replace(self, category_name: str, entries: List[Dict[str, str]]) -> None:
+        self._section(category_name).replace(entries)
+        self._pending = True
+
+    @property
+    def has_pending_changes(self) -> bool:
+        return self._pending
+
+    def render(self) -> str:
+        now = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        blocks = [self._sections[name].render() for name in sorted(self._sections)]
+        text = f"# LeetCode 题单列表\n\n更新时间: {now}\n\n" + "\n".join(blocks)
+        return text.rstrip() + "\n"
+
+    def flush(self) -> bool:
+        """把所有改动一次性写入文件；没有改动时不写。"""
+        if not self._pending:
+            return False
+        atomic_write_text(self.path, self.render())
+        self._stat = self._disk_stat()
+        self._pending = False
+        for section in self._sections.values():
+            if section.dirty:
+                section.raw_lines = section.render().splitlines(keepends=True)
+                section.dirty = False
+        return True
+
+
+_FAVORITE_LIST_DOCUMENTS: Dict[Path, FavoriteListDocument] = {}
+
+
+def get_favorite_list_document(output_filename: str = "favorite_list.md") -> FavoriteListDocument:
+    """同一文件在一次运行中共用一个文档索引。"""
+    output_path = BASE_DIR / output_filename
+    doc = _FAVORITE_LIST_DOCUMENTS.get(output_path)
+    if doc is None:
+        doc = FavoriteListDocument(output_path)
+        _FAVORITE_LIST_DOCUMENTS[output_path] = doc
+    return doc
+
+
+def flush_favorite_list_documents(verbose: bool = False) -> None:
+    """写出本次运行中累积的所有题单列表改动（退出时调用）。"""
+    for doc in _FAVORITE_LIST_DOCUMENTS.values():
+        if doc.flush() and verbose:
+            print(f"题单列表已保存到: {doc.path}")
 
 
 def generate_favorite_list_file(
@@ -75,91 +332,53 @@ def generate_favorite_list_file(
     merge_mode: str = "upsert",
     confirm: bool = True,
     verbose: bool = False,
+    flush: bool = True,
 ) -> None:
     """生成题单列表文件。
 
     - 同一分类覆盖（category_name 相同）
     - 不同分类追加
     - 链接使用题单第一题，并包含 envType/envId（envId=题单 slug）
+    - flush=False 时只更新内存中的索引，由 flush_favorite_list_documents 统一写入
     """
-    output_path = BASE_DIR / output_filename
+    if merge_mode not in {"replace", "upsert"}:
+        raise ValueError("merge_mode must be 'replace' or 'upsert'")
+
+    doc = get_favorite_list_document(output_filename)
 
-    if confirm and not _confirm_write_favorite_list(output_path):
+    if confirm and not _confirm_write_favorite_list(doc.path):
         return
 
-    existing_data: Dict[str, List[Dict[str, str]]] = {}
-    if output_path.exists():
-        try:
-            existing_data = _parse_markdown_favorite_list(output_path.read_text(encoding="utf-8"))
-        except Exception as e:
-            print(f"读取现有题单列表文件失败: {e}，将覆盖")
-            existing_data = {}
-
-    new_entries: List[Dict[str, str]] = []
-    for info in favorite_infos:
-        name = (info.get("name") or "").strip() or "未命名"
-        slug = (info.get("slug") or "").strip()
-        first_problem_slug = (info.get("first_problem_slug") or "").strip()
-
-        entry: Dict[str, str] = {"name": name}
-        if slug and first_problem_slug:
-            entry["url"] = (
-                f"https://leetcode.cn/problems/{first_problem_slug}/"
-                f"?envType=problem-list-v2&envId={slug}"
-            )
-        new_entries.append(entry)
+    new_entries = [_build_favorite_entry(info) for info in favorite_infos]
+    if merge_mode == "replace":
+        doc.replace(category_name, new_entries)
+    else:
+        doc.upsert(category_name, new_entries)
 
-    merged_data = dict(existing_data)
+    if flush and doc.flush() and verbose:
+        print(f"题单列表已保存到: {doc.path}")
 
-    if merge_mode not in {"replace", "upsert"}:
-        raise ValueError("merge_mode must be 'replace' or 'upsert'")
 
-    if merge_mode == "replace":
-        merged_data[category_name] = new_entries
-    else:
-        def key_for_entry(entry: Dict[str, str]) -> str:
-            url = entry.get("url") or ""
-            m_env = re.search(r"(?:\?|&)envId=([^&]+)", url)
-            if m_env:
-                return f"env:{m_env.group(1)}"
-            return f"name:{entry.get('name', '').strip()}"
-
-        existing_entries = merged_data.get(category_name, [])
-        index: Dict[str, Dict[str, str]] = {}
-        order: List[str] = []
-
-        for e in existing_entries:
-            k = key_for_entry(e)
-            if k not in index:
-                order.append(k)
-            index[k] = dict(e)
-
-        for e in new_entries:
-            k = key_for_entry(e)
-            if k not in index:
-                order.append(k)
-            index[k] = dict(e)
-
-        merged_data[category_name] = [index[k] for k in order if k in index]
-
-    now = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-    lines: List[str] = ["# LeetCode 题单列表", "", f"更新时间: {now}", ""]
-
-    for cat in sorted(merged_data.keys()):
-        lines.append(f"## {cat}")
-        lines.append("")
-        for entry in merged_data[cat]:
-            n = entry.get("name", "未命名")
-            url = entry.get("url")
-            if url:
-                lines.append(f"- [{n}]({url})")
-            else:
-                lines.append(f"- {n}")
-        lines.append("")
+def write_favorite_list_sections(
+    sections: Dict[str, List[Dict[str, str]]],
+    output_filename: str = "favorite_list.md",
+    confirm: bool = True,
+    verbose: bool = False,
+) -> None:
+    """一次性覆盖多个分类段并写入文件（只读、写各一次）。
 
-    output_path.write_text("\n".join(lines).rstrip() + "\n", encoding="utf-8")
-    if verbose:
-        print(f"题单列表已保存到: {output_path}")
+    :param sections: {分类名: [{name, slug, first_problem_slug}, ...]}
+    """
+    doc = get_favorite_list_document(output_filename)
+
+    if confirm and not _confirm_write_favorite_list(doc.path):
+        return
+
+    for category_name, infos in sections.items():
+        doc.replace(category_name, [_build_favorite_entry(info) for info in infos])
+
+    if doc.flush() and verbose:
+        print(f"题单列表已保存到: {doc.path}")
 
 class FavoriteInfo(TypedDict):
     coverUrl: Optional[str]
@@ -202,12 +421,206 @@ class QuestionListResponse(TypedDict):
     totalLength: int
     hasMore: bool
 
+_DIFFICULTY_FILTERS = {
+    "easy": "EASY", "简单": "EASY",
+    "medium": "MEDIUM", "中等": "MEDIUM",
+    "hard": "HARD", "困难": "HARD",
+}
+# 状态 -> (questionStatuses 中的值, 运算符)；未解答 = 不是已解答
+_STATUS_FILTERS = {
+    "solved": ("SOLVED", "IS"), "已解答": ("SOLVED", "IS"),
+    "attempted": ("ATTEMPTED", "IS"), "尝试过": ("ATTEMPTED", "IS"),
+    "todo": ("TO_DO", "IS"), "未开始": ("TO_DO", "IS"),
+    "unsolved": ("SOLVED", "IS_NOT"), "未解答": ("SOLVED", "IS_NOT"),
+}
+_SORT_FIELDS = {
+    "custom": "CUSTOM", "题单顺序": "CUSTOM",
+    "id": "FRONTEND_ID", "题号": "FRONTEND_ID",
+    "ac_rate": "AC_RATE", "通过率": "AC_RATE",
+    "difficulty": "DIFFICULTY", "难度": "DIFFICULTY",
+}
+_PREMIUM_VALUES = {"yes": True, "true": True, "是": True, "no": False, "false": False, "否": False}
+
+
+@dataclass(frozen=True)
+class QuestionFilter:
+    """
+    favoriteQuestionList 的服务端筛选与排序（filtersV2 / searchKeyword / sortBy），
+    只传输符合条件的题目。默认值对应不筛选、按题单顺序排列。
+    """
+    difficulties: Tuple[str, ...] = ()  # EASY / MEDIUM / HARD
+    statuses: Tuple[str, ...] = ()  # SOLVED / ATTEMPTED / TO_DO
+    status_operator: str = "IS"  # IS / IS_NOT
+    topics: Tuple[str, ...] = ()  # 标签 slug，如 dynamic-programming
+    premium: Optional[bool] = None  # True 只看会员题，False 排除会员题
+    keyword: str = ""
+    sort_field: str = "CUSTOM"
+    sort_order: str = "ASCENDING"
+
+    def is_default(self) -> bool:
+        return self == QuestionFilter()
+
+    def variables(self) -> Dict[str, Any]:
+        """favoriteQuestionList 请求中的 filtersV2、searchKeyword 与 sortBy"""
+        return {
+            "filtersV2": {
+                "filterCombineType": "ALL",
+                "statusFilter": {"questionStatuses": list(self.statuses), "operator": self.status_operator},
+                "difficultyFilter": {"difficulties": list(self.difficulties), "operator": "IS"},
+                "languageFilter": {"languageSlugs": [], "operator": "IS"},
+                "topicFilter": {"topicSlugs": list(self.topics), "operator": "IS"},
+                "acceptanceFilter": {},
+                "frequencyFilter": {},
+                "lastSubmittedFilter": {},
+                "publishedFilter": {},
+                "companyFilter": {"companySlugs": [], "operator": "IS"},
+                "positionFilter": {"positionSlugs": [], "operator": "IS"},
+                "premiumFilter": {
+                    "premiumStatus": [] if self.premium is None else ["PREMIUM"],
+                    "operator": "IS_NOT" if self.premium is False else "IS",
+                },
+            },
+            "searchKeyword": self.keyword,
+            "sortBy": {"sortField": self.sort_field, "sortOrder": self.sort_order},
+        }
+
+    def describe(self) -> str:
+        parts = []
+        if self.difficulties:
+            parts.append("难度 " + "/".join(_DIFFICULTY_LABELS.get(d, d).split()[-1] for d in self.difficulties))
+        if self.statuses:
+            labels = {"SOLVED": "已解答", "ATTEMPTED": "尝试过", "TO_DO": "未开始"}
+            prefix = "状态不是 " if self.status_operator == "IS_NOT" else "状态 "
+            parts.append(prefix + "/".join(labels.get(s, s) for s in self.statuses))
+        if self.topics:
+            parts.append("标签 " + "/".join(self.topics))
+        if self.premium is not None:
+            parts.append("只看会员题" if self.premium else "排除会员题")
+        if self.keyword:
+            parts.append(f"关键字 {self.keyword}")
+        if self.sort_field != "CUSTOM" or self.sort_order != "ASCENDING":
+            sort_labels = {"CUSTOM": "题单顺序", "FRONTEND_ID": "题号", "AC_RATE": "通过率", "DIFFICULTY": "难度"}
+            parts.append(f"按{sort_labels.get(self.sort_field, self.sort_field)}{'降序' if self.sort_order == 'DESCENDING' else '升序'}")
+        return "，".join(parts) or "无"
+
+
+def build_question_filter(
+    difficulty: Optional[List[str]] = None,
+    status: Optional[List[str]] = None,
+    tags: Optional[List[str]] = None,
+    premium: Optional[bool] = None,
+    keyword: str = "",
+    sort: Optional[str] = None,
+) -> QuestionFilter:
+    """
+    由命令行/菜单中的取值构造筛选条件
+    :param difficulty: easy / medium / hard（或 简单 / 中等 / 困难）
+    :param status: solved / attempted / todo / unsolved（或 已解答 / 尝试过 / 未开始 / 未解答）
+    :param tags: 标签 slug
+    :param sort: custom / id / ac_rate / difficulty，前面加 - 表示降序
+    :raises ValueError: 取值无效
+    """
+    difficulties = []
+    for value in difficulty or []:
+        if value.lower() not in _DIFFICULTY_FILTERS:
+            raise ValueError(f"无效的难度: {value}（可选: easy / medium / hard）")
+        difficulties.append(_DIFFICULTY_FILTERS[value.lower()])
+
+    statuses = []
+    operators = set()
+    for value in status or []:
+        if value.lower() not in _STATUS_FILTERS:
+            raise ValueError(f"无效的状态: {value}（可选: solved / attempted / todo / unsolved）")
+        question_status, operator = _STATUS_FILTERS[value.lower()]
+        statuses.append(question_status)
+        operators.add(operator)
+    if len(operators) > 1:
+        raise ValueError("unsolved 不能与其它状态同时使用")
+
+    sort_field, sort_order = "CUSTOM", "ASCENDING"
+    if sort:
+        descending = sort.startswith("-")
+        key = sort.lstrip("-").lower()
+        if key not in _SORT_FIELDS:
+            raise ValueError(f"无效的排序: {sort}（可选: custom / id / ac_rate / difficulty，前面加 - 表示降序）")
+        sort_field, sort_order = _SORT_FIELDS[key], "DESCENDING" if descending else "ASCENDING"
+
+    return QuestionFilter(
+        difficulties=tuple(dict.fromkeys(difficulties)),
+        statuses=tuple(dict.fromkeys(statuses)),
+        status_operator=operators.pop() if operators else "IS",
+        topics=tuple(dict.fromkeys(tag.strip().lower() for tag in tags or [] if tag.strip())),
+        premium=premium,
+        keyword=keyword.strip(),
+        sort_field=sort_field,
+        sort_order=sort_order,
+    )
+
+
+def parse_question_filter(text: str) -> QuestionFilter:
+    """
+    解析菜单中输入的筛选条件，如 "difficulty:medium status:unsolved tag:dynamic-programming 打家劫舍"
+    字段: difficulty/难度、status/状态、tag/标签、premium/会员（yes/no）、sort/排序，
+    多个取值用逗号分隔，其余文本作为搜索关键字。
+    :raises ValueError: 取值无效
+    """
+    fields: Dict[str, List[str]] = {"difficulty": [], "status": [], "tag": [], "premium": [], "sort": []}
+    aliases = {"难度": "difficulty", "状态": "status", "标签": "tag", "会员": "premium", "排序": "sort"}
+    keywords = []
+    for token in text.split():
+        name, sep, value = token.partition(":")
+        name = aliases.get(name, name.lower())
+        if sep and name in fields:
+            fields[name].extend(v for v in value.split(",") if v)
+        else:
+            keywords.append(token)
+
+    premium = None
+    if fields["premium"]:
+        value = fields["premium"][-1].lower()
+        if value not in _PREMIUM_VALUES:
+            raise ValueError(f"无效的会员筛选: {value}（可选: yes / no）")
+        premium = _PREMIUM_VALUES[value]
+    return build_question_filter(
+        difficulty=fields["difficulty"],
+        status=fields["status"],
+        tags=fields["tag"],
+        premium=premium,
+        keyword=" ".join(keywords),
+        sort=fields["sort"][-1] if fields["sort"] else None,
+    )
+
+
+class RateLimiter:
+    """
+    线程安全的请求限速器：相邻两次请求至少间隔 1 / rate 秒
+    """
+
+    def __init__(self, rate: float):
+        """
+        :param rate: 每秒最多请求次数，<= 0 表示不限速
+        """
+        self.interval = 1.0 / rate if rate > 0 else 0.0
+        self._lock = threading.Lock()
+        self._next_time = 0.0
+
+    def wait(self) -> None:
+        if self.interval <= 0:
+            return
+        with self._lock:
+            now = time.monotonic()
+            scheduled = max(now, self._next_time)
+            self._next_time = scheduled + self.interval
+        if scheduled > now:
+            time.sleep(scheduled - now)
+
 class LeetCodeClient:
-    def __init__(self, csrf_token: str, session_id: str):
+    def __init__(self, csrf_token: str, session_id: str, rate_limiter: Optional[RateLimiter] = None):
         """
         初始化 LeetCode 客户端
         :param csrf_token: LeetCode 的 csrf token
         :param session_id: LeetCode 的 session id (LEETCODE_SESSION cookie)
+        :param rate_limiter: 可选的限速器，所有 GraphQL 请求共用
         """
         self.base_url = "https://leetcode.cn/graphql"
         self.headers = {
@@ -215,6 +628,19 @@ class LeetCodeClient:
             "X-CSRFToken": csrf_token,
             "Cookie": f"csrftoken={csrf_token}; LEETCODE_SESSION={session_id}"
         }
+        import requests
+
+        # 复用连接；连接池大小与并发导出的线程数匹配
+        self.session = requests.Session()
+        adapter = requests.adapters.HTTPAdapter(pool_connections=4, pool_maxsize=HTTP_POOL_SIZE)
+        self.session.mount("https://", adapter)
+        self.rate_limiter = rate_limiter
+
+    def _post(self, payload: Dict[str, Any]) -> "requests.Response":
+        """发送 GraphQL 请求（经过限速器）"""
+        if self.rate_limiter is not None:
+            self.rate_limiter.wait()
+        return self.session.post(self.base_url, headers=self.headers, json=payload)
 
     def get_favorite_lists(self) -> tuple[List[FavoriteInfo], List[FavoriteInfo]]:
         """
@@ -256,10 +682,8 @@ class LeetCodeClient:
         }
         """
 
-        response = requests.post(
-            self.base_url,
-            headers=self.headers,
-            json={"query": query, "operationName": "myFavoriteList"}
+        response = self._post(
+            payload={"query": query, "operationName": "myFavoriteList"}
         )
 
         data = response.json()
@@ -279,6 +703,8 @@ class LeetCodeClient:
         :param description: 题单描述
         :return: 题单的 slug，如果创建失败则返回 None
         """
+        import requests
+
         query = """
         mutation createEmptyFavorite($description: String, $favoriteType: FavoriteTypeEnum!, $isPublicFavorite: Boolean = true, $name: String!) {
             createEmptyFavorite(
@@ -304,10 +730,8 @@ class LeetCodeClient:
         print(variables)
 
         try:
-            response = requests.post(
-                self.base_url,
-                headers=self.headers,
-                json={
+            response = self._post(
+                payload={
                     "query": query,
                     "variables": variables,
                     "operationName": "createEmptyFavorite"
@@ -367,10 +791,8 @@ class LeetCodeClient:
             }
         }
 
-        response = requests.post(
-            self.base_url,
-            headers=self.headers,
-            json={
+        response = self._post(
+            payload={
                 "query": query,
                 "variables": variables,
                 "operationName": "updateFavoriteV2"
@@ -408,10 +830,8 @@ class LeetCodeClient:
             "questionId": question_id
         }
 
-        response = requests.post(
-            self.base_url,
-            headers=self.headers,
-            json={
+        response = self._post(
+            payload={
                 "query": query,
                 "variables": variables
             }
@@ -450,10 +870,8 @@ class LeetCodeClient:
             "questionSlugs": question_slugs
         }
 
-        response = requests.post(
-            self.base_url,
-            headers=self.headers,
-            json={
+        response = self._post(
+            payload={
                 "query": query,
                 "variables": variables
             }
@@ -467,13 +885,20 @@ class LeetCodeClient:
             print(f"批量添加题目失败: {error}")
             return False
 
-    def get_favorite_questions(self, favorite_slug: str, skip: int = 0, limit: int = 5000) -> Optional[QuestionListResponse]:
+    def get_favorite_questions(
+        self,
+        favorite_slug: str,
+        skip: int = 0,
+        limit: int = 5000,
+        question_filter: Optional[QuestionFilter] = None,
+    ) -> Optional[QuestionListResponse]:
         """
         获取题单中的题目列表
         :param favorite_slug: 题单的 slug
         :param skip: 跳过的题目数量
         :param limit: 返回的题目数量限制
-        :return: 题目列表信息，如果获取失败则返回 None
+        :param question_filter: 服务端筛选与排序，None 表示不筛选、按题单顺序
+        :return: 题目列表信息（totalLength 为符合条件的题目数），如果获取失败则返回 None
         """
         query = """
         query favoriteQuestionList($favoriteSlug: String!, $filter: FavoriteQuestionFilterInput, $searchKeyword: String, 
@@ -516,28 +941,11 @@ class LeetCodeClient:
             "skip": skip,
             "limit": limit,
             "favoriteSlug": favorite_slug,
-            "filtersV2": {
-                "filterCombineType": "ALL",
-                "statusFilter": {"questionStatuses": [], "operator": "IS"},
-                "difficultyFilter": {"difficulties": [], "operator": "IS"},
-                "languageFilter": {"languageSlugs": [], "operator": "IS"},
-                "topicFilter": {"topicSlugs": [], "operator": "IS"},
-                "acceptanceFilter": {},
-                "frequencyFilter": {},
-                "lastSubmittedFilter": {},
-                "publishedFilter": {},
-                "companyFilter": {"companySlugs": [], "operator": "IS"},
-                "positionFilter": {"positionSlugs": [], "operator": "IS"},
-                "premiumFilter": {"premiumStatus": [], "operator": "IS"}
-            },
-            "searchKeyword": "",
-            "sortBy": {"sortField": "CUSTOM", "sortOrder": "ASCENDING"}
+            **(question_filter or QuestionFilter()).variables(),
         }
 
-        response = requests.post(
-            self.base_url,
-            headers=self.headers,
-            json={
+        response = self._post(
+            payload={
                 "query": query,
                 "variables": variables,
                 "operationName": "favoriteQuestionList"
@@ -551,6 +959,123 @@ class LeetCodeClient:
             print("获取题单题目列表失败")
             return None
 
+    def iter_favorite_question_pages(self, favorite_slug: str, page_size: int = 100) -> Iterator[List[Question]]:
+        """
+        分页遍历题单中的题目，每次只请求 page_size 道
+        :param favorite_slug: 题单的 slug
+        :param page_size: 每页题目数量
+        :return: 逐页产出题目列表；某页获取失败时抛出 RuntimeError
+        """
+        skip = 0
+        while True:
+            response = self.get_favorite_questions(favorite_slug, skip=skip, limit=page_size)
+            if response is None:
+                raise RuntimeError(f"获取题单题目失败: {favorite_slug} (skip={skip})")
+            questions = response.get('questions') or []
+            if questions:
+                yield questions
+            skip += len(questions)
+            if not response.get('hasMore') or not questions:
+                break
+
+    def iter_problemset_pages(self, page_size: int = 100) -> Iterator[List[Dict[str, Any]]]:
+        """
+        分页遍历题库中的全部题目（frontendQuestionId、title、titleCn、titleSlug、paidOnly）
+        :param page_size: 每页题目数量
+        :return: 逐页产出题目列表；某页获取失败时抛出 RuntimeError
+        """
+        query = """
+        query problemsetQuestionList($categorySlug: String, $limit: Int, $skip: Int, $filters: QuestionListFilterInput) {
+            problemsetQuestionList(
+                categorySlug: $categorySlug
+                limit: $limit
+                skip: $skip
+                filters: $filters
+            ) {
+                hasMore
+                total
+                questions {
+                    frontendQuestionId
+                    paidOnly
+                    title
+                    titleCn
+                    titleSlug
+                }
+            }
+        }
+        """
+
+        skip = 0
+        while True:
+            response = self._post(
+                payload={
+                    "query": query,
+                    "variables": {"categorySlug": "", "skip": skip, "limit": page_size, "filters": {}},
+                    "operationName": "problemsetQuestionList"
+                }
+            )
+            data = response.json()
+            result = (data.get("data") or {}).get("problemsetQuestionList")
+            if not result:
+                raise RuntimeError(f"获取题库题目失败 (skip={skip})")
+            questions = result.get("questions") or []
+            if questions:
+                yield questions
+            skip += len(questions)
+            if not result.get("hasMore") or not questions:
+                break
+
+    def get_favorite_detail(self, favorite_slug: str) -> Optional[Dict[str, Any]]:
+        """
+        获取题单详情（名称、描述、公开状态、封面表情等）
+        :param favorite_slug: 题单的 slug
+        :return: 题单详情，如果获取失败则返回 None
+        """
+        query = """
+        query favoriteDetailV2($favoriteSlug: String!) {
+            favoriteDetailV2(favoriteSlug: $favoriteSlug) {
+                questionNumber
+                isPublicFavorite
+                slug
+                name
+                description
+                coverUrl
+                coverEmoji
+                coverBackgroundColor
+                lastQuestionAddedAt
+            }
+        }
+        """
+
+        variables = {
+            "favoriteSlug": favorite_slug
+        }
+
+        try:
+            response = self._post(
+                payload={
+                    "query": query,
+                    "variables": variables,
+                    "operationName": "favoriteDetailV2"
+                }
+            )
+            response.raise_for_status()
+            data = response.json()
+
+            if "errors" in data:
+                error_msg = data["errors"][0].get("message", "未知错误")
+                print(f"获取题单详情失败: {error_msg}")
+                return None
+
+            result = (data.get("data") or {}).get("favoriteDetailV2")
+            if result:
+                return result
+            print("获取题单详情失败: 响应数据为空")
+            return None
+        except Exception as e:
+            print(f"获取题单详情失败: {str(e)}")
+            return None
+
     def remove_question_from_favorite(self, favorite_slug: str, question_slug: str) -> bool:
         """
         从题单中移除题目
@@ -575,10 +1100,8 @@ class LeetCodeClient:
             "questionSlug": question_slug
         }
 
-        response = requests.post(
-            self.base_url,
-            headers=self.headers,
-            json={
+        response = self._post(
+            payload={
                 "query": query,
                 "variables": variables,
                 "operationName": "removeQuestionFromFavoriteV2"
@@ -610,10 +1133,8 @@ class LeetCodeClient:
             "favoriteSlug": favorite_slug
         }
 
-        response = requests.post(
-            self.base_url,
-            headers=self.headers,
-            json={
+        response = self._post(
+            payload={
                 "query": query,
                 "variables": variables,
                 "operationName": "deleteFavoriteV2"
@@ -660,10 +1181,8 @@ class LeetCodeClient:
             "favoriteSlug": favorite_slug
         }
 
-        response = requests.post(
-            self.base_url,
-            headers=self.headers,
-            json={
+        response = self._post(
+            payload={
                 "query": query,
                 "variables": variables,
                 "operationName": "removeFavoriteFromMyCollectionV2"
@@ -723,10 +1242,8 @@ class LeetCodeClient:
         }
 
         try:
-            response = requests.post(
-                self.base_url,
-                headers=self.headers,
-                json={
+            response = self._post(
+                payload={
                     "query": query,
                     "variables": variables,
                     "operationName": "createdPublicFavoriteList"
@@ -770,10 +1287,8 @@ class LeetCodeClient:
         }
 
         try:
-            response = requests.post(
-                self.base_url,
-                headers=self.headers,
-                json={
+            response = self._post(
+                payload={
                     "query": query,
                     "variables": variables,
                     "operationName": "addFavoriteToMyCollectionV2"
@@ -819,10 +1334,8 @@ class LeetCodeClient:
         }
 
         try:
-            response = requests.post(
-                self.base_url,
-                headers=self.headers,
-                json={
+            response = self._post(
+                payload={
                     "query": query,
                     "variables": variables,
                     "operationName": "forkFavoriteV2"
@@ -847,6 +1360,72 @@ class LeetCodeClient:
             print(f"复制题单失败: {str(e)}")
             return None
 
+def list_all_favorites(client: LeetCodeClient) -> List[dict]:
+    """
+    获取所有题单（先自己创建的，后收藏的），并标记 is_created
+    """
+    created_favorites, collected_favorites = client.get_favorite_lists()
+    all_favorites = []
+    for favorite in created_favorites:
+        favorite['is_created'] = True
+        all_favorites.append(favorite)
+    for favorite in collected_favorites:
+        favorite['is_created'] = False
+        all_favorites.append(favorite)
+    return all_favorites
+
+def favorite_metadata(favorite: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    增量导出/同步时判断题单是否变化的元数据：名称、类型、最后加题时间
+    :param favorite: list_all_favorites 返回的题单信息
+    """
+    return {
+        'name': favorite.get('name', ''),
+        'is_created': bool(favorite.get('is_created')),
+        'lastQuestionAddedAt': favorite.get('lastQuestionAddedAt'),
+    }
+
+def favorite_metadata_unchanged(favorite: Dict[str, Any], entry: Optional[Dict[str, Any]]) -> bool:
+    """
+    题单元数据与上次记录（entry）是否一致。
+    注意：移除题目不会改变最后加题时间，需要发现移除时再用 find_count_changed_favorites 核对题目数量
+    """
+    return entry is not None and all(entry.get(key) == value for key, value in favorite_metadata(favorite).items())
+
+def get_favorite_question_count(client: LeetCodeClient, favorite_slug: str) -> Optional[int]:
+    """
+    只取一道题，读取题单当前的题目数量
+    :return: 题目数量，获取失败时返回 None
+    """
+    response = client.get_favorite_questions(favorite_slug, skip=0, limit=1)
+    return None if response is None else response.get('totalLength')
+
+def find_count_changed_favorites(
+    client: LeetCodeClient,
+    favorites: List[dict],
+    expected_counts: Dict[str, Optional[int]],
+    max_workers: int = EXPORT_MAX_WORKERS,
+) -> List[dict]:
+    """
+    并发核对题单的题目数量（每个题单一次 limit=1 的请求）
+    :param expected_counts: {题单 slug: 上次记录的题目数量}
+    :return: 数量与记录不同或获取失败的题单（保持 favorites 中的顺序）
+    """
+    if not favorites:
+        return []
+    changed = set()
+    with ThreadPoolExecutor(max_workers=max(1, max_workers)) as executor:
+        futures = {executor.submit(get_favorite_question_count, client, fav['slug']): fav for fav in favorites}
+        for future in as_completed(futures):
+            slug = futures[future]['slug']
+            try:
+                count = future.result()
+            except Exception:
+                count = None
+            if count is None or count != expected_counts.get(slug):
+                changed.add(slug)
+    return [fav for fav in favorites if fav['slug'] in changed]
+
 def is_system_annual_favorite(favorite_slug: str) -> bool:
     """
     判断是否是系统生成的年度题单
@@ -925,6 +1504,8 @@ def display_favorites(favorites: List[FavoriteInfo]) -> None:
     """
     显示题单列表
     """
+    from prettytable import PrettyTable
+
     print("\n题单列表:")
     
     table = PrettyTable()
@@ -948,15 +1529,23 @@ def display_favorites(favorites: List[FavoriteInfo]) -> None:
     
     print(table)
 
-def display_questions(questions: List[Question], total_length: int) -> None:
-    """
-    显示题目列表
-    """
-    print(f"\n题目列表 (共 {total_length} 题):")
-    
+_DIFFICULTY_LABELS = {
+    "EASY": "🟢 简单",
+    "MEDIUM": "🟡 中等",
+    "HARD": "🔴 困难"
+}
+_STATUS_LABELS = {
+    "SOLVED": "✅",
+    "TO_DO": "⬜",
+    None: "⬜"
+}
+
+
+def _new_question_table() -> "PrettyTable":
+    from prettytable import PrettyTable
+
     table = PrettyTable()
-    # 暂时隐藏 通过率 标签
-    # table.field_names = ["编号", "题号", "状态", "难度", "题目", "slug", "通过率", "标签"]
+    # 暂时隐藏 通过率 标签（隐藏的列不再逐行计算）
     table.field_names = ["编号", "题号", "状态", "难度", "题目", "slug"]
     # 设置对齐方式
     table.align["编号"] = "r"  # 右对齐
@@ -965,45 +1554,594 @@ def display_questions(questions: List[Question], total_length: int) -> None:
     table.align["难度"] = "c"  # 居中对齐
     table.align["题目"] = "l"  # 左对齐
     table.align["slug"] = "l"  # 左对齐
-    # table.align["通过率"] = "r"  # 右对齐
-    # table.align["标签"] = "l"  # 左对齐
     table.border = True  # 显示边框
     table.hrules = False  # 显示横向分割线
-    
-    difficulty_map = {
-        "EASY": "🟢 简单",
-        "MEDIUM": "🟡 中等",
-        "HARD": "🔴 困难"
-    }
-    status_map = {
-        "SOLVED": "✅",
-        "TO_DO": "⬜",
-        None: "⬜"
-    }
-    
-    for i, question in enumerate(questions, 1):
-        difficulty = difficulty_map.get(question['difficulty'], question['difficulty'])
-        status = status_map.get(question.get('status'))
-        paid = "🔒" if question['paidOnly'] else ""
-        title = f"{paid} {question['translatedTitle']}"
-        slug = question['titleSlug']
-        tags = [tag['nameTranslated'] or tag['name'] for tag in question['topicTags']]
-        tags_str = ', '.join(tags) if tags else "无"
-        ac_rate = f"{question['acRate']:.1%}"
-        
-        table.add_row([
-            i,
-            question['questionFrontendId'],
-            status,
-            difficulty,
-            title,
-            slug,
-            # ac_rate,
-            # tags_str
-        ])
-    
+    return table
+
+
+def _question_row(index: int, question: Question) -> List[Any]:
+    paid = "🔒" if question['paidOnly'] else ""
+    return [
+        index,
+        question['questionFrontendId'],
+        _STATUS_LABELS.get(question.get('status')),
+        _DIFFICULTY_LABELS.get(question['difficulty'], question['difficulty']),
+        f"{paid} {question['translatedTitle']}",
+        question['titleSlug'],
+    ]
+
+
+def display_questions(questions: List[Question], total_length: int, start: int = 1) -> None:
+    """
+    显示题目列表
+    :param start: 第一道题的编号
+    """
+    print(f"\n题目列表 (共 {total_length} 题):")
+
+    table = _new_question_table()
+    for i, question in enumerate(questions, start):
+        table.add_row(_question_row(i, question))
+
     print(table)
 
+
+def _question_matches(question: Question, keyword: str) -> bool:
+    """关键字匹配题号、标题、slug 或难度（如 简单 / easy）"""
+    keyword = keyword.casefold()
+    fields = (
+        question.get('questionFrontendId') or "",
+        question.get('translatedTitle') or "",
+        question.get('title') or "",
+        question.get('titleSlug') or "",
+        question.get('difficulty') or "",
+        _DIFFICULTY_LABELS.get(question.get('difficulty'), ""),
+    )
+    return any(keyword in field.casefold() for field in fields)
+
+
+class FavoritePrefetcher:
+    """
+    在用户停留在菜单时后台预取题单的第一批题目（最近使用的题单优先，其次按列表顺序）。
+    线程数与缓存的题目总数都有上限，超出时淘汰最久未使用的题单；close() 取消尚未开始的预取。
+    """
+
+    def __init__(
+        self,
+        client: LeetCodeClient,
+        max_workers: int = PREFETCH_MAX_WORKERS,
+        max_favorites: int = PREFETCH_MAX_FAVORITES,
+        max_questions: int = PREFETCH_MAX_QUESTIONS,
+        fetch_size: int = 100,
+        ttl: float = PREFETCH_TTL_SECONDS,
+    ) -> None:
+        self.client = client
+        self.max_favorites = max_favorites
+        self.max_questions = max_questions
+        self.fetch_size = fetch_size
+        self.ttl = ttl
+        self._executor = ThreadPoolExecutor(max_workers=max(1, max_workers), thread_name_prefix="prefetch")
+        self._lock = threading.Lock()
+        # slug -> (获取时间, 第一批题目)，按最近使用排列
+        self._cache: "OrderedDict[str, Tuple[float, QuestionListResponse]]" = OrderedDict()
+        self._cached_questions = 0
+        self._pending: Dict[str, Future] = {}
+        # 每次失效加一，丢弃失效前发出的请求结果
+        self._generation: Dict[str, int] = {}
+        self._recent: List[str] = []
+        self._closed = False
+
+    def touch(self, favorite_slug: str) -> None:
+        """记录最近使用的题单"""
+        with self._lock:
+            if favorite_slug in self._recent:
+                self._recent.remove(favorite_slug)
+            self._recent.insert(0, favorite_slug)
+            del self._recent[self.max_favorites * 2:]
+
+    def candidates(self, favorites: List[FavoriteInfo]) -> List[str]:
+        """最可能被选中的题单：最近使用的在前，其次按列表顺序"""
+        slugs = [favorite['slug'] for favorite in favorites if favorite.get('slug')]
+        present = set(slugs)
+        with self._lock:
+            recent = [slug for slug in self._recent if slug in present]
+        return list(dict.fromkeys(recent + slugs))[:self.max_favorites]
+
+    def _fresh(self, favorite_slug: str) -> Optional[QuestionListResponse]:
+        entry = self._cache.get(favorite_slug)
+        if entry is None or time.monotonic() - entry[0] > self.ttl:
+            return None
+        self._cache.move_to_end(favorite_slug)
+        return entry[1]
+
+    def prefetch(self, favorite_slugs: List[str]) -> None:
+        """提交后台预取，已缓存或正在获取的题单会跳过"""
+        with self._lock:
+            if self._closed:
+                return
+            for slug in favorite_slugs[:self.max_favorites]:
+                if slug in self._pending or self._fresh(slug) is not None:
+                    continue
+                generation = self._generation.get(slug, 0)
+                self._pending[slug] = self._executor.submit(self._load, slug, generation)
+
+    def _load(self, favorite_slug: str, generation: int) -> None:
+        try:
+            response = None if self._closed else self.client.get_favorite_questions(
+                favorite_slug, skip=0, limit=self.fetch_size
+            )
+        except Exception:
+            response = None  # 预取失败时由调用方重新请求
+        with self._lock:
+            self._pending.pop(favorite_slug, None)
+            if response is None or self._closed or self._generation.get(favorite_slug, 0) != generation:
+                return
+            self._store(favorite_slug, response)
+
+    def _store(self, favorite_slug: str, response: QuestionListResponse) -> None:
+        old = self._cache.pop(favorite_slug, None)
+        if old is not None:
+            self._cached_questions -= len(old[1].get('questions') or [])
+        self._cache[favorite_slug] = (time.monotonic(), response)
+        self._cached_questions += len(response.get('questions') or [])
+        while self._cached_questions > self.max_questions and len(self._cache) > 1:
+            _, (_, evicted) = self._cache.popitem(last=False)
+            self._cached_questions -= len(evicted.get('questions') or [])
+
+    def get(self, favorite_slug: str) -> Optional[QuestionListResponse]:
+        """返回预取的第一批题目（skip=0, limit=fetch_size）；正在预取时等待结果，没有时返回 None"""
+        with self._lock:
+            response = self._fresh(favorite_slug)
+            future = self._pending.get(favorite_slug) if response is None else None
+        if future is not None:
+            try:
+                future.result()
+            except Exception:
+                return None
+            with self._lock:
+                response = self._fresh(favorite_slug)
+        return response
+
+    def invalidate(self, favorite_slug: str) -> None:
+        """题单内容变化后丢弃缓存（包括正在进行的预取）"""
+        with self._lock:
+            self._generation[favorite_slug] = self._generation.get(favorite_slug, 0) + 1
+            old = self._cache.pop(favorite_slug, None)
+            if old is not None:
+                self._cached_questions -= len(old[1].get('questions') or [])
+
+    def close(self) -> None:
+        """取消尚未开始的预取；正在进行的请求结束后结果会被丢弃"""
+        with self._lock:
+            self._closed = True
+            self._pending.clear()
+            self._cache.clear()
+            self._cached_questions = 0
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+class QuestionPager:
+    """
+    分页查看题单题目：按需分批请求（每批 fetch_size 道），只格式化当前页。
+    已请求的题目会保留，翻页、跳页和筛选都不会重新请求整个题单；
+    关键字筛选只扫描已加载的题目，不够一页时再继续请求下一批。
+    服务端筛选（QuestionFilter）改变后从头请求，只传输符合条件的题目。
+    """
+
+    def __init__(
+        self,
+        client: LeetCodeClient,
+        favorite_slug: str,
+        page_size: int = 20,
+        fetch_size: int = 100,
+        prefetcher: Optional[FavoritePrefetcher] = None,
+        question_filter: Optional[QuestionFilter] = None,
+    ) -> None:
+        """
+        :param prefetcher: 可选的后台预取器，第一批题目优先使用预取结果（仅不筛选时）
+        :param question_filter: 服务端筛选与排序
+        """
+        self.client = client
+        self.favorite_slug = favorite_slug
+        self.page_size = max(1, page_size)
+        self.prefetcher = prefetcher
+        self.fetch_size = prefetcher.fetch_size if prefetcher else max(self.page_size, fetch_size)
+        self.questions: List[Question] = []
+        self.total_length: Optional[int] = None
+        self.has_more = True
+        self.keyword = ""
+        self.question_filter = question_filter or QuestionFilter()
+        # 筛选结果：命中题目在 self.questions 中的下标，以及已经扫描到的位置
+        self._matches: List[int] = []
+        self._scanned = 0
+
+    def _fetch_next(self) -> bool:
+        """请求下一批题目，失败或没有更多时返回 False"""
+        if not self.has_more:
+            return False
+        response = None
+        filtered = not self.question_filter.is_default()
+        if not self.questions and self.prefetcher is not None and not filtered:
+            response = self.prefetcher.get(self.favorite_slug)
+        if response is None:
+            response = self.client.get_favorite_questions(
+                self.favorite_slug,
+                skip=len(self.questions),
+                limit=self.fetch_size,
+                question_filter=self.question_filter,
+            )
+        if response is None:
+            self.has_more = False
+            return False
+        batch = response.get('questions') or []
+        self.questions.extend(batch)
+        self.total_length = response.get('totalLength', len(self.questions))
+        self.has_more = bool(response.get('hasMore')) and bool(batch)
+        return bool(batch)
+
+    def _ensure(self, count: int) -> None:
+        """加载到当前视图（全部或筛选结果）至少有 count 道题，或没有更多题目"""
+        while True:
+            if self.keyword:
+                for i in range(self._scanned, len(self.questions)):
+                    if _question_matches(self.questions[i], self.keyword):
+                        self._matches.append(i)
+                self._scanned = len(self.questions)
+                available = len(self._matches)
+            else:
+                available = len(self.questions)
+            if available >= count or not self._fetch_next():
+                return
+
+    def set_filter(self, keyword: str) -> None:
+        """设置筛选关键字，空字符串表示取消筛选"""
+        self.keyword = keyword.strip()
+        self._matches = []
+        self._scanned = 0
+
+    def set_question_filter(self, question_filter: QuestionFilter) -> None:
+        """设置服务端筛选条件，丢弃已加载的题目"""
+        self.question_filter = question_filter
+        self.questions = []
+        self.total_length = None
+        self.has_more = True
+        self.set_filter(self.keyword)
+
+    def first(self) -> Optional[Question]:
+        self._ensure(1)
+        return self.questions[0] if self.questions else None
+
+    def page(self, page_no: int) -> List[Tuple[int, Question]]:
+        """返回第 page_no 页（从 1 开始）的 [(编号, 题目)]，编号为题目在题单中的位置"""
+        start = (page_no - 1) * self.page_size
+        self._ensure(start + self.page_size)
+        indices = self._matches if self.keyword else range(len(self.questions))
+        return [(i + 1, self.questions[i]) for i in indices[start:start + self.page_size]]
+
+    def page_count(self) -> Optional[int]:
+        """总页数；筛选结果未扫描完时未知，返回 None"""
+        if self.keyword:
+            if self.has_more:
+                return None
+            count = len(self._matches)
+        else:
+            count = self.total_length if self.total_length is not None else len(self.questions)
+        return max(1, -(-count // self.page_size))
+
+    def render(self, page_no: int) -> None:
+        rows = self.page(page_no)
+        page_count = self.page_count()
+        title = f"\n题目列表 (共 {self.total_length or 0} 题"
+        if not self.question_filter.is_default():
+            title += f"，条件: {self.question_filter.describe()}"
+        if self.keyword:
+            title += f"，筛选: {self.keyword}"
+        title += f"，第 {page_no}/{page_count or '?'} 页):"
+        print(title)
+        if not rows:
+            print("没有题目" if page_no == 1 else "没有更多题目")
+            return
+        table = _new_question_table()
+        for index, question in rows:
+            table.add_row(_question_row(index, question))
+        print(table)
+
+    def run(self) -> None:
+        """
+        交互式翻页：回车/n 下一页，p 上一页，g 页码 跳页，/关键字 筛选，/ 取消筛选，
+        f 条件 服务端筛选（见 parse_question_filter），f 取消服务端筛选，q 返回
+        """
+        page_no = 1
+        while True:
+            self.render(page_no)
+            command = input("\n回车/n 下一页，p 上一页，g 页码 跳页，/关键字 筛选，f 条件 服务端筛选，q 返回: ").strip()
+            if command.lower() == 'q':
+                break
+            if command in ('', 'n', 'N'):
+                if self.page(page_no + 1):
+                    page_no += 1
+                else:
+                    print("已经是最后一页")
+            elif command in ('p', 'P'):
+                page_no = max(1, page_no - 1)
+            elif command[:1] in ('g', 'G') and command[1:].strip().isdigit():
+                target = max(1, int(command[1:].strip()))
+                if target == 1 or self.page(target):
+                    page_no = target
+                else:
+                    print(f"没有第 {target} 页")
+            elif command.startswith('/'):
+                self.set_filter(command[1:])
+                page_no = 1
+            elif command[:1] in ('f', 'F') and command[1:2] in ('', ' '):
+                try:
+                    self.set_question_filter(parse_question_filter(command[1:]))
+                except ValueError as e:
+                    print(e)
+                    continue
+                page_no = 1
+            else:
+                print("无效的命令")
+
+
+class FavoriteStore:
+    """
+    进程内的题单模型：题单列表，以及已经完整加载过的题单题目。
+    增删操作成功后按操作结果直接更新模型，不再重新请求整个列表；
+    只有显式刷新（refresh）或检测到与服务端不一致时，才丢弃相关部分并在下次读取时重新获取。
+    读写方法与 LeetCodeClient 同名同参，可以代替客户端传给菜单函数，其余属性转发给底层客户端。
+    """
+
+    def __init__(self, client: LeetCodeClient, prefetcher: Optional[FavoritePrefetcher] = None) -> None:
+        """
+        :param prefetcher: 可选的后台预取器，题单内容变化时丢弃其中的预取结果
+        """
+        self._client = client
+        self.prefetcher = prefetcher
+        self._lock = threading.RLock()
+        # 题单列表，None 表示尚未获取或已失效
+        self._created: Optional[List[FavoriteInfo]] = None
+        self._collected: List[FavoriteInfo] = []
+        # slug -> 完整的题目列表
+        self._questions: Dict[str, QuestionListResponse] = {}
+        # 最近查看过的他人公开题单，收藏后据此插入本地模型
+        self._public: Dict[str, FavoriteInfo] = {}
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._client, name)
+
+    def refresh(self) -> None:
+        """丢弃整个模型（包括预取结果），下次读取时重新获取"""
+        with self._lock:
+            slugs = list(self._questions)
+            for favorite in (self._created or []) + self._collected:
+                slugs.append(favorite['slug'])
+            self._created = None
+            self._collected = []
+            self._questions.clear()
+        if self.prefetcher is not None:
+            for slug in dict.fromkeys(slugs):
+                self.prefetcher.invalidate(slug)
+
+    def _drift(self, favorite_slug: Optional[str] = None, favorites: bool = False) -> None:
+        """模型可能与服务端不一致：丢弃相关部分，下次读取时重新获取"""
+        with self._lock:
+            if favorite_slug is not None:
+                self._questions.pop(favorite_slug, None)
+            if favorites:
+                self._created = None
+                self._collected = []
+        if favorite_slug is not None and self.prefetcher is not None:
+            self.prefetcher.invalidate(favorite_slug)
+
+    def get_favorite_lists(self) -> tuple[List[FavoriteInfo], List[FavoriteInfo]]:
+        with self._lock:
+            if self._created is not None:
+                return list(self._created), list(self._collected)
+        created, collected = self._client.get_favorite_lists()
+        if created or collected:
+            with self._lock:
+                self._created, self._collected = list(created), list(collected)
+        return list(created), list(collected)
+
+    def has_questions(self, favorite_slug: str) -> bool:
+        """题单的完整题目列表是否已经在模型中"""
+        with self._lock:
+            return favorite_slug in self._questions
+
+    def _slice(self, favorite_slug: str, skip: int, limit: int) -> Optional[QuestionListResponse]:
+        with self._lock:
+            cached = self._questions.get(favorite_slug)
+            if cached is None:
+                return None
+            questions = cached['questions']
+            return {
+                "questions": questions[skip:skip + limit],
+                "totalLength": cached['totalLength'],
+                "hasMore": skip + limit < len(questions),
+            }
+
+    def get_favorite_questions(
+        self,
+        favorite_slug: str,
+        skip: int = 0,
+        limit: int = 5000,
+        question_filter: Optional[QuestionFilter] = None,
+    ) -> Optional[QuestionListResponse]:
+        """
+        已完整加载的题单直接从模型中切片返回；一次取到完整列表（包括预取到的小题单）时记入模型。
+        带筛选条件的请求交给服务端，只传输符合条件的题目，结果不记入模型。
+        """
+        if question_filter is not None and not question_filter.is_default():
+            return self._client.get_favorite_questions(favorite_slug, skip=skip, limit=limit, question_filter=question_filter)
+        response = self._slice(favorite_slug, skip, limit)
+        if response is not None:
+            return response
+        if skip == 0 and self.prefetcher is not None:
+            prefetched = self.prefetcher.get(favorite_slug)
+            if prefetched is not None and not prefetched.get('hasMore'):
+                self._record(favorite_slug, prefetched)
+                return self._slice(favorite_slug, skip, limit)
+        response = self._client.get_favorite_questions(favorite_slug, skip=skip, limit=limit)
+        if response is not None and skip == 0 and not response.get('hasMore'):
+            self._record(favorite_slug, response)
+        return response
+
+    def _record(self, favorite_slug: str, response: QuestionListResponse) -> None:
+        questions = list(response.get('questions') or [])
+        with self._lock:
+            self._questions[favorite_slug] = {
+                "questions": questions,
+                "totalLength": response.get('totalLength', len(questions)),
+                "hasMore": False,
+            }
+
+    def get_public_favorite_lists(self, user_slug: str) -> Optional[List[FavoriteInfo]]:
+        favorites = self._client.get_public_favorite_lists(user_slug)
+        with self._lock:
+            for favorite in favorites or []:
+                self._public[favorite['slug']] = favorite
+        return favorites
+
+    def create_favorite_list(self, name: str, is_public: bool = True, description: str = "") -> Optional[str]:
+        favorite_slug = self._client.create_favorite_list(name, is_public, description)
+        if favorite_slug:
+            favorite: FavoriteInfo = {
+                "coverUrl": None,
+                "coverEmoji": None,
+                "coverBackgroundColor": None,
+                "hasCurrentQuestion": False,
+                "isPublicFavorite": is_public,
+                "lastQuestionAddedAt": None,
+                "name": name,
+                "slug": favorite_slug,
+                "favoriteType": "NORMAL",
+            }
+            with self._lock:
+                if self._created is not None:
+                    self._created.append(favorite)
+                self._questions[favorite_slug] = {"questions": [], "totalLength": 0, "hasMore": False}
+        return favorite_slug
+
+    def _remove_favorite(self, favorites: Optional[List[FavoriteInfo]], favorite_slug: str) -> None:
+        with self._lock:
+            self._questions.pop(favorite_slug, None)
+            if favorites is None:
+                return
+            remaining = [favorite for favorite in favorites if favorite['slug'] != favorite_slug]
+            if len(remaining) == len(favorites):
+                # 本地没有这个题单，说明列表已经过期
+                self._drift(favorites=True)
+            else:
+                favorites[:] = remaining
+        if self.prefetcher is not None:
+            self.prefetcher.invalidate(favorite_slug)
+
+    def delete_favorite(self, favorite_slug: str) -> bool:
+        if not self._client.delete_favorite(favorite_slug):
+            self._drift(favorite_slug, favorites=True)
+            return False
+        self._remove_favorite(self._created, favorite_slug)
+        return True
+
+    def remove_favorite_from_collection(self, favorite_slug: str) -> bool:
+        if not self._client.remove_favorite_from_collection(favorite_slug):
+            self._drift(favorites=True)
+            return False
+        self._remove_favorite(self._collected if self._created is not None else None, favorite_slug)
+        return True
+
+    def add_favorite_to_collection(self, favorite_slug: str) -> bool:
+        if not self._client.add_favorite_to_collection(favorite_slug):
+            self._drift(favorites=True)
+            return False
+        with self._lock:
+            info = self._public.get(favorite_slug)
+            if info is None:
+                self._drift(favorites=True)
+            elif self._created is not None and all(f['slug'] != favorite_slug for f in self._collected):
+                favorite = {key: info.get(key) for key in FavoriteInfo.__annotations__}
+                favorite['favoriteType'] = favorite.get('favoriteType') or "NORMAL"
+                self._collected.append(favorite)
+        return True
+
+    def fork_favorite(self, favorite_slug: str) -> Optional[str]:
+        new_slug = self._client.fork_favorite(favorite_slug)
+        # 复制出的题单的公开状态、封面等由服务端决定，无法在本地推出，下次显示时重新获取列表
+        self._drift(favorites=True)
+        return new_slug
+
+    def _touch_favorite(self, favorite_slug: str) -> None:
+        with self._lock:
+            for favorite in self._created or []:
+                if favorite['slug'] == favorite_slug:
+                    favorite['lastQuestionAddedAt'] = datetime.now().astimezone().isoformat(timespec="seconds")
+
+    def _questions_added(self, favorite_slug: str, keys: List[str], field: str) -> None:
+        """
+        加题成功后只请求新增的几道题（新题追加在题单末尾）；
+        返回的总数或题目与预期不符时视为不一致，丢弃该题单的题目列表。
+        """
+        self._touch_favorite(favorite_slug)
+        if self.prefetcher is not None:
+            self.prefetcher.invalidate(favorite_slug)
+        with self._lock:
+            cached = self._questions.get(favorite_slug)
+            if cached is None:
+                return
+            present = {str(question.get(field)) for question in cached['questions']}
+            new_keys = [key for key in dict.fromkeys(str(key) for key in keys) if key not in present]
+            old_total = len(cached['questions'])
+        if not new_keys:
+            return
+
+        response = self._client.get_favorite_questions(favorite_slug, skip=old_total, limit=len(new_keys))
+        batch = (response or {}).get('questions') or []
+        with self._lock:
+            cached = self._questions.get(favorite_slug)
+            if (
+                cached is not None
+                and len(cached['questions']) == old_total
+                and response is not None
+                and response.get('totalLength') == old_total + len(new_keys)
+                and sorted(str(question.get(field)) for question in batch) == sorted(new_keys)
+            ):
+                cached['questions'].extend(batch)
+                cached['totalLength'] = old_total + len(new_keys)
+                return
+        self._drift(favorite_slug)
+
+    def add_question_to_favorite(self, favorite_slug: str, question_id: str) -> bool:
+        if not self._client.add_question_to_favorite(favorite_slug, question_id):
+            self._drift(favorite_slug)
+            return False
+        self._questions_added(favorite_slug, [question_id], "id")
+        return True
+
+    def batch_add_questions_to_favorite(self, favorite_slug: str, question_slugs: List[str]) -> bool:
+        if not self._client.batch_add_questions_to_favorite(favorite_slug, question_slugs):
+            self._drift(favorite_slug)
+            return False
+        self._questions_added(favorite_slug, question_slugs, "titleSlug")
+        return True
+
+    def remove_question_from_favorite(self, favorite_slug: str, question_slug: str) -> bool:
+        if not self._client.remove_question_from_favorite(favorite_slug, question_slug):
+            self._drift(favorite_slug)
+            return False
+        with self._lock:
+            cached = self._questions.get(favorite_slug)
+            if cached is not None:
+                remaining = [q for q in cached['questions'] if q.get('titleSlug') != question_slug]
+                if len(remaining) == len(cached['questions']):
+                    self._drift(favorite_slug)
+                else:
+                    cached['questions'] = remaining
+                    cached['totalLength'] = len(remaining)
+        if self.prefetcher is not None:
+            self.prefetcher.invalidate(favorite_slug)
+        return True
+
+
 def get_question_ids() -> List[str]:
     """
     获取要添加的题目 ID 列表
@@ -1034,6 +2172,8 @@ def get_yes_no_input(prompt: str, default: bool = True) -> bool:
 
 def display_menu():
     """显示主菜单"""
+    from prettytable import PrettyTable
+
     print("\n=== LeetCode 题单管理工具 ===")
     
     #     print("1️⃣ 📝 创建题单")
@@ -1103,7 +2243,11 @@ def add_questions_to_favorite(client: LeetCodeClient, favorite_slug: str, favori
             question_slugs = get_question_slugs()
             if not question_slugs:
                 continue
-                
+            question_slugs = validate_question_slugs(question_slugs)
+            if not question_slugs:
+                print("没有可添加的有效题目")
+                continue
+
             if client.batch_add_questions_to_favorite(favorite_slug, question_slugs):
                 print(f"成功批量添加 {len(question_slugs)} 个题目到题单")
                 has_changes = True
@@ -1114,7 +2258,7 @@ def add_questions_to_favorite(client: LeetCodeClient, favorite_slug: str, favori
             print("无效的选项，请重新选择")
             continue
         
-        # 如果成功添加了题目，重新获取并显示题目列表
+        # 如果成功添加了题目，显示更新后的题目列表
         if has_changes:
             print("\n更新后的题目列表:")
             response = client.get_favorite_questions(favorite_slug)
@@ -1163,6 +2307,8 @@ def display_public_favorites(favorites: List[FavoriteInfo]) -> None:
     """
     显示用户的公开题单列表
     """
+    from prettytable import PrettyTable
+
     print("\n公开题单列表:")
     
     table = PrettyTable()
@@ -1221,20 +2367,12 @@ def view_and_operate_public_favorites(client: LeetCodeClient, user_slug: str, op
                         selected_favorite = public_favorites[index]
                         print(f"\n已选择题单: {selected_favorite['name']}")
                         
-                        response = client.get_favorite_questions(selected_favorite['slug'])
-                        if not response or not response['questions']:
+                        pager = QuestionPager(client, selected_favorite['slug'])
+                        if pager.first() is None:
                             print("题单中没有题目")
                             continue
-                            
-                        display_questions(response['questions'], response['totalLength'])
-                        
-                        if response['hasMore']:
-                            if get_yes_no_input("\n还有更多题目，是否继续查看？"):
-                                skip = len(response['questions'])
-                                response = client.get_favorite_questions(selected_favorite['slug'], skip=skip)
-                                if not response:
-                                    break
-                        input("\n按回车键返回...")
+
+                        pager.run()
                         break
                     else:
                         print("无效的题单编号，请重新输入")
@@ -1331,7 +2469,12 @@ def quick_create_favorite(client: LeetCodeClient) -> None:
     if not slugs:
         print("错误：至少需要输入一个题目")
         return
-        
+
+    slugs = validate_question_slugs(slugs)
+    if not slugs:
+        print("错误：没有有效的题目")
+        return
+
     # 创建题单（使用空描述）
     favorite_slug = client.create_favorite_list(title, True, "")
     if not favorite_slug:
@@ -1357,44 +2500,80 @@ def quick_create_favorite(client: LeetCodeClient) -> None:
         print("批量添加题目失败")
 
 
-def export_all_favorites_to_md(client: LeetCodeClient, all_favorites: List[dict]) -> None:
+def _fetch_first_problem_slug(client: LeetCodeClient, favorite_slug: str) -> str:
+    """只取题单的第一题（limit=1），返回其 titleSlug。"""
+    resp = client.get_favorite_questions(favorite_slug, skip=0, limit=1)
+    if resp and resp.get('questions'):
+        return resp['questions'][0].get('titleSlug', '')
+    return ""
+
+
+def export_all_favorites_to_md(
+    client: LeetCodeClient,
+    all_favorites: List[dict],
+    max_workers: int = EXPORT_MAX_WORKERS,
+    output_filename: str = "favorite_list.md",
+    confirm: bool = True,
+) -> Optional[Dict[str, List[Dict[str, str]]]]:
     """遍历所有题单，写入 favorite_list.md。
 
     - 覆盖分类：我创建的题单 / 我收藏的题单
     - 其它分类内容保留
+    - 并发获取每个题单的第一题，两个分类在内存中生成后一次性原子写入
+    :return: 写入的分类段 {分类名: [{name, slug, first_problem_slug}]}，取消写入时返回 None
     """
     # Ask up-front before doing a potentially expensive full export.
-    if not _confirm_write_favorite_list(BASE_DIR / "favorite_list.md"):
-        return
-
-    created_infos: List[Dict[str, str]] = []
-    collected_infos: List[Dict[str, str]] = []
+    if confirm and not _confirm_write_favorite_list(get_favorite_list_document(output_filename).path):
+        return None
 
     total = len(all_favorites)
-    for idx, fav in enumerate(all_favorites, 1):
-        slug = (fav.get('slug') or '').strip()
-        name = (fav.get('name') or '').strip() or '未命名'
-
-        first_problem_slug = ""
-        if slug:
+    first_problem_slugs: List[str] = [""] * total
+
+    t0 = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=max(1, max_workers)) as executor:
+        futures = {}
+        for idx, fav in enumerate(all_favorites):
+            slug = (fav.get('slug') or '').strip()
+            if slug:
+                futures[executor.submit(_fetch_first_problem_slug, client, slug)] = idx
+
+        for future in as_completed(futures):
+            idx = futures[future]
             try:
-                resp = client.get_favorite_questions(slug, skip=0, limit=1)
-                if resp and resp.get('questions'):
-                    first_problem_slug = resp['questions'][0].get('titleSlug', '')
+                first_problem_slugs[idx] = future.result()
             except Exception as e:
-                print(f"获取题单第一题失败 ({idx}/{total}) {name}: {e}")
+                name = (all_favorites[idx].get('name') or '').strip() or '未命名'
+                print(f"获取题单第一题失败 ({idx + 1}/{total}) {name}: {e}")
+    t1 = time.perf_counter()
 
-        info = {"name": name, "slug": slug, "first_problem_slug": first_problem_slug}
+    created_infos: List[Dict[str, str]] = []
+    collected_infos: List[Dict[str, str]] = []
+    for idx, fav in enumerate(all_favorites):
+        info = {
+            "name": (fav.get('name') or '').strip() or '未命名',
+            "slug": (fav.get('slug') or '').strip(),
+            "first_problem_slug": first_problem_slugs[idx],
+        }
         if fav.get('is_created'):
             created_infos.append(info)
         else:
             collected_infos.append(info)
+    t2 = time.perf_counter()
 
     # 覆盖两个分类段，保留文件中的其它分类
-    generate_favorite_list_file(created_infos, category_name="我创建的题单", merge_mode="replace")
-    generate_favorite_list_file(collected_infos, category_name="我收藏的题单", merge_mode="replace")
+    sections = {"我创建的题单": created_infos, "我收藏的题单": collected_infos}
+    write_favorite_list_sections(sections, output_filename=output_filename, confirm=False)
+    t3 = time.perf_counter()
+
+    print(
+        f"导出完成: {total} 个题单，获取第一题 {t1 - t0:.2f}s，"
+        f"生成内容 {t2 - t1:.2f}s，写入文件 {t3 - t2:.2f}s"
+    )
+    return sections
 
 def main():
+    from dotenv import load_dotenv
+
     # 加载 .env 文件中的配置
     env_path = os.path.join(os.path.dirname(__file__), '.env')
     load_dotenv(env_path)
@@ -1411,33 +2590,40 @@ def main():
         return
 
     client = LeetCodeClient(csrf_token, session_id)
+    # 查看题单时累积的 favorite_list.md 更新在退出时一次写入
+    atexit.register(flush_favorite_list_documents)
+    # 停留在菜单时后台预取最可能查看的题单
+    prefetcher = FavoritePrefetcher(client)
+    atexit.register(prefetcher.close)
+    # 增删操作的结果直接更新本地模型，回到菜单时不再重新请求题单列表
+    store = FavoriteStore(client, prefetcher)
 
     def get_all_favorites():
-        """获取所有题单列表"""
-        created_favorites, collected_favorites = client.get_favorite_lists()
-        all_favorites = []
-        for favorite in created_favorites:
-            favorite['is_created'] = True
-            all_favorites.append(favorite)
-        for favorite in collected_favorites:
-            favorite['is_created'] = False
-            all_favorites.append(favorite)
-        return all_favorites
+        """获取所有题单列表（来自本地模型）"""
+        return list_all_favorites(store)
 
     while True:
         # 获取并显示题单列表
         all_favorites = get_all_favorites()
         if all_favorites:
             display_favorites(all_favorites)
+            # 已在本地模型中的题单不需要预取
+            prefetcher.prefetch([slug for slug in prefetcher.candidates(all_favorites) if not store.has_questions(slug)])
         else:
             print("\n当前没有任何题单")
         
         display_menu()
         
         while True:
-            choice = input("\n请输入选项编号（输入 q 退出）: ").strip().lower()
+            choice = input("\n请输入选项编号（输入 r 刷新，输入 q 退出）: ").strip().lower()
             if choice == 'q':
+                prefetcher.close()
                 return
+
+            if choice == 'r':
+                # 在网页上修改过题单后，丢弃本地模型重新获取
+                store.refresh()
+                break
             
             if choice not in ['1', '2', '3', '4', '5', '6', '7', '8']:
                 print("无效的选项，请重新输入")
@@ -1464,14 +2650,14 @@ def main():
                     if description.lower() == 'q':
                         break
                     
-                    favorite_slug = client.create_favorite_list(favorite_name, is_public, description)
+                    favorite_slug = store.create_favorite_list(favorite_name, is_public, description)
                     if favorite_slug:
                         print(f"\n成功创建题单: {favorite_name}")
                         first_problem_slug = ""
                         if get_yes_no_input("\n是否现在添加题目？"):
-                            add_questions_to_favorite(client, favorite_slug, favorite_name)
+                            add_questions_to_favorite(store, favorite_slug, favorite_name)
                             # 添加后再读取题单内容，取第一题 slug
-                            resp = client.get_favorite_questions(favorite_slug)
+                            resp = store.get_favorite_questions(favorite_slug)
                             if resp and resp.get('questions'):
                                 first_problem_slug = resp['questions'][0].get('titleSlug', '')
 
@@ -1506,7 +2692,7 @@ def main():
                                     print(f"跳过系统年度题单: {fav['name']}")
                                     skip_count += 1
                                     continue
-                                if delete_favorite_list(client, fav, True):
+                                if delete_favorite_list(store, fav, True):
                                     success_count += 1
                                 else:
                                     fail_count += 1
@@ -1547,7 +2733,7 @@ def main():
                             print(f"跳过系统年度题单: {fav['name']}")
                             skip_count += 1
                             continue
-                        if delete_favorite_list(client, fav, True):
+                        if delete_favorite_list(store, fav, True):
                             success_count += 1
                         else:
                             fail_count += 1
@@ -1566,7 +2752,7 @@ def main():
                 if choice == '3' and all_favorites:
                     if _confirm_write_favorite_list(BASE_DIR / "favorite_list.md"):
                         print("\n正在导出所有题单到 favorite_list.md（会遍历每个题单取第一题）...")
-                        export_all_favorites_to_md(client, all_favorites)
+                        export_all_favorites_to_md(store, all_favorites)
                 
                 while True:
                     try:
@@ -1578,76 +2764,85 @@ def main():
                         if 0 <= index < len(all_favorites):
                             selected_favorite = all_favorites[index]
                             print(f"\n已选择题单: {selected_favorite['name']}")
+                            prefetcher.touch(selected_favorite['slug'])
 
                             if choice == '3':  # 查看题单
-                                while True:
-                                    response = client.get_favorite_questions(selected_favorite['slug'])
-                                    first_problem_slug = ""
-                                    if response and response.get('questions'):
-                                        first_problem_slug = response['questions'][0].get('titleSlug', '')
-
-                                    category_name = "我创建的题单" if selected_favorite.get('is_created') else "我收藏的题单"
-                                    generate_favorite_list_file(
-                                        [{
-                                            "name": selected_favorite['name'],
-                                            "slug": selected_favorite['slug'],
-                                            "first_problem_slug": first_problem_slug,
-                                        }],
-                                        category_name=category_name,
-                                        merge_mode="upsert",
-                                    )
+                                # 分页加载：第一批题目优先使用后台预取的结果，翻页时再按需请求
+                                pager = QuestionPager(store, selected_favorite['slug'], prefetcher=prefetcher)
+                                first_question = pager.first()
+                                first_problem_slug = first_question.get('titleSlug', '') if first_question else ""
 
-                                    if not response or not response['questions']:
-                                        print("题单中没有题目")
-                                        break
-                                        
-                                    display_questions(response['questions'], response['totalLength'])
-                                    
-                                    if response['hasMore']:
-                                        if get_yes_no_input("\n还有更多题目，是否继续查看？"):
-                                            skip = len(response['questions'])
-                                            response = client.get_favorite_questions(selected_favorite['slug'], skip=skip)
-                                            if not response:
-                                                break
-                                        else:
-                                            break
-                                    else:
-                                        input("\n按回车键返回...")
-                                        break
+                                category_name = "我创建的题单" if selected_favorite.get('is_created') else "我收藏的题单"
+                                # 只更新内存索引，退出时统一写入
+                                generate_favorite_list_file(
+                                    [{
+                                        "name": selected_favorite['name'],
+                                        "slug": selected_favorite['slug'],
+                                        "first_problem_slug": first_problem_slug,
+                                    }],
+                                    category_name=category_name,
+                                    merge_mode="upsert",
+                                    flush=False,
+                                )
+
+                                if first_question is None:
+                                    print("题单中没有题目")
+                                    break
+
+                                pager.run()
                                 break
-                                    
+
                             elif choice == '4':  # 新增题目
-                                add_questions_to_favorite(client, selected_favorite['slug'], selected_favorite['name'])
+                                add_questions_to_favorite(store, selected_favorite['slug'], selected_favorite['name'])
                                 break
                                 
                             elif choice == '5':  # 删除题目
+                                # 服务端筛选：只获取符合条件的题目（如 f status:solved 删除所有已解答的题）
+                                question_filter = QuestionFilter()
                                 while True:
-                                    response = client.get_favorite_questions(selected_favorite['slug'])
+                                    response = store.get_favorite_questions(selected_favorite['slug'], question_filter=question_filter)
+                                    if (not response or not response['questions']) and not question_filter.is_default():
+                                        print(f"没有符合条件的题目（{question_filter.describe()}），已取消筛选")
+                                        question_filter = QuestionFilter()
+                                        continue
                                     if not response or not response['questions']:
                                         print("题单中没有题目")
                                         break
                                         
                                     display_questions(response['questions'], response['totalLength'])
+                                    if not question_filter.is_default():
+                                        print(f"筛选条件: {question_filter.describe()}")
                                     
-                                    q_input = input("\n请输入要删除的题目编号（输入 q 返回，输入 a 删除所有题目）: ").strip().lower()
+                                    q_input = input("\n请输入要删除的题目编号（输入 q 返回，输入 a 删除所有题目，输入 f 条件 筛选）: ").strip().lower()
                                     if q_input == 'q':
                                         break
+
+                                    if q_input[:1] == 'f' and q_input[1:2] in ('', ' '):
+                                        try:
+                                            question_filter = parse_question_filter(q_input[1:])
+                                        except ValueError as e:
+                                            print(e)
+                                        continue
                                         
                                     if q_input == 'a':
-                                        if get_yes_no_input("确认要删除所有题目吗？"):
+                                        confirm_prompt = (
+                                            "确认要删除所有题目吗？" if question_filter.is_default()
+                                            else f"确认要删除筛选出的 {len(response['questions'])} 道题目吗？"
+                                        )
+                                        if get_yes_no_input(confirm_prompt):
                                             success_count = 0
                                             fail_count = 0
                                             for question in response['questions']:
-                                                if client.remove_question_from_favorite(selected_favorite['slug'], question['titleSlug']):
+                                                if store.remove_question_from_favorite(selected_favorite['slug'], question['titleSlug']):
                                                     print(f"成功删除题目: {question['translatedTitle']}")
                                                     success_count += 1
                                                 else:
                                                     print(f"删除题目失败: {question['translatedTitle']}")
                                                     fail_count += 1
                                             print(f"\n批量删除完成，成功：{success_count} 个，失败：{fail_count} 个")
-                                            # 重新获取并显示题目列表
+                                            # 显示更新后的题目列表
                                             print("\n更新后的题目列表:")
-                                            response = client.get_favorite_questions(selected_favorite['slug'])
+                                            response = store.get_favorite_questions(selected_favorite['slug'], question_filter=question_filter)
                                             if response:
                                                 display_questions(response['questions'], response['totalLength'])
                                             break
@@ -1657,11 +2852,11 @@ def main():
                                         q_index = int(q_input) - 1
                                         if 0 <= q_index < len(response['questions']):
                                             question = response['questions'][q_index]
-                                            if client.remove_question_from_favorite(selected_favorite['slug'], question['titleSlug']):
+                                            if store.remove_question_from_favorite(selected_favorite['slug'], question['titleSlug']):
                                                 print(f"成功删除题目: {question['questionFrontendId']} {question['translatedTitle']}")
-                                                # 重新获取并显示题目列表
+                                                # 显示更新后的题目列表
                                                 print("\n更新后的题目列表:")
-                                                response = client.get_favorite_questions(selected_favorite['slug'])
+                                                response = store.get_favorite_questions(selected_favorite['slug'], question_filter=question_filter)
                                                 if response:
                                                     display_questions(response['questions'], response['totalLength'])
                                             else:
@@ -1689,7 +2884,7 @@ def main():
                     print("用户名不能为空")
                     continue
                 
-                view_and_operate_public_favorites(client, user_slug, 'collect')
+                view_and_operate_public_favorites(store, user_slug, 'collect')
                 break
 
             elif choice == '7':  # 复制他人题单
@@ -1698,11 +2893,11 @@ def main():
                     print("用户名不能为空")
                     continue
                 
-                view_and_operate_public_favorites(client, user_slug, 'fork')
+                view_and_operate_public_favorites(store, user_slug, 'fork')
                 break
 
             elif choice == '8':  # 快速创建题单
-                quick_create_favorite(client)
+                quick_create_favorite(store)
                 break
 
             break
@@ -0,0 +1,231 @@
+"""
+本地题目目录：在批量添加题目前离线校验 titleSlug。
+
+- update: 从题库分页拉取全部题目，保存到 problem_catalog.json
+- check: 校验 slug，输出可识别的别名与无效的 slug
+
+除了标准的 titleSlug，还可以识别以下写法（别名）：
+- 题目链接，如 https://leetcode.cn/problems/two-sum/description/
+- 题目编号，如 1、LCR 001、面试题 01.01
+- 大小写不同的 slug
+- problem_aliases.json 中手动维护的 {别名: titleSlug}
+
+用法:
+    python problem_catalog.py update
+    python problem_catalog.py check two-sum 1 https://leetcode.cn/problems/add-two-numbers/ bad-slug
+    python problem_catalog.py check -f slugs.txt
+"""
+
+import argparse
+import json
+import os
+import re
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional
+
+BASE_DIR = Path(__file__).resolve().parent
+PROBLEM_CATALOG_PATH = BASE_DIR / "problem_catalog.json"
+PROBLEM_ALIASES_PATH = BASE_DIR / "problem_aliases.json"
+
+_PROBLEM_URL_RE = re.compile(r"/problems/([^/?#\s]+)")
+
+
+class SlugValidation(NamedTuple):
+    valid: List[str]  # 去重后的有效 titleSlug，保持输入顺序
+    unknown: List[str]  # 无法识别的输入
+    resolved: Dict[str, str]  # 通过别名识别的输入 -> titleSlug
+
+
+class ProblemCatalog:
+    def __init__(self, problems: Dict[str, Dict[str, Any]], aliases: Optional[Dict[str, str]] = None) -> None:
+        """
+        :param problems: {titleSlug: {frontendQuestionId, title, titleCn, paidOnly}}
+        :param aliases: {别名: titleSlug}，目标不在目录中的别名会被忽略
+        """
+        self.problems = problems
+        self._casefold: Dict[str, str] = {slug.casefold(): slug for slug in problems}
+        self._by_frontend_id: Dict[str, str] = {}
+        for slug, info in problems.items():
+            frontend_id = str(info.get("frontendQuestionId") or "").strip()
+            if frontend_id:
+                self._by_frontend_id[frontend_id.casefold()] = slug
+        self.aliases = {alias: slug for alias, slug in (aliases or {}).items() if slug in problems}
+
+    def __len__(self) -> int:
+        return len(self.problems)
+
+    def __contains__(self, slug: str) -> bool:
+        return slug in self.problems
+
+    def resolve(self, text: str) -> Optional[str]:
+        """把 slug、链接、题目编号或别名解析为 titleSlug，无法识别时返回 None。"""
+        text = (text or "").strip()
+        if not text:
+            return None
+        if text in self.problems:
+            return text
+        if text in self.aliases:
+            return self.aliases[text]
+
+        match = _PROBLEM_URL_RE.search(text)
+        candidate = match.group(1) if match else text.strip("/")
+        if candidate in self.problems:
+            return candidate
+        if candidate in self.aliases:
+            return self.aliases[candidate]
+        folded = candidate.casefold()
+        return self._casefold.get(folded) or self._by_frontend_id.get(folded)
+
+    def validate(self, slugs: Iterable[str]) -> SlugValidation:
+        valid: List[str] = []
+        seen = set()
+        unknown: List[str] = []
+        resolved: Dict[str, str] = {}
+        for text in slugs:
+            slug = self.resolve(text)
+            if slug is None:
+                unknown.append(text)
+                continue
+            if slug != text:
+                resolved[text] = slug
+            if slug not in seen:
+                seen.add(slug)
+                valid.append(slug)
+        return SlugValidation(valid, unknown, resolved)
+
+
+def _load_aliases(path: Optional[Path] = None) -> Dict[str, str]:
+    path = path or PROBLEM_ALIASES_PATH
+    if not path.exists():
+        return {}
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+    except json.JSONDecodeError:
+        print(f"别名文件格式错误，已忽略: {path}")
+        return {}
+    return {str(k): str(v) for k, v in data.items()} if isinstance(data, dict) else {}
+
+
+_CATALOG_CACHE: Dict[str, Any] = {}
+
+
+def load_problem_catalog(path: Path = PROBLEM_CATALOG_PATH) -> Optional[ProblemCatalog]:
+    """读取本地题目目录（文件未变化时复用），不存在时返回 None。"""
+    if not path.exists():
+        return None
+    stat = path.stat()
+    alias_mtime = PROBLEM_ALIASES_PATH.stat().st_mtime if PROBLEM_ALIASES_PATH.exists() else None
+    signature = (str(path), stat.st_mtime, stat.st_size, alias_mtime)
+    if _CATALOG_CACHE.get("signature") == signature:
+        return _CATALOG_CACHE["catalog"]
+
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+    except json.JSONDecodeError:
+        print(f"题目目录文件格式错误: {path}")
+        return None
+    catalog = ProblemCatalog(data.get("problems") or {}, _load_aliases())
+    _CATALOG_CACHE.update(signature=signature, catalog=catalog)
+    return catalog
+
+
+def update_problem_catalog(client, path: Path = PROBLEM_CATALOG_PATH) -> int:
+    """
+    从题库拉取全部题目并保存为本地目录
+    :param client: LeetCodeClient
+    :return: 题目数量
+    """
+    from leetcode_favorite import atomic_write_text
+
+    problems: Dict[str, Dict[str, Any]] = {}
+    for page in client.iter_problemset_pages():
+        for question in page:
+            slug = question.get("titleSlug")
+            if slug:
+                problems[slug] = {
+                    "frontendQuestionId": question.get("frontendQuestionId") or "",
+                    "title": question.get("title") or "",
+                    "titleCn": question.get("titleCn") or "",
+                    "paidOnly": bool(question.get("paidOnly")),
+                }
+    atomic_write_text(path, json.dumps({"problems": problems}, ensure_ascii=False, separators=(",", ":")))
+    _CATALOG_CACHE.clear()
+    print(f"题目目录已保存到: {path}（{len(problems)} 道题）")
+    return len(problems)
+
+
+_MISSING_CATALOG_REPORTED = False
+
+
+def check_question_slugs(slugs: List[str], catalog: Optional[ProblemCatalog] = None) -> SlugValidation:
+    """
+    与 validate_question_slugs 相同，但返回完整的校验结果，调用方可以据此报告被跳过的输入。
+    没有本地题目目录时不做校验：全部输入视为有效。
+    """
+    global _MISSING_CATALOG_REPORTED
+    catalog = catalog or load_problem_catalog()
+    if catalog is None:
+        if not _MISSING_CATALOG_REPORTED:
+            print("未找到本地题目目录，跳过 slug 校验（运行 python problem_catalog.py update 生成）")
+            _MISSING_CATALOG_REPORTED = True
+        return SlugValidation(list(slugs), [], {})
+
+    result = catalog.validate(slugs)
+    for text, slug in result.resolved.items():
+        print(f"  已识别别名: {text} -> {slug}")
+    if result.unknown:
+        print(f"  以下 {len(result.unknown)} 个 slug 不在题目目录中，已跳过: {' '.join(result.unknown)}")
+    return result
+
+
+def validate_question_slugs(slugs: List[str], catalog: Optional[ProblemCatalog] = None) -> List[str]:
+    """
+    批量添加题目前校验 slug：解析别名，提前报告无法识别的 slug 并从结果中去掉。
+    没有本地题目目录时不做校验，原样返回。
+    :return: 去重后的有效 titleSlug 列表
+    """
+    return check_question_slugs(slugs, catalog).valid
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="本地题目目录：离线校验题目 slug")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    subparsers.add_parser("update", help="从题库拉取全部题目，更新本地目录")
+    check_parser = subparsers.add_parser("check", help="校验 slug")
+    check_parser.add_argument("slugs", nargs="*", help="slug、题目链接或题目编号")
+    check_parser.add_argument("-f", "--file", help="从文件读取（空白或逗号分隔）")
+    args = parser.parse_args()
+
+    if args.command == "update":
+        from dotenv import load_dotenv
+        from leetcode_favorite import LeetCodeClient
+
+        load_dotenv(BASE_DIR / ".env")
+        csrf_token = os.getenv("csrftoken")
+        session_id = os.getenv("LEETCODE_SESSION")
+        if not csrf_token or not session_id:
+            raise SystemExit("错误：请在 .env 文件中配置 csrftoken 和 LEETCODE_SESSION")
+        update_problem_catalog(LeetCodeClient(csrf_token, session_id))
+        return
+
+    slugs = list(args.slugs)
+    if args.file:
+        with open(args.file, "r", encoding="utf-8") as f:
+            slugs.extend(s for s in re.split(r"[,\s]+", f.read()) if s)
+    catalog = load_problem_catalog()
+    if catalog is None:
+        raise SystemExit(f"未找到题目目录: {PROBLEM_CATALOG_PATH}（请先运行 python problem_catalog.py update）")
+
+    result = catalog.validate(slugs)
+    print(f"共 {len(slugs)} 个输入，有效 {len(result.valid)} 个（去重后），无法识别 {len(result.unknown)} 个")
+    for text, slug in result.resolved.items():
+        print(f"  {text} -> {slug}")
+    for text in result.unknown:
+        print(f"  ✗ {text}")
+    raise SystemExit(1 if result.unknown else 0)
+
+
+if __name__ == "__main__":
+    main()